@@ -1,7 +1,13 @@
 from utils.model_loaders import ModelLoader
-from prompt_library.prompt import get_budget_aware_system_prompt
+from prompt_library.prompt import FINAL_SYNTHESIS_PROMPT, get_budget_aware_system_prompt
+from langchain_core.messages import HumanMessage
+from langchain_core.runnables import RunnableConfig, RunnableLambda
 from langgraph.graph import StateGraph, MessagesState, END, START
-from langgraph.prebuilt import ToolNode, tools_condition
+from langgraph.prebuilt import tools_condition
+from agent.context_manager import ContextWindowManager
+from agent.run_budget import RunBudget, budget_metrics
+from agent.tool_executor import ConcurrentToolExecutor
+from agent.tool_output_compactor import ToolOutputCompactor
 from tools.weather_info_tool import WeatherInfoTool
 from tools.Place_search_tool import PlaceSearchTool
 from tools.expense_calculator_tool import CalculatorTool
@@ -29,26 +35,52 @@ class GraphBuilder():
                            * self.distance_calculator_tools.distance_tool_list])
         
         self.llm_with_tools = self.llm.bind_tools(tools=self.tools)
+        self.context_manager = ContextWindowManager()
         
         self.graph = None
         
-        # Use budget-aware system prompt
+        # Default budget-aware system prompt, overridable per invocation
         self.system_prompt = get_budget_aware_system_prompt(budget_preference)
     
+    def get_system_prompt(self, config: RunnableConfig = None):
+        """Resolve the system prompt for this run from config["configurable"]["budget_preference"]"""
+        budget_preference = ((config or {}).get("configurable") or {}).get("budget_preference")
+        if budget_preference:
+            return get_budget_aware_system_prompt(budget_preference)
+        return self.system_prompt
     
-    def agent_function(self,state: MessagesState):
-        """Main agent function"""
+    def prepare_turn(self, state: MessagesState, config: RunnableConfig = None):
+        """LLM and prompt for the next agent turn; once the run budget is spent, a final turn without tools"""
         user_question = state["messages"]
-        input_question = [self.system_prompt] + user_question
-        response = self.llm_with_tools.invoke(input_question)
+        input_question = self.context_manager.build_prompt(self.get_system_prompt(config), user_question)
+        reason = RunBudget.from_config(config).finalize_reason(user_question)
+        if reason is None:
+            return self.llm_with_tools, input_question
+        budget_metrics.forced_finalizations[reason] += 1
+        print(f"Agent budget reached ({reason}), forcing the final answer")
+        return self.llm, input_question + [HumanMessage(content=FINAL_SYNTHESIS_PROMPT)]
+    
+    def agent_function(self,state: MessagesState, config: RunnableConfig = None):
+        """Main agent function"""
+        llm, input_question = self.prepare_turn(state, config)
+        response = llm.invoke(input_question)
+        return {"messages": [response]}
+    
+    async def aagent_function(self, state: MessagesState, config: RunnableConfig = None):
+        """Async agent function used by graph.ainvoke / astream so the LLM call never blocks the event loop"""
+        llm, input_question = self.prepare_turn(state, config)
+        response = await llm.ainvoke(input_question)
         return {"messages": [response]}
     def build_graph(self):
         graph_builder=StateGraph(MessagesState)
-        graph_builder.add_node("agent", self.agent_function)
-        graph_builder.add_node("tools", ToolNode(tools=self.tools))
+        graph_builder.add_node("agent", RunnableLambda(self.agent_function, afunc=self.aagent_function, name="agent"))
+        self.tool_executor = ConcurrentToolExecutor(self.tools)
+        graph_builder.add_node("tools", RunnableLambda(self.tool_executor.invoke, afunc=self.tool_executor.ainvoke, name="tools"))
         graph_builder.add_edge(START,"agent")
         graph_builder.add_conditional_edges("agent",tools_condition)
-        graph_builder.add_edge("tools","agent")
+        graph_builder.add_node("compact_tools", ToolOutputCompactor())
+        graph_builder.add_edge("tools","compact_tools")
+        graph_builder.add_edge("compact_tools","agent")
         graph_builder.add_edge("agent",END)
         self.graph = graph_builder.compile()
         return self.graph
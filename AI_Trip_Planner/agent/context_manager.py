@@ -0,0 +1,162 @@
+import json
+import re
+from typing import Any, Dict, List, Optional
+from langchain_core.messages import AIMessage, BaseMessage, ToolMessage
+from utils.config_loaders import get_config_value
+from utils.token_estimator import estimate_tokens, truncate_to_tokens
+
+THINK_BLOCK = re.compile(r"<think>.*?</think>\s*", re.DOTALL)
+DIGEST_MARKER = " …[digest: full result already used]"
+
+
+def message_tokens(message: BaseMessage) -> int:
+    """Estimated prompt tokens for one message: content, tool-call arguments and framing"""
+    content = message.content if isinstance(message.content, str) else json.dumps(message.content, default=str)
+    tokens = estimate_tokens(content) + 4
+    for call in getattr(message, "tool_calls", None) or []:
+        tokens += estimate_tokens(call["name"]) + estimate_tokens(json.dumps(call["args"], default=str)) + 4
+    return tokens
+
+
+class ContextMetrics:
+    """Process-wide prompt-size counters for agent turns"""
+
+    def __init__(self):
+        self.turns = 0
+        self.total_prompt_tokens = 0
+        self.last_prompt_tokens = 0
+        self.max_prompt_tokens_seen = 0
+        self.digested_messages = 0
+        self.dropped_rounds = 0
+        self.over_ceiling = 0
+
+    def record(self, tokens: int):
+        self.turns += 1
+        self.total_prompt_tokens += tokens
+        self.last_prompt_tokens = tokens
+        self.max_prompt_tokens_seen = max(self.max_prompt_tokens_seen, tokens)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "turns": self.turns,
+            "last_prompt_tokens": self.last_prompt_tokens,
+            "max_prompt_tokens": self.max_prompt_tokens_seen,
+            "avg_prompt_tokens": round(self.total_prompt_tokens / self.turns, 1) if self.turns else 0.0,
+            "digested_messages": self.digested_messages,
+            "dropped_rounds": self.dropped_rounds,
+            "over_ceiling": self.over_ceiling,
+        }
+
+
+context_metrics = ContextMetrics()
+
+
+class ContextWindowManager:
+    """
+    Builds the prompt for each agent turn from the ReAct message history.
+
+    The system prompt and the user's messages are always kept, and so are the tool results
+    the agent has not answered yet. Results it has already consumed are kept in full for the
+    most recent keep_full_rounds rounds and collapsed into short digests before that;
+    <think> reasoning is dropped from earlier AI turns. If the prompt is still over
+    max_prompt_tokens, digests shrink, then the oldest tool rounds are dropped, then the
+    fresh results are cut to share what is left. Only the prompt is trimmed; the graph
+    state keeps the full history.
+    """
+
+    def __init__(self, max_prompt_tokens: Optional[int] = None, keep_full_rounds: Optional[int] = None,
+                 digest_tokens: Optional[int] = None):
+        settings = get_config_value("agent", "context", default={}) or {}
+        self.max_prompt_tokens = (max_prompt_tokens if max_prompt_tokens is not None
+                                  else settings.get("max_prompt_tokens", 12000))
+        self.keep_full_rounds = keep_full_rounds if keep_full_rounds is not None else settings.get("keep_full_rounds", 1)
+        self.digest_tokens = digest_tokens if digest_tokens is not None else settings.get("digest_tokens", 120)
+
+    @staticmethod
+    def _ages(messages: List[BaseMessage]) -> List[int]:
+        """For each message, how many AI turns came after it (0 = not yet seen by the agent)"""
+        ages = []
+        later_ai_turns = 0
+        for message in reversed(messages):
+            ages.append(later_ai_turns)
+            if isinstance(message, AIMessage):
+                later_ai_turns += 1
+        return list(reversed(ages))
+
+    @staticmethod
+    def _digest(message: ToolMessage, tokens: int) -> ToolMessage:
+        if not isinstance(message.content, str) or estimate_tokens(message.content) <= tokens:
+            return message
+        return message.model_copy(update={"content": truncate_to_tokens(message.content, tokens, marker=DIGEST_MARKER)})
+
+    @staticmethod
+    def _strip_reasoning(message: AIMessage) -> AIMessage:
+        if isinstance(message.content, str) and "<think>" in message.content:
+            return message.model_copy(update={"content": THINK_BLOCK.sub("", message.content)})
+        return message
+
+    def _prompt_tokens(self, system_prompt: BaseMessage, history: List[BaseMessage]) -> int:
+        return message_tokens(system_prompt) + sum(message_tokens(message) for message in history)
+
+    def _collapse(self, history: List[BaseMessage], ages: List[int], min_age: int, tokens: int) -> List[BaseMessage]:
+        collapsed = []
+        for message, age in zip(history, ages):
+            if isinstance(message, ToolMessage) and age >= min_age:
+                digested = self._digest(message, tokens)
+                if digested is not message:
+                    context_metrics.digested_messages += 1
+                message = digested
+            elif isinstance(message, AIMessage) and age >= 1:
+                message = self._strip_reasoning(message)
+            collapsed.append(message)
+        return collapsed
+
+    @staticmethod
+    def _drop_oldest_round(history: List[BaseMessage], ages: List[int]):
+        """Remove the oldest consumed AI tool-call message with its tool results; False if none is left"""
+        for start, message in enumerate(history):
+            if isinstance(message, AIMessage) and message.tool_calls and ages[start] >= 1:
+                end = start + 1
+                while end < len(history) and isinstance(history[end], ToolMessage):
+                    end += 1
+                del history[start:end], ages[start:end]
+                return True
+        return False
+
+    def _fit_fresh_results(self, system_prompt: BaseMessage, history: List[BaseMessage], ages: List[int]) -> List[BaseMessage]:
+        fresh = [i for i, message in enumerate(history) if isinstance(message, ToolMessage) and ages[i] == 0]
+        if not fresh:
+            return history
+        others = self._prompt_tokens(system_prompt, [m for i, m in enumerate(history) if i not in fresh])
+        share = max((self.max_prompt_tokens - others) // len(fresh) - 4, 32)
+        history = list(history)
+        for i in fresh:
+            if isinstance(history[i].content, str):
+                history[i] = history[i].model_copy(update={"content": truncate_to_tokens(history[i].content, share)})
+        return history
+
+    def build_prompt(self, system_prompt: BaseMessage, messages: List[BaseMessage]) -> List[BaseMessage]:
+        """System prompt plus the trimmed history for the next LLM call; records its size"""
+        history = list(messages)
+        ages = self._ages(history)
+        history = self._collapse(history, ages, self.keep_full_rounds + 1, self.digest_tokens)
+        tokens = self._prompt_tokens(system_prompt, history)
+
+        digest_tokens = self.digest_tokens
+        while tokens > self.max_prompt_tokens and digest_tokens >= 24:
+            history = self._collapse(history, ages, 1, digest_tokens)
+            tokens = self._prompt_tokens(system_prompt, history)
+            digest_tokens //= 2
+        while tokens > self.max_prompt_tokens and self._drop_oldest_round(history, ages):
+            context_metrics.dropped_rounds += 1
+            tokens = self._prompt_tokens(system_prompt, history)
+        if tokens > self.max_prompt_tokens:
+            history = self._fit_fresh_results(system_prompt, history, ages)
+            tokens = self._prompt_tokens(system_prompt, history)
+        if tokens > self.max_prompt_tokens:
+            context_metrics.over_ceiling += 1
+
+        context_metrics.record(tokens)
+        print(f"Agent turn prompt: ~{tokens} tokens in {len(history) + 1} messages "
+              f"(history {len(messages)} messages, ceiling {self.max_prompt_tokens})")
+        return [system_prompt] + history
@@ -0,0 +1,92 @@
+import hashlib
+import threading
+from typing import Dict, Iterable, Tuple
+from agent.agentic_workflow import GraphBuilder
+from prompt_library.prompt import BUDGET_PREFERENCES
+
+
+class GraphRegistry:
+    """
+    Process-wide registry of compiled agent graphs keyed by (model_provider, budget_preference).
+
+    The LLM client, tool instances and compiled StateGraph are built once per model provider;
+    each budget preference gets a view of that graph bound to its budget-aware system prompt.
+    """
+
+    def __init__(self):
+        self._builders: Dict[str, GraphBuilder] = {}
+        self._graphs: Dict[Tuple[str, str], object] = {}
+        self._diagrams: Dict[Tuple[str, str], Tuple[bytes, str]] = {}
+        self._lock = threading.Lock()
+        self._diagram_lock = threading.Lock()
+
+    @staticmethod
+    def _normalize_budget(budget_preference: str) -> str:
+        return budget_preference if budget_preference in BUDGET_PREFERENCES else "budget_friendly"
+
+    def get_builder(self, model_provider: str = "groq") -> GraphBuilder:
+        """Return the shared GraphBuilder (LLM + tools + compiled graph) for a model provider"""
+        builder = self._builders.get(model_provider)
+        if builder is None:
+            with self._lock:
+                builder = self._builders.get(model_provider)
+                if builder is None:
+                    print(f"Building agent graph for provider: {model_provider}")
+                    builder = GraphBuilder(model_provider=model_provider)
+                    builder.build_graph()
+                    self._builders[model_provider] = builder
+        return builder
+
+    def get_graph(self, model_provider: str = "groq", budget_preference: str = "budget_friendly"):
+        """Return the compiled graph for (model_provider, budget_preference), building it on first use"""
+        key = (model_provider, self._normalize_budget(budget_preference))
+        graph = self._graphs.get(key)
+        if graph is None:
+            builder = self.get_builder(model_provider)
+            with self._lock:
+                graph = self._graphs.get(key)
+                if graph is None:
+                    graph = builder.graph.with_config(configurable={"budget_preference": key[1]})
+                    self._graphs[key] = graph
+        return graph
+
+    def warm_up(self, model_providers: Iterable[str] = ("groq",), budget_preferences: Iterable[str] = BUDGET_PREFERENCES):
+        """Build every (model_provider, budget_preference) graph ahead of the first request"""
+        for model_provider in model_providers:
+            for budget_preference in budget_preferences:
+                self.get_graph(model_provider, budget_preference)
+
+    def get_diagram(self, fmt: str = "png", model_provider: str = "groq") -> Tuple[bytes, str]:
+        """
+        Return (content, etag) for the agent graph diagram, rendered once and cached in memory.
+
+        Args:
+            fmt: "png" (mermaid PNG, rendered remotely on first use) or "mmd" (mermaid source)
+        """
+        if fmt not in ("png", "mmd"):
+            raise ValueError(f"Unsupported diagram format: {fmt}")
+        key = (model_provider, fmt)
+        diagram = self._diagrams.get(key)
+        if diagram is None:
+            drawable = self.get_builder(model_provider).graph.get_graph()
+            with self._diagram_lock:
+                diagram = self._diagrams.get(key)
+                if diagram is None:
+                    if fmt == "png":
+                        content = drawable.draw_mermaid_png()
+                    else:
+                        content = drawable.draw_mermaid().encode("utf-8")
+                    etag = '"' + hashlib.sha256(content).hexdigest()[:32] + '"'
+                    diagram = (content, etag)
+                    self._diagrams[key] = diagram
+        return diagram
+
+    def clear(self):
+        """Drop all cached graphs (they are rebuilt lazily on next use)"""
+        with self._lock:
+            self._builders.clear()
+            self._graphs.clear()
+            self._diagrams.clear()
+
+
+graph_registry = GraphRegistry()
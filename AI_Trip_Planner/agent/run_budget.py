@@ -0,0 +1,79 @@
+import time
+from typing import Any, Dict, List, Optional
+from langchain_core.messages import AIMessage, BaseMessage
+from langchain_core.runnables import RunnableConfig
+from utils.config_loaders import get_config_value
+
+# Graph steps per tool round: agent -> tools -> compact_tools
+STEPS_PER_TOOL_ROUND = 3
+
+# agent.budgets defaults, read once; RunBudget is built on every agent and tool turn
+_budget_settings = get_config_value("agent", "budgets", default={}) or {}
+
+
+class BudgetMetrics:
+    """Process-wide counters for agent runs cut short by their budgets"""
+
+    def __init__(self):
+        self.forced_finalizations: Dict[str, int] = {"tool_rounds": 0, "time": 0}
+
+    def stats(self) -> Dict[str, Any]:
+        return {"forced_finalizations": dict(self.forced_finalizations)}
+
+
+budget_metrics = BudgetMetrics()
+
+
+class RunBudget:
+    """
+    Tool-round and wall-clock limits for one agent run.
+
+    Limits come from config["configurable"] (max_tool_rounds, max_seconds, run_started_at, set
+    per request) over the agent.budgets defaults, which are read once at import. When the tool rounds are used up, or less than
+    finalize_margin_seconds of the time budget is left, the agent is told to finalize: it gets
+    one more turn with no tools bound and writes its answer from what it already gathered.
+    """
+
+    def __init__(self, max_tool_rounds: Optional[int] = None, max_seconds: Optional[float] = None,
+                 finalize_margin_seconds: Optional[float] = None, started_at: Optional[float] = None):
+        self.max_tool_rounds = (max_tool_rounds if max_tool_rounds is not None
+                                else _budget_settings.get("max_tool_rounds", 6))
+        self.max_seconds = max_seconds if max_seconds is not None else _budget_settings.get("max_seconds", 90.0)
+        self.finalize_margin_seconds = (finalize_margin_seconds if finalize_margin_seconds is not None
+                                        else _budget_settings.get("finalize_margin_seconds", 20.0))
+        self.started_at = started_at
+
+    @classmethod
+    def from_config(cls, config: Optional[RunnableConfig] = None) -> "RunBudget":
+        configurable = (config or {}).get("configurable") or {}
+        return cls(max_tool_rounds=configurable.get("max_tool_rounds"), max_seconds=configurable.get("max_seconds"),
+                   started_at=configurable.get("run_started_at"))
+
+    @property
+    def recursion_limit(self) -> int:
+        """Graph step limit that lets every allowed tool round plus the final turn run"""
+        return STEPS_PER_TOOL_ROUND * self.max_tool_rounds + 4
+
+    @staticmethod
+    def tool_rounds(messages: List[BaseMessage]) -> int:
+        return sum(1 for message in messages if isinstance(message, AIMessage) and message.tool_calls)
+
+    def remaining_seconds(self) -> Optional[float]:
+        """Seconds left in the time budget, or None when the run start is unknown"""
+        if self.started_at is None or self.max_seconds is None:
+            return None
+        return self.max_seconds - (time.time() - self.started_at)
+
+    def tool_time_limit(self) -> Optional[float]:
+        """How long a tool turn may take and still leave the finalize margin for the answer"""
+        remaining = self.remaining_seconds()
+        return None if remaining is None else remaining - self.finalize_margin_seconds
+
+    def finalize_reason(self, messages: List[BaseMessage]) -> Optional[str]:
+        """"tool_rounds" or "time" when the next agent turn must be the final answer"""
+        if self.tool_rounds(messages) >= self.max_tool_rounds:
+            return "tool_rounds"
+        remaining = self.remaining_seconds()
+        if remaining is not None and remaining <= self.finalize_margin_seconds:
+            return "time"
+        return None
@@ -0,0 +1,160 @@
+import asyncio
+import json
+import time
+from typing import Any, Dict, List, Optional
+from langchain_core.messages import AIMessage, ToolMessage
+from langchain_core.runnables import RunnableConfig
+from langchain_core.tools import BaseTool
+from langgraph.graph import MessagesState
+from agent.run_budget import RunBudget
+from logger import get_logger
+from utils.concurrency import tool_pool
+from utils.config_loaders import get_config_value
+
+# A tool turn started near the end of the time budget still gets this long
+MIN_TURN_TIMEOUT_SECONDS = 2.0
+
+logger = get_logger(__name__)
+
+
+class ToolExecutionMetrics:
+    """Process-wide outcome counters for agent tool calls"""
+
+    def __init__(self):
+        self.turns = 0
+        self.calls = 0
+        self.completed = 0
+        self.failed = 0
+        self.timed_out = 0
+        self.turn_timeouts = 0
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "turns": self.turns,
+            "calls": self.calls,
+            "completed": self.completed,
+            "failed": self.failed,
+            "timed_out": self.timed_out,
+            "turn_timeouts": self.turn_timeouts,
+        }
+
+
+tool_metrics = ToolExecutionMetrics()
+
+
+def tool_message_content(output: Any) -> str:
+    """Tool output as message text: strings unchanged, anything else as JSON"""
+    if isinstance(output, str):
+        return output
+    try:
+        return json.dumps(output, ensure_ascii=False, default=str)
+    except (TypeError, ValueError):
+        return str(output)
+
+
+class ConcurrentToolExecutor:
+    """
+    Graph node that runs every tool call of an agent turn concurrently.
+
+    Replaces the stock ToolNode: each call gets its own deadline (per tool name, or the
+    default) and the whole turn is capped by a turn deadline. A call that misses its deadline
+    or raises is answered with a structured error ToolMessage, so the agent continues with
+    the results that did arrive instead of the plan stalling on one slow API.
+    Tools with a coroutine are awaited and cancelled at their deadline. Sync tools run on the
+    dedicated agent-tools pool: a timed-out worker thread cannot be interrupted, so it finishes
+    there (its late result is discarded) without holding threads report enrichment needs.
+    """
+
+    def __init__(self, tools: List[BaseTool], tool_timeout_seconds: Optional[float] = None,
+                 turn_timeout_seconds: Optional[float] = None, tool_timeouts: Optional[Dict[str, float]] = None):
+        settings = get_config_value("agent", "tools", default={}) or {}
+        self.tools_by_name: Dict[str, BaseTool] = {tool.name: tool for tool in tools}
+        self.tool_timeout_seconds = (tool_timeout_seconds if tool_timeout_seconds is not None
+                                     else settings.get("timeout_seconds", 20.0))
+        self.turn_timeout_seconds = (turn_timeout_seconds if turn_timeout_seconds is not None
+                                     else settings.get("turn_timeout_seconds", 45.0))
+        self.tool_timeouts: Dict[str, float] = (tool_timeouts if tool_timeouts is not None
+                                                else settings.get("timeouts", {}) or {})
+
+    def timeout_for(self, tool_name: str, turn_timeout: Optional[float] = None) -> float:
+        turn_timeout = self.turn_timeout_seconds if turn_timeout is None else turn_timeout
+        return min(self.tool_timeouts.get(tool_name, self.tool_timeout_seconds), turn_timeout)
+
+    def turn_timeout_for(self, config: Optional[RunnableConfig]) -> float:
+        """Turn deadline, shortened so the run's time budget keeps room for the final answer"""
+        time_limit = RunBudget.from_config(config).tool_time_limit()
+        if time_limit is None:
+            return self.turn_timeout_seconds
+        return max(min(self.turn_timeout_seconds, time_limit), MIN_TURN_TIMEOUT_SECONDS)
+
+    @staticmethod
+    def _tool_calls(state: MessagesState) -> List[dict]:
+        messages = state["messages"]
+        last = messages[-1] if messages else None
+        return list(last.tool_calls) if isinstance(last, AIMessage) else []
+
+    def _error_message(self, call: dict, status: str, detail: str, timeout_seconds: Optional[float] = None) -> ToolMessage:
+        payload = {"status": status, "tool": call["name"], "error": detail}
+        if timeout_seconds is not None:
+            payload["timeout_seconds"] = timeout_seconds
+        payload["note"] = "No result from this tool; continue with the other results and say the data is unavailable."
+        return ToolMessage(content=json.dumps(payload), name=call["name"], tool_call_id=call["id"], status="error")
+
+    async def _run_call(self, call: dict, config: Optional[RunnableConfig]) -> Any:
+        tool = self.tools_by_name[call["name"]]
+        if getattr(tool, "coroutine", None) is not None:
+            return await tool.ainvoke(call["args"], config)
+        return await tool_pool.run(tool.invoke, call["args"], config)
+
+    async def _execute(self, call: dict, config: Optional[RunnableConfig], turn_timeout: float) -> ToolMessage:
+        tool_metrics.calls += 1
+        if call["name"] not in self.tools_by_name:
+            tool_metrics.failed += 1
+            return self._error_message(call, "error", f"unknown tool '{call['name']}'")
+        timeout = self.timeout_for(call["name"], turn_timeout)
+        started = time.perf_counter()
+        try:
+            output = await asyncio.wait_for(self._run_call(call, config), timeout=timeout)
+        except asyncio.TimeoutError:
+            tool_metrics.timed_out += 1
+            logger.warning("Tool %s timed out after %ss", call["name"], timeout)
+            return self._error_message(call, "timed_out", f"timed out after {timeout}s", timeout)
+        except Exception as e:
+            tool_metrics.failed += 1
+            logger.warning("Tool %s failed after %.2fs: %s", call["name"], time.perf_counter() - started, e)
+            return self._error_message(call, "error", str(e) or type(e).__name__)
+        tool_metrics.completed += 1
+        return ToolMessage(content=tool_message_content(output), name=call["name"], tool_call_id=call["id"])
+
+    async def ainvoke(self, state: MessagesState, config: RunnableConfig = None) -> Dict[str, List[ToolMessage]]:
+        """Execute the last AI message's tool calls; messages come back in call order"""
+        calls = self._tool_calls(state)
+        tool_metrics.turns += 1
+        if not calls:
+            return {"messages": []}
+        turn_timeout = self.turn_timeout_for(config)
+        running = [asyncio.create_task(self._execute(call, config, turn_timeout)) for call in calls]
+        done, pending = await asyncio.wait(running, timeout=turn_timeout)
+        if pending:
+            tool_metrics.turn_timeouts += 1
+            for task in pending:
+                task.cancel()
+        messages = []
+        for call, task in zip(calls, running):
+            if task in done:
+                messages.append(task.result())
+            else:
+                tool_metrics.timed_out += 1
+                messages.append(self._error_message(
+                    call, "timed_out", f"turn deadline of {turn_timeout:g}s reached", turn_timeout))
+        return {"messages": messages}
+
+    def invoke(self, state: MessagesState, config: RunnableConfig = None) -> Dict[str, List[ToolMessage]]:
+        """Sync entry point for graph.invoke from a thread without a running event loop"""
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return asyncio.run(self.ainvoke(state, config))
+        # Running the turn here would block the caller's loop until every tool finished
+        raise RuntimeError("ConcurrentToolExecutor.invoke() was called inside a running event loop; "
+                           "use graph.ainvoke()/astream() so the tools node is awaited via ainvoke()")
@@ -0,0 +1,217 @@
+import ast
+import json
+import re
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from langchain_core.messages import AIMessage, ToolMessage
+from langgraph.graph import MessagesState
+from utils.config_loaders import get_config_value
+from utils.token_estimator import estimate_tokens, truncate_to_tokens
+
+URL_PATTERN = re.compile(r"\(?\s*(?:https?://|www\.)\S+")
+# Search-result fields the model never needs (links, scores, raw page dumps, request metadata)
+DROP_KEYS = {"url", "urls", "raw_content", "images", "image", "favicon", "score", "response_time",
+             "request_id", "follow_up_questions", "auto_parameters"}
+FORECAST_LINE = re.compile(r"^(\d{4}-\d{2}-\d{2}): (-?[\d.]+) degree celcius , (.+)$")
+
+
+def clean_text(text: str) -> str:
+    """Strip URLs and collapse whitespace runs"""
+    text = URL_PATTERN.sub("", text)
+    text = re.sub(r"[ \t]+", " ", text)
+    return re.sub(r"\s*\n\s*", "\n", text).strip()
+
+
+def dedupe_lines(text: str) -> str:
+    """Drop repeated lines (case and whitespace insensitive), keeping first occurrences; table rows are kept"""
+    seen = set()
+    lines = []
+    for line in text.split("\n"):
+        key = " ".join(line.lower().split())
+        if key and key in seen and not key.startswith("|"):
+            continue
+        seen.add(key)
+        lines.append(line)
+    return "\n".join(lines)
+
+
+def compact_value(value: Any) -> Any:
+    """Remove link/metadata fields, clean strings and drop duplicate list items, recursively"""
+    if isinstance(value, dict):
+        compacted = {key: compact_value(item) for key, item in value.items()
+                     if key not in DROP_KEYS and item is not None}
+        return {key: item for key, item in compacted.items() if item not in ("", [], {})}
+    if isinstance(value, (list, tuple)):
+        items = []
+        seen = set()
+        for item in value:
+            item = compact_value(item)
+            key = json.dumps(item, sort_keys=True, default=str).lower()
+            if item in ("", [], {}) or key in seen:
+                continue
+            seen.add(key)
+            items.append(item)
+        return items
+    if isinstance(value, str):
+        return clean_text(value)
+    return value
+
+
+def _shrink_strings(value: Any, max_tokens: int) -> Any:
+    if isinstance(value, dict):
+        return {key: _shrink_strings(item, max_tokens) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_shrink_strings(item, max_tokens) for item in value]
+    if isinstance(value, str):
+        return truncate_to_tokens(value, max_tokens, marker="…")
+    return value
+
+
+def split_structured(content: str) -> Tuple[str, Optional[Any]]:
+    """
+    Split tool text into (prefix, structured value) when it carries a JSON document or a
+    Python dict/list repr, e.g. "Following are the attractions of Goa: {'results': [...]}"
+    """
+    stripped = content.strip()
+    if stripped[:1] in "{[":
+        try:
+            return "", json.loads(stripped)
+        except ValueError:
+            pass
+    start = min((i for i in (content.find("{"), content.find("[")) if i >= 0), default=-1)
+    if start < 0:
+        return content, None
+    body = content[start:].strip()
+    for parse in (json.loads, ast.literal_eval):
+        try:
+            return content[:start], parse(body)
+        except (ValueError, SyntaxError, MemoryError, RecursionError):
+            continue
+    return content, None
+
+
+def summarize_forecast(content: str) -> str:
+    """Collapse 3-hourly "date: temp degree celcius , desc" lines into one line per day"""
+    header = []
+    days: "OrderedDict[str, Tuple[List[float], List[str]]]" = OrderedDict()
+    for line in content.split("\n"):
+        match = FORECAST_LINE.match(line.strip())
+        if not match:
+            if not days:
+                header.append(line)
+            continue
+        temps, conditions = days.setdefault(match.group(1), ([], []))
+        temps.append(float(match.group(2)))
+        conditions.append(match.group(3).strip())
+    if not days:
+        return content
+    lines = []
+    for date, (temps, conditions) in days.items():
+        common = sorted(set(conditions), key=lambda condition: (-conditions.count(condition), conditions.index(condition)))
+        lines.append(f"{date}: {min(temps):.0f}-{max(temps):.0f}°C, {', '.join(common[:2])}")
+    return "\n".join(header + lines)
+
+
+class CompactionMetrics:
+    """Process-wide token counters for compacted tool outputs"""
+
+    def __init__(self):
+        self.messages = 0
+        self.compacted = 0
+        self.tokens_in = 0
+        self.tokens_out = 0
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "messages": self.messages,
+            "compacted": self.compacted,
+            "tokens_in": self.tokens_in,
+            "tokens_out": self.tokens_out,
+            "tokens_saved": self.tokens_in - self.tokens_out,
+        }
+
+
+compaction_metrics = CompactionMetrics()
+
+
+class ToolOutputCompactor:
+    """
+    Graph node between the tool executor and the agent that shrinks fresh tool results.
+
+    Each result is cleaned (URLs, link/score/raw-page fields and whitespace removed),
+    deduplicated, passed through a tool-specific summarizer where one exists (the 3-hourly
+    weather forecast becomes one line per day) and finally cut to the tool's token budget.
+    Compacted messages keep their id, so they replace the raw results in the graph state
+    and every later agent turn re-sends only the compact form.
+    """
+
+    SUMMARIZERS: Dict[str, Callable[[str], str]] = {
+        "get_weather_forecast": summarize_forecast,
+    }
+
+    def __init__(self, default_budget_tokens: Optional[int] = None, budgets: Optional[Dict[str, int]] = None,
+                 enabled: Optional[bool] = None):
+        settings = get_config_value("agent", "compaction", default={}) or {}
+        self.enabled = enabled if enabled is not None else settings.get("enabled", True)
+        self.default_budget_tokens = (default_budget_tokens if default_budget_tokens is not None
+                                      else settings.get("default_budget_tokens", 600))
+        self.budgets: Dict[str, int] = budgets if budgets is not None else settings.get("budgets", {}) or {}
+
+    def budget_for(self, tool_name: str) -> int:
+        return self.budgets.get(tool_name, self.default_budget_tokens)
+
+    def compact(self, tool_name: str, content: str) -> str:
+        """Compact one tool result to its budget"""
+        budget = self.budget_for(tool_name)
+        summarizer = self.SUMMARIZERS.get(tool_name)
+        if summarizer is not None:
+            content = summarizer(content)
+        prefix, value = split_structured(content)
+        if value is None:
+            return truncate_to_tokens(dedupe_lines(clean_text(content)), budget)
+
+        value = compact_value(value)
+        prefix = clean_text(prefix)
+        prefix = f"{prefix} " if prefix else ""
+        render = lambda data: prefix + json.dumps(data, ensure_ascii=False, separators=(",", ":"))
+        text = render(value)
+        # Shorten every string evenly before cutting the tail, so all results stay represented
+        limit = 256
+        while estimate_tokens(text) > budget and limit >= 16:
+            text = render(_shrink_strings(value, limit))
+            limit //= 2
+        return truncate_to_tokens(text, budget)
+
+    @staticmethod
+    def _fresh_results(state: MessagesState) -> List[ToolMessage]:
+        """Tool messages added since the last agent turn"""
+        results = []
+        for message in reversed(state["messages"]):
+            if isinstance(message, AIMessage):
+                break
+            if isinstance(message, ToolMessage):
+                results.append(message)
+        return list(reversed(results))
+
+    def __call__(self, state: MessagesState) -> Dict[str, List[ToolMessage]]:
+        if not self.enabled:
+            return {"messages": []}
+        replacements = []
+        for message in self._fresh_results(state):
+            if message.status == "error" or not isinstance(message.content, str):
+                continue
+            compaction_metrics.messages += 1
+            before = estimate_tokens(message.content)
+            content = self.compact(message.name or "", message.content)
+            after = estimate_tokens(content)
+            compaction_metrics.tokens_in += before
+            if after >= before:
+                compaction_metrics.tokens_out += before
+                continue
+            compaction_metrics.compacted += 1
+            compaction_metrics.tokens_out += after
+            replacements.append(message.model_copy(update={
+                "content": content,
+                "response_metadata": {**message.response_metadata, "compacted_from_tokens": before},
+            }))
+        return {"messages": replacements}
@@ -0,0 +1 @@
+from logger.logging import get_logger
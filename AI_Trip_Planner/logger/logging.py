@@ -0,0 +1,16 @@
+import logging
+from utils.config_loaders import get_config_value
+
+LOG_FORMAT = "%(asctime)s %(levelname)s [%(name)s] %(message)s"
+ROOT_LOGGER = "ai_trip_planner"
+
+
+def get_logger(name: str) -> logging.Logger:
+    """Logger for an app module; the shared handler and level (logging.level in config) are set up once"""
+    root = logging.getLogger(ROOT_LOGGER)
+    if not root.handlers:
+        handler = logging.StreamHandler()
+        handler.setFormatter(logging.Formatter(LOG_FORMAT))
+        root.addHandler(handler)
+        root.setLevel(str(get_config_value("logging", "level", default="INFO")).upper())
+    return root.getChild(name)
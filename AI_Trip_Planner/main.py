@@ -1,8 +1,15 @@
-from airportsdata import load
-from fastapi import FastAPI
-from fastapi.responses import FileResponse
-from pydantic import BaseModel
-from agent.agentic_workflow import GraphBuilder
+import json
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict, List, Optional, Tuple
+from fastapi import FastAPI, Request
+from fastapi.responses import FileResponse, Response, StreamingResponse
+from pydantic import BaseModel, Field
+from agent.graph_registry import graph_registry
+from agent.context_manager import context_metrics
+from agent.run_budget import RunBudget, budget_metrics
+from agent.tool_executor import tool_metrics
+from agent.tool_output_compactor import compaction_metrics
 
 from fastapi.responses import JSONResponse
 from utils.model_loaders import ModelLoader
@@ -10,11 +17,38 @@ import utils.model_loaders
 from dotenv import load_dotenv
 load_dotenv()
 import os
-from utils.car_rental_service import CarRentalService
-from utils.airport_distance_calculator import AirportDistanceCalculator
+from utils.car_rental_service import get_car_rental_service
+from utils.airport_distance_calculator import get_airport_distance_calculator
+from utils.airport_directory import get_airport_directory
 from utils.word_document_exporter import WordDocumentExporter
+from utils.concurrency import QueueFullError, blocking_executor, fanout_executor, query_limiter, tool_pool
+from utils.report_enrichment import EnrichmentPipeline, EnrichmentResult, EnrichmentTask, enrichment_metrics
+from utils.geocode_cache import get_geocode_cache
+from utils.route_cache import get_route_cache
+from utils.response_cache import ResponseCache, get_response_cache
+from utils.place_search_cache import get_place_search_cache
+from utils.weather_cache import get_weather_cache
+from utils.exchange_rates import get_exchange_rate_table
+from utils.single_flight import single_flight_stats
+from utils.http_client import get_http_client
+from utils.token_stream import TurnTokenFilter
+from utils.config_loaders import get_config_value
 
-app=FastAPI()
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Build the LLM client, tools and compiled graphs once for the whole process
+    try:
+        graph_registry.warm_up(model_providers=["groq"])
+    except Exception as e:
+        print(f"Agent graph warm-up failed, graphs will be built on first request: {e}")
+    # Load and index the airport dataset before the first request needs it
+    get_airport_directory()
+    yield
+    get_http_client().close()
+    fanout_executor.shutdown()
+    tool_pool.shutdown()
+
+app=FastAPI(lifespan=lifespan)
 
 class QueryRequest(BaseModel):
     query: str = None
@@ -24,11 +58,284 @@ class QueryRequest(BaseModel):
     endLocationCode: str = None    # IATA or city code for destination
     startCity: str = None          # City name for origin (optional)
     endCity: str = None            # City name for destination (optional)
+    use_cache: bool = True         # Set to false to always run the agent
+    max_tool_rounds: int = Field(None, ge=1)   # Per-request agent budgets (defaults: agent.budgets in config.yaml)
+    max_seconds: float = Field(None, gt=0)
 
 class WordExportRequest(BaseModel):
     content: str
     query_info: dict = None
+
+REPORT_ATTRACTIONS = ("{city} city center", "downtown {city}", "main tourist area {city}")
+
+def fetch_car_rentals(query: QueryRequest) -> dict:
+    """Amadeus transfer offers for the query's start/end locations (sync HTTP call)"""
+    airports = get_airport_directory()
+
+    # Use codes from request, or try to convert city names, fallback to CCU
+    start_code = query.startLocationCode or (airports.city_to_iata(query.startCity) if query.startCity else None) or "CCU"
+    end_code = query.endLocationCode or (airports.city_to_iata(query.endCity) if query.endCity else None) or "CCU"
+    return get_car_rental_service().search_cars(
+        startLocationCode=start_code,
+        endLocationCode=end_code,
+        transferType="HOURLY",
+        startDateTime="2025-10-10T10:00:00",
+        duration="PT9H30M",
+        passengers=1
+      #  currency="INR"
+    )
+
+def format_car_rental_section(car_rentals, error: str = None) -> str:
+    """Car rental options for the report"""
+    car_rental_section = "\n\n## Car Rental Options\n"
+    if error is not None:
+        return car_rental_section + f"Car rental info unavailable: {error}\n"
+    # Handle response according to response.json format
+    if isinstance(car_rentals, dict) and 'data' in car_rentals:
+        for offer in car_rentals['data']:
+            vehicle = offer.get('vehicle', {})
+            provider = offer.get('serviceProvider', {})
+            partner = offer.get('partnerInfo', {}).get('serviceProvider', {})
+            quotation = offer.get('quotation', {})
+            cancellation = offer.get('cancellationRules', [{}])[0].get('ruleDescription', 'N/A')
+            desc = vehicle.get('description', 'N/A')
+            seats = vehicle.get('seats', [{}])[0].get('count', 'N/A')
+            baggages = vehicle.get('baggages', [{}])[0].get('count', 'N/A')
+            provider_name = provider.get('name', partner.get('name', 'N/A'))
+            price = quotation.get('monetaryAmount', 'N/A')
+            currency = quotation.get('currencyCode', 'N/A')
+            car_rental_section += (
+                f"- Vehicle: {desc} | Seats: {seats} | Baggage: {baggages} | Provider: {provider_name} | Price: {price} {currency}\n"
+                f"  Cancellation: {cancellation}\n"
+            )
+    else:
+        car_rental_section += str(car_rentals) + "\n"
+    return car_rental_section
+
+def build_enrichment_pipeline(query: QueryRequest) -> EnrichmentPipeline:
+    """Independent report lookups: car rentals, attraction distances (one matrix request), nearest airports"""
+    distance_calculator = get_airport_distance_calculator()
+    tasks = [EnrichmentTask("car_rental", "car_rental", fetch_car_rentals, query)]
+    if query.startLocationCode or query.endLocationCode:
+        airport_code = query.startLocationCode or query.endLocationCode
+        destination_city = query.endCity or query.startCity or "the destination"
+        attractions = [attraction.format(city=destination_city) for attraction in REPORT_ATTRACTIONS]
+        tasks.append(EnrichmentTask("attraction_distances", "airport_distances",
+                                    distance_calculator.get_airport_to_attractions_distances, airport_code, attractions))
+        if query.endCity:
+            tasks.append(EnrichmentTask("nearest_airports", "nearest_airports",
+                                        distance_calculator.find_nearest_airports_to_city, query.endCity))
+    return EnrichmentPipeline(tasks)
+
+def assemble_distance_section(query: QueryRequest, enrichment: EnrichmentResult) -> str:
+    """Airport distance information from whichever lookups finished in time"""
+    distance_section = "\n\n"
+    if not (query.startLocationCode or query.endLocationCode):
+        return distance_section
+    distance_calculator = get_airport_distance_calculator()
+    destination_city = query.endCity or query.startCity or "the destination"
+
+    distance_section += f"### Airport Distance Information\n\n"
+    if enrichment.ok("attraction_distances"):
+        for distance_info in enrichment.get("attraction_distances"):
+            distance_section += distance_calculator.format_distance_info(distance_info) + "\n\n"
+    else:
+        for attraction in REPORT_ATTRACTIONS:
+            distance_section += (f"Distance information unavailable for {attraction.format(city=destination_city)}: "
+                                 f"{enrichment.errors.get('attraction_distances')}\n\n")
+
+    # Nearest airports to destination
+    if query.endCity:
+        nearest_airports = enrichment.get("nearest_airports")
+        if nearest_airports:
+            distance_section += f"### Nearest Airports to {query.endCity}\n\n"
+            for airport in nearest_airports[:3]:
+                distance_section += f"Airport: {airport['name']} ({airport['code']}) - {airport['distance_km']} km away\n"
+            distance_section += "\n"
+        elif not enrichment.ok("nearest_airports"):
+            distance_section += f"Nearest airports unavailable: {enrichment.errors.get('nearest_airports')}\n"
+    return distance_section
+
+def build_agent_input(query: QueryRequest):
+    """Compiled graph, input messages and run config for a query"""
+    print(query)
+    
+    # Get budget preference from request
+    budget_preference = getattr(query, 'budget_preference', 'budget_friendly')
+    print(f"Budget preference: {budget_preference}")
+    
+    # Reuse the process-wide compiled graph for this budget preference
+    react_app = graph_registry.get_graph(model_provider="groq", budget_preference=budget_preference)
+    
+    # Support both 'query' and 'question' fields
+    user_query = query.query if query.query is not None else query.question
     
+    # Add budget context to the query
+    budget_display = {
+        "cheapest": "ultra budget-friendly",
+        "budget_friendly": "good value for money", 
+        "luxurious": "premium luxury"
+    }.get(budget_preference, "good value for money")
+    
+    # Add airport context to the query if provided
+    if query.startLocationCode or query.endLocationCode or query.startCity or query.endCity:
+        context_info = []
+        if query.startLocationCode:
+            context_info.append(f"Starting from airport: {query.startLocationCode}")
+        if query.endLocationCode:
+            context_info.append(f"Destination airport: {query.endLocationCode}")
+        if query.startCity:
+            context_info.append(f"Starting city: {query.startCity}")
+        if query.endCity:
+            context_info.append(f"Destination city: {query.endCity}")
+        
+        enhanced_query = f"{user_query}\n\nBudget Preference: I prefer {budget_display} travel options.\n\nAdditional Context: {', '.join(context_info)}\n\nPlease include distance information from airports to attractions in your response and tailor all recommendations to my budget preference."
+    else:
+        enhanced_query = f"{user_query}\n\nBudget Preference: I prefer {budget_display} travel options.\n\nPlease include distance information from airports to attractions in your response and tailor all recommendations to my budget preference."
+    
+    messages={"messages": [enhanced_query]}
+    # Tool rounds and wall-clock time are budgeted per request; the clock starts now
+    run_budget = RunBudget(max_tool_rounds=query.max_tool_rounds, max_seconds=query.max_seconds)
+    configurable = {
+        "budget_preference": budget_preference,
+        "max_tool_rounds": run_budget.max_tool_rounds,
+        "max_seconds": run_budget.max_seconds,
+        "run_started_at": time.time(),
+    }
+    return react_app, messages, {"configurable": configurable, "recursion_limit": run_budget.recursion_limit}
+
+def start_enrichment(query: QueryRequest) -> EnrichmentPipeline:
+    """Enrichment depends only on the request, so it can overlap the agent run"""
+    enrichment_pipeline = build_enrichment_pipeline(query)
+    if get_config_value("enrichment", "speculative_prefetch", default=True):
+        enrichment_pipeline.start()
+    return enrichment_pipeline
+
+def final_answer(output) -> str:
+    # If result is dict with messages:
+    if isinstance(output, dict) and "messages" in output:
+        return output["messages"][-1].content  # Last AI response
+    return str(output)
+
+def report_sections(query: QueryRequest, enrichment: EnrichmentResult) -> List[Tuple[str, str]]:
+    """(section name, markdown) pairs appended to the agent answer, in report order"""
+    return [
+        ("airport_distances", assemble_distance_section(query, enrichment)),
+        ("car_rental", format_car_rental_section(enrichment.get("car_rental"), enrichment.errors.get("car_rental"))),
+    ]
+
+def response_cache_key(query: QueryRequest) -> Tuple[str, str]:
+    """(query text, partition) under which a finished report is cached"""
+    user_query = query.query if query.query is not None else query.question
+    # Reports produced under a tighter per-request agent budget are not shared with default runs
+    budgets = tuple(f"{name}={value}" for name, value in (("max_tool_rounds", query.max_tool_rounds),
+                                                         ("max_seconds", query.max_seconds)) if value is not None)
+    partition = ResponseCache.partition(
+        getattr(query, 'budget_preference', 'budget_friendly'),
+        (query.startLocationCode, query.endLocationCode, query.startCity, query.endCity) + budgets,
+    )
+    return user_query or "", partition
+
+def cached_response(query: QueryRequest) -> Optional[dict]:
+    if not query.use_cache:
+        return None
+    cached = get_response_cache().get(*response_cache_key(query))
+    return dict(cached, cached=True) if cached is not None else None
+
+def cache_response(query: QueryRequest, response: dict):
+    # Partial reports are not reused: the next request may get every section
+    if not response["degraded_sections"]:
+        get_response_cache().set(*response_cache_key(query), response)
+
+async def plan_trip(query: QueryRequest) -> dict:
+    """Run the agent and build the full travel report for a query"""
+    cached = cached_response(query)
+    if cached is not None:
+        return cached
+    react_app, messages, config = build_agent_input(query)
+    enrichment_pipeline = start_enrichment(query)
+    try:
+        output = await react_app.ainvoke(messages, config=config)
+    except BaseException:
+        enrichment_pipeline.cancel()
+        raise
+    final_output = final_answer(output)
+
+    # Car rental and distance lookups run concurrently, each under its own deadline
+    enrichment = await enrichment_pipeline.collect()
+
+    # Append distance and car rental info to the report
+    for _, section in report_sections(query, enrichment):
+        final_output += section
+
+    response = {"answer": final_output, "degraded_sections": enrichment.degraded_sections}
+    cache_response(query, response)
+    return response
+
+def sse_event(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+async def stream_trip_events(query: QueryRequest) -> AsyncIterator[str]:
+    """
+    Trip plan as server-sent events: agent tokens and tool calls while the graph runs,
+    then each enrichment section, then the assembled report
+    """
+    cached = cached_response(query)
+    if cached is not None:
+        yield sse_event("done", cached)
+        return
+    react_app, messages, config = build_agent_input(query)
+    enrichment_pipeline = start_enrichment(query)
+    output = None
+    # Tokens are filtered per LLM turn: reasoning is dropped, and so is any turn that calls tools
+    turns: Dict[str, TurnTokenFilter] = {}
+    try:
+        async for event in react_app.astream_events(messages, config=config, version="v2"):
+            kind = event["event"]
+            if kind == "on_chat_model_stream":
+                chunk = event["data"]["chunk"]
+                content = chunk.content if isinstance(chunk.content, str) else ""
+                text = turns.setdefault(event["run_id"], TurnTokenFilter()).feed(
+                    content, has_tool_calls=bool(getattr(chunk, "tool_call_chunks", None)))
+                if text:
+                    yield sse_event("token", {"content": text, "turn": event["run_id"]})
+            elif kind == "on_chat_model_end":
+                turn = turns.pop(event["run_id"], TurnTokenFilter())
+                final = turn.finish(event["data"].get("output"))
+                text = turn.flush()
+                if text:
+                    yield sse_event("token", {"content": text, "turn": event["run_id"]})
+                yield sse_event("turn_end", {"turn": event["run_id"], "final": final})
+            elif kind == "on_tool_start":
+                yield sse_event("tool_start", {"tool": event["name"], "input": event["data"].get("input")})
+            elif kind == "on_tool_end":
+                tool_output = event["data"].get("output")
+                tool_output = getattr(tool_output, "content", tool_output)
+                yield sse_event("tool_end", {"tool": event["name"], "output": str(tool_output)[:500]})
+            elif kind == "on_chain_end" and not event.get("parent_ids"):
+                output = event["data"].get("output")
+    except BaseException as e:
+        enrichment_pipeline.cancel()
+        if isinstance(e, Exception):
+            yield sse_event("error", {"error": str(e)})
+            return
+        raise
+    final_output = final_answer(output)
+    yield sse_event("agent_done", {"answer": final_output})
+
+    enrichment = await enrichment_pipeline.collect()
+    for name, section in report_sections(query, enrichment):
+        final_output += section
+        yield sse_event("section", {"name": name, "content": section, "degraded": name in enrichment.degraded_sections})
+    response = {"answer": final_output, "degraded_sections": enrichment.degraded_sections}
+    cache_response(query, response)
+    yield sse_event("done", response)
+
+def queue_full_response(error: QueueFullError) -> JSONResponse:
+    """503 for a request turned away by the concurrency limiter, with a Retry-After hint"""
+    return JSONResponse(status_code=503, content={"error": str(error)},
+                        headers={"Retry-After": str(query_limiter.retry_after_seconds)})
+
 @app.post("/query")
 async def query_travel_agent(query:QueryRequest):
     """
@@ -40,149 +347,87 @@ async def query_travel_agent(query:QueryRequest):
         }
     """
     try:
-        print(query)
-        
-        # Get budget preference from request
-        budget_preference = getattr(query, 'budget_preference', 'budget_friendly')
-        print(f"Budget preference: {budget_preference}")
-        
-        # Initialize graph with budget preference
-        graph = GraphBuilder(model_provider="groq", budget_preference=budget_preference)
-        react_app=graph()
-        
-        png_graph = react_app.get_graph().draw_mermaid_png()
-        with open("my_graph.png", "wb") as f:
-            f.write(png_graph)
-
-        print(f"Graph saved as 'my_graph.png' in {os.getcwd()}")
-        
-        # Support both 'query' and 'question' fields
-        user_query = query.query if query.query is not None else query.question
-        
-        # Add budget context to the query
-        budget_display = {
-            "cheapest": "ultra budget-friendly",
-            "budget_friendly": "good value for money", 
-            "luxurious": "premium luxury"
-        }.get(budget_preference, "good value for money")
-        
-        # Add airport context to the query if provided
-        if query.startLocationCode or query.endLocationCode or query.startCity or query.endCity:
-            context_info = []
-            if query.startLocationCode:
-                context_info.append(f"Starting from airport: {query.startLocationCode}")
-            if query.endLocationCode:
-                context_info.append(f"Destination airport: {query.endLocationCode}")
-            if query.startCity:
-                context_info.append(f"Starting city: {query.startCity}")
-            if query.endCity:
-                context_info.append(f"Destination city: {query.endCity}")
-            
-            enhanced_query = f"{user_query}\n\nBudget Preference: I prefer {budget_display} travel options.\n\nAdditional Context: {', '.join(context_info)}\n\nPlease include distance information from airports to attractions in your response and tailor all recommendations to my budget preference."
-        else:
-            enhanced_query = f"{user_query}\n\nBudget Preference: I prefer {budget_display} travel options.\n\nPlease include distance information from airports to attractions in your response and tailor all recommendations to my budget preference."
-        
-        messages={"messages": [enhanced_query]}
-        
-        output = react_app.invoke(messages)
+        # Wait for a concurrency slot; awaiting the agent keeps the worker free for other requests
+        async with query_limiter.slot():
+            return await plan_trip(query)
+    except QueueFullError as e:
+        return queue_full_response(e)
+    except Exception as e:
+        return JSONResponse(status_code=500, content={"error": str(e)})
 
-        # If result is dict with messages:
-        if isinstance(output, dict) and "messages" in output:
-            final_output = output["messages"][-1].content  # Last AI response
-        else:
-            final_output = str(output)
+@app.post("/query/stream")
+async def stream_travel_agent(query: QueryRequest):
+    """
+    Same request body as /query; the response is a text/event-stream of
+    token, turn_end, tool_start, tool_end, agent_done, section, done (or error) events.
+    Tokens carry the id of their LLM turn; a turn_end with final=false means that turn
+    called tools and its streamed text is not part of the answer.
+    """
+    # A full queue is still a plain 503. The slot itself is taken inside the stream, so a client
+    # that disconnects before the body starts never holds one.
+    try:
+        query_limiter.check_capacity()
+    except QueueFullError as e:
+        return queue_full_response(e)
 
-        # --- Car Rental Integration ---
-        car_rental_section = "\n\n## Car Rental Options\n"
-        try:
-            car_rental_service = CarRentalService()
-            airports = load('IATA')
-            def city_to_iata(city_name):
-                city_name = city_name.lower().strip()
-                for code, data in airports.items():
-                    if data.get('city', '').lower() == city_name:
-                        return code
-                return None
-
-            # Use codes from request, or try to convert city names, fallback to CCU
-            start_code = query.startLocationCode or (city_to_iata(query.startCity) if query.startCity else None) or "CCU"
-            end_code = query.endLocationCode or (city_to_iata(query.endCity) if query.endCity else None) or "CCU"
-            car_rentals = car_rental_service.search_cars(
-                startLocationCode=start_code,
-                endLocationCode=end_code,
-                transferType="HOURLY",
-                startDateTime="2025-10-10T10:00:00",
-                duration="PT9H30M",
-                passengers=1
-              #  currency="INR"
-            )
-            # Handle response according to response.json format
-            if isinstance(car_rentals, dict) and 'data' in car_rentals:
-                for offer in car_rentals['data']:
-                    vehicle = offer.get('vehicle', {})
-                    provider = offer.get('serviceProvider', {})
-                    partner = offer.get('partnerInfo', {}).get('serviceProvider', {})
-                    quotation = offer.get('quotation', {})
-                    cancellation = offer.get('cancellationRules', [{}])[0].get('ruleDescription', 'N/A')
-                    desc = vehicle.get('description', 'N/A')
-                    seats = vehicle.get('seats', [{}])[0].get('count', 'N/A')
-                    baggages = vehicle.get('baggages', [{}])[0].get('count', 'N/A')
-                    provider_name = provider.get('name', partner.get('name', 'N/A'))
-                    price = quotation.get('monetaryAmount', 'N/A')
-                    currency = quotation.get('currencyCode', 'N/A')
-                    car_rental_section += (
-                        f"- Vehicle: {desc} | Seats: {seats} | Baggage: {baggages} | Provider: {provider_name} | Price: {price} {currency}\n"
-                        f"  Cancellation: {cancellation}\n"
-                    )
-            else:
-                car_rental_section += str(car_rentals) + "\n"
-        except Exception as e:
-            car_rental_section += f"Car rental info unavailable: {e}\n"
-
-        # --- Distance Information Integration ---
-        distance_section = "\n\n"
+    async def events():
         try:
-            distance_calculator = AirportDistanceCalculator()
-            
-            # If airport codes are provided, calculate distances
-            if query.startLocationCode or query.endLocationCode:
-                airport_code = query.startLocationCode or query.endLocationCode
-                destination_city = query.endCity or query.startCity or "the destination"
-                
-                distance_section += f"### Airport Distance Information\n\n"
-                
-                # Find major attractions in the destination city and calculate distances
-                major_attractions = [
-                    f"{destination_city} city center",
-                    f"downtown {destination_city}",
-                    f"main tourist area {destination_city}"
-                ]
-                
-                for attraction in major_attractions:
-                    distance_info = distance_calculator.get_airport_to_attraction_distance(airport_code, attraction)
-                    distance_section += distance_calculator.format_distance_info(distance_info) + "\n\n"
-                
-                # Find nearest airports to destination
-                if query.endCity:
-                    nearest_airports = distance_calculator.find_nearest_airports_to_city(query.endCity)
-                    if nearest_airports:
-                        distance_section += f"### Nearest Airports to {query.endCity}\n\n"
-                        for airport in nearest_airports[:3]:
-                            distance_section += f"Airport: {airport['name']} ({airport['code']}) - {airport['distance_km']} km away\n"
-                        distance_section += "\n"
-                        
-        except Exception as e:
-            distance_section += f"Distance information unavailable: {e}\n"
-
-        # Append distance info to the report
-        final_output += distance_section
-
-        # Append car rental info to the report
-        final_output += car_rental_section
-
-        return {"answer": final_output}
+            async with query_limiter.slot():
+                async for event in stream_trip_events(query):
+                    yield event
+        except QueueFullError as e:
+            yield sse_event("error", {"error": str(e), "retry_after": query_limiter.retry_after_seconds})
+
+    return StreamingResponse(events(), media_type="text/event-stream",
+                             headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
+@app.get("/metrics")
+async def get_metrics():
+    """Concurrency and cache counters for monitoring"""
+    return {
+        "queries": query_limiter.stats(),
+        "blocking_executor": blocking_executor.stats(),
+        "fanout_executor": fanout_executor.stats(),
+        "tool_pool": tool_pool.stats(),
+        "http": get_http_client().stats(),
+        "caches": {
+            "geocode": get_geocode_cache().stats(),
+            "routes": get_route_cache().stats(),
+            "responses": get_response_cache().stats(),
+            "places": get_place_search_cache().stats(),
+            "weather": get_weather_cache().stats(),
+        },
+        "amadeus_token": get_car_rental_service().token_manager.stats(),
+        "enrichment": enrichment_metrics.stats(),
+        "tools": tool_metrics.stats(),
+        "tool_compaction": compaction_metrics.stats(),
+        "agent_context": context_metrics.stats(),
+        "agent_budget": budget_metrics.stats(),
+        "exchange_rates": get_exchange_rate_table().stats(),
+        "single_flight": single_flight_stats(),
+    }
+
+
+def _graph_diagram_response(request: Request, fmt: str, media_type: str):
+    """Serve the cached agent graph diagram, honouring If-None-Match"""
+    try:
+        content, etag = graph_registry.get_diagram(fmt)
     except Exception as e:
-        return JSONResponse(status_code=500, content={"error": str(e)})
+        return JSONResponse(status_code=500, content={"error": f"Failed to render graph diagram: {str(e)}"})
+    headers = {"ETag": etag, "Cache-Control": "public, max-age=3600"}
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers=headers)
+    return Response(content=content, media_type=media_type, headers=headers)
+
+@app.get("/graph.png")
+def get_graph_png(request: Request):
+    """Agent graph diagram as a mermaid-rendered PNG"""
+    return _graph_diagram_response(request, "png", "image/png")
+
+@app.get("/graph.mmd")
+def get_graph_mermaid(request: Request):
+    """Agent graph diagram as mermaid source"""
+    return _graph_diagram_response(request, "mmd", "text/plain; charset=utf-8")
 
 @app.post("/export-word")
 async def export_to_word(request: WordExportRequest):
@@ -1,5 +1,10 @@
+from functools import lru_cache
 from langchain_core.messages import SystemMessage
 
+# Budget tiers understood by the prompt library (anything else falls back to budget_friendly)
+BUDGET_PREFERENCES = ("cheapest", "budget_friendly", "luxurious")
+
+@lru_cache(maxsize=16)
 def get_budget_aware_system_prompt(budget_preference: str = "budget_friendly"):
     """Get system prompt with budget preference context"""
     
@@ -59,6 +64,10 @@ def get_budget_aware_system_prompt(budget_preference: str = "budget_friendly"):
         2. Distance between different attractions/places mentioned in the itinerary
         3. Travel time estimates for better trip planning
         
+        To research a place, call search_place_overview once: it returns attractions, restaurants,
+        activities and transportation together. Only use the single-category search tools to
+        follow up on one category.
+
         Use the available tools to gather information and make detailed cost breakdowns.
         Provide everything in one comprehensive response formatted in clean Markdown.
         Ensure all recommendations align with the {budget_preference.replace('_', ' ').title()} budget preference.
@@ -66,4 +75,9 @@ def get_budget_aware_system_prompt(budget_preference: str = "budget_friendly"):
     )
 
 # Keep the original for backward compatibility
-SYSTEM_PROMPT = get_budget_aware_system_prompt()
\ No newline at end of file
+SYSTEM_PROMPT = get_budget_aware_system_prompt()
+
+# Sent as the last message when the agent's step or time budget runs out; no tools are bound for that turn
+FINAL_SYNTHESIS_PROMPT = """The research budget for this request is used up, so no more tools can be called.
+Write the complete final travel plan now, in the same Markdown format, using only the information gathered above.
+Where a detail could not be looked up, give a clearly labelled estimate or say it is unavailable."""
\ No newline at end of file
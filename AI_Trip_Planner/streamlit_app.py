@@ -1,6 +1,7 @@
 import streamlit as st
 import requests
 import datetime
+import json
 import os
 
 # from exception.exceptions import TradingBotException
@@ -8,6 +9,18 @@ import sys
 
 BASE_URL = "https://travelplanner1.streamlit.app/"  # Backend endpoint
 
+def iter_sse_events(response):
+    """Yield (event, data) pairs from a server-sent events response"""
+    event, data_lines = None, []
+    for line in response.iter_lines(decode_unicode=True):
+        if line.startswith("event: "):
+            event = line[len("event: "):]
+        elif line.startswith("data: "):
+            data_lines.append(line[len("data: "):])
+        elif not line and event:
+            yield event, json.loads("\n".join(data_lines))
+            event, data_lines = None, []
+
 st.set_page_config(
     page_title="🌍 Travel Planner Agentic Application",
     page_icon="🌍",
@@ -98,16 +111,47 @@ if submit_button and user_input.strip():
             }
             budget_preference = budget_map.get(st.session_state.current_budget_selection, "budget_friendly")
             
-            # Show thinking spinner while backend processes
+            payload = {
+                "question": user_input,
+                "budget_preference": budget_preference
+            }
+            # Stream the plan so it renders as it is generated instead of after the whole run
+            status_placeholder = st.empty()
+            report_placeholder = st.empty()
+            streamed_report = ""
+            answer = None
+            degraded_sections = []
             with st.spinner("Bot is thinking..."):
-                payload = {
-                    "question": user_input,
-                    "budget_preference": budget_preference
-                }
-                response = requests.post(f"{BASE_URL}/query", json=payload)
-
-            if response.status_code == 200:
-                answer = response.json().get("answer", "No answer returned.")
+                with requests.post(f"{BASE_URL}/query/stream", json=payload, stream=True) as response:
+                    if response.status_code != 200:
+                        st.error(" Bot failed to respond: " + response.text)
+                    else:
+                        for event, data in iter_sse_events(response):
+                            if event == "token":
+                                streamed_report += data["content"]
+                                report_placeholder.markdown(streamed_report)
+                            elif event == "turn_end" and not data.get("final", True):
+                                # That LLM turn called tools: its text was not the answer
+                                streamed_report = ""
+                                report_placeholder.empty()
+                            elif event == "tool_start":
+                                status_placeholder.info(f"🔧 Running {data['tool']}...")
+                            elif event == "agent_done":
+                                status_placeholder.empty()
+                                streamed_report = data["answer"]
+                                report_placeholder.markdown(streamed_report)
+                            elif event == "section":
+                                streamed_report += data["content"]
+                                report_placeholder.markdown(streamed_report)
+                            elif event == "done":
+                                answer = data["answer"]
+                                degraded_sections = data.get("degraded_sections") or []
+                            elif event == "error":
+                                st.error(" Bot failed to respond: " + data["error"])
+
+            if answer is not None:
+                # The persistent report view below takes over from the streamed preview
+                report_placeholder.empty()
                 # Store in session state for persistent display
                 st.session_state.last_report = answer
                 st.session_state.last_query = user_input
@@ -116,8 +160,8 @@ if submit_button and user_input.strip():
                 st.session_state.generation_timestamp = datetime.datetime.now().strftime('%Y-%m-%d at %H:%M')
                 # Keep the current travel query in session state for persistence
                 st.session_state.current_travel_query = user_input
-            else:
-                st.error(" Bot failed to respond: " + response.text)
+                if degraded_sections:
+                    st.warning("Some report sections are incomplete: " + ", ".join(degraded_sections))
 
         except Exception as e:
             st.error(f"The response failed due to {e}")
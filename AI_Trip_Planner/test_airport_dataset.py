@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Test the memory-mapped airport dataset (no API calls)
+"""
+
+import sys
+import os
+import tempfile
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import airportsdata
+from utils.airport_dataset import AirportDataset, build_airport_dataset, load_airport_dataset
+from utils.airport_directory import AirportDirectory
+from utils.geo_distance import CoordinateArrays
+
+def test_airport_dataset():
+    """Build, map and read back the columnar airport file"""
+
+    print("🧪 Testing Airport Dataset")
+    print("=" * 50)
+
+    airports = {
+        "JFK": {"icao": "KJFK", "iata": "JFK", "name": "John F Kennedy International Airport", "city": "New York",
+                "subd": "New York", "country": "US", "elevation": 13.0, "lat": 40.639447, "lon": -73.779317,
+                "tz": "America/New_York", "lid": "JFK"},
+        "ZRH": {"icao": "LSZH", "iata": "ZRH", "name": "Zürich Airport", "city": "Zürich", "subd": "Zurich",
+                "country": "CH", "elevation": 1416.0, "lat": 47.458056, "lon": 8.548056, "tz": "Europe/Zurich", "lid": ""},
+        "AAA": {"icao": "NTGA", "iata": "AAA", "name": "Anaa Airport", "city": "Anaa", "subd": "", "country": "PF",
+                "elevation": None, "lat": None, "lon": None, "tz": "Pacific/Tahiti", "lid": ""},
+    }
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = build_airport_dataset(os.path.join(tmp, "airports.bin"), airports, source_version="test")
+        dataset = AirportDataset(path)
+
+        assert len(dataset) == 3 and list(dataset) == ["AAA", "JFK", "ZRH"]
+        assert dataset.source_version == "test"
+        for code, record in airports.items():
+            assert dataset[code] == record
+        assert "JFK" in dataset and "XXX" not in dataset and "ZÜR" not in dataset and None not in dataset
+        assert dataset.get("XXX") is None
+        print("✅ Records round-trip through the mapped file")
+
+        # Coordinates are served from the mapped columns, skipping airports without a position
+        coordinates = CoordinateArrays.from_airports(dataset)
+        assert coordinates.keys == ["JFK", "ZRH"]
+        assert abs(coordinates.lats[0] - 40.639447) < 1e-9
+
+        directory = AirportDirectory(dataset)
+        assert directory.city_to_iata("zurich") == "ZRH"
+        assert directory.get("KJFK")["name"].startswith("John F Kennedy")
+        print("✅ Directory indexes built from the dataset columns")
+
+        # A file from another airportsdata release (or a corrupt one) is rebuilt on load
+        dataset.close()
+        rebuilt = load_airport_dataset(path)
+        assert rebuilt.source_version == airportsdata.__version__
+        assert len(rebuilt) > 5000 and rebuilt["LHR"]["icao"] == "EGLL"
+        rebuilt.close()
+
+        with open(path, "wb") as file:
+            file.write(b"not a dataset")
+        rebuilt = load_airport_dataset(path)
+        assert rebuilt["JFK"]["city"] == "New York"
+        rebuilt.close()
+        print("✅ Stale and corrupt files are rebuilt")
+
+if __name__ == "__main__":
+    test_airport_dataset()
@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Test the indexed airport directory (no API calls)
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.airport_directory import AirportDirectory, get_airport_directory
+
+def test_airport_directory():
+    """City, country+city, ICAO and IATA lookups with ranking, prefix and fuzzy matching"""
+
+    print("🧪 Testing Airport Directory")
+    print("=" * 50)
+
+    directory = get_airport_directory()
+
+    # Main passenger airport wins over heliports, seaplane bases and same-named towns
+    for city, expected in [("London", "LHR"), ("New York", "JFK"), ("Paris", "CDG"), ("Chicago", "ORD")]:
+        code = directory.city_to_iata(city)
+        print(f"✅ {city} -> {code}")
+        assert code == expected
+
+    # Country narrows the city index
+    assert directory.city_to_iata("London", country="CA") == "YXU"
+    assert directory.city_to_iata("paris", country="us") in ("PRX", "PHT")
+
+    # Accents, case and whitespace are normalized; aliases, prefixes and typos resolve
+    assert directory.city_to_iata("  zürich ") == "ZRH"
+    assert directory.city_to_iata("Goa") == "GOI"
+    assert directory.city_to_iata("Delhi") == "DEL"
+    assert directory.city_to_iata("Tokio") in ("HND", "NRT")
+    assert directory.city_to_iata("Xyzzyq") is None
+    assert directory.city_to_iata("Tokio", fuzzy=False) is None
+    print("✅ Normalized, prefix and fuzzy lookups resolved")
+
+    # IATA and ICAO codes share one record
+    assert directory.get("EGLL")["iata"] == "LHR"
+    assert directory.get("lhr")["icao"] == "EGLL"
+    assert "KJFK" in directory and "ZZZZ" not in directory
+    lat, lon = directory.coordinates("JFK")
+    assert abs(lat - 40.64) < 0.01 and abs(lon + 73.78) < 0.01
+    assert directory.coordinates("ZZZ") is None
+
+    # Prefix search goes through the trie, including trailing words of a city name
+    assert "new delhi" in directory.search_cities("delhi")
+    assert all(city.startswith("san fr") or " san fr" in city for city in directory.search_cities("San Fr"))
+
+    # Small hand-built table: ranking uses hub list, then name keywords
+    directory = AirportDirectory({
+        "AAA": {"iata": "AAA", "icao": "XAAA", "name": "Springfield Heliport", "city": "Springfield", "country": "US"},
+        "BBB": {"iata": "BBB", "icao": "XBBB", "name": "Springfield International Airport", "city": "Springfield", "country": "US"},
+        "CCC": {"iata": "CCC", "icao": "XCCC", "name": "Springfield Airfield", "city": "Springfield", "country": "AU"},
+    })
+    assert directory.airports_in_city("springfield") == ["BBB", "CCC", "AAA"]
+    assert directory.airports_in_city("Springfield", country="AU") == ["CCC"]
+    assert directory.city_to_iata("Spring") == "BBB"
+    print("✅ Multiple airports per city ranked by type")
+
+if __name__ == "__main__":
+    test_airport_directory()
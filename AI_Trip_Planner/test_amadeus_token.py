@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Test Amadeus OAuth token caching against a local token endpoint (no external API calls)
+"""
+
+import sys
+import os
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.amadeus_token_manager import AmadeusTokenManager
+from utils.http_client import HttpClient
+
+class TokenHandler(BaseHTTPRequestHandler):
+    issued = 0
+    expires_in = 1799
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        time.sleep(0.2)  # slow token endpoint
+        TokenHandler.issued += 1
+        body = json.dumps({"access_token": f"token-{TokenHandler.issued}", "expires_in": TokenHandler.expires_in}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+def test_amadeus_token():
+    """Concurrent callers share one fetch; the token is refreshed in the background before expiry"""
+
+    print("🧪 Testing Amadeus Token Manager")
+    print("=" * 50)
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), TokenHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    token_url = f"http://127.0.0.1:{server.server_address[1]}/v1/security/oauth2/token"
+
+    try:
+        manager = AmadeusTokenManager(token_url, "id", "secret", http_client=HttpClient(retries=0), background_refresh=False)
+        with ThreadPoolExecutor(max_workers=20) as pool:
+            tokens = list(pool.map(lambda _: manager.get_token(), range(20)))
+        assert set(tokens) == {"token-1"}
+        assert TokenHandler.issued == 1
+        print(f"🔑 20 concurrent callers -> {TokenHandler.issued} token request")
+
+        # Invalidation forces exactly one new fetch
+        manager.invalidate()
+        assert manager.get_token() == "token-2"
+
+        # Short-lived token: refreshed by the background timer before callers see it stale
+        TokenHandler.expires_in = 4
+        refreshing = AmadeusTokenManager(token_url, "id", "secret", http_client=HttpClient(retries=0),
+                                         refresh_margin_seconds=1)
+        first = refreshing.get_token()
+        time.sleep(1.0)
+        assert refreshing.get_token() == first  # used since the fetch, so the timer refreshes it
+        time.sleep(1.6)
+        assert refreshing.get_token() != first
+        assert refreshing.stats()["fetches"] == 2
+        refreshing._timer.cancel()
+        print("🔄 Background refresh replaced the token ahead of expiry")
+
+        # Idle worker: the timer does not refresh an unused token; the next caller fetches lazily
+        idle = AmadeusTokenManager(token_url, "id", "secret", http_client=HttpClient(retries=0),
+                                   refresh_margin_seconds=1)
+        first = idle.get_token()
+        time.sleep(2.6)
+        assert idle.stats()["fetches"] == 1 and idle.stats()["lapsed"] == 1
+        time.sleep(0.6)
+        assert idle.get_token() != first and idle.stats()["fetches"] == 2
+        idle._timer.cancel()
+        print("💤 Unused token lapsed instead of being refreshed in the background")
+
+        # A concurrent invalidate() never makes get_token() return None
+        racing = AmadeusTokenManager(token_url, "id", "secret", http_client=HttpClient(retries=0),
+                                     background_refresh=False)
+        stop = threading.Event()
+        def invalidate_repeatedly():
+            while not stop.is_set():
+                racing.invalidate()
+                time.sleep(0.05)
+        invalidator = threading.Thread(target=invalidate_repeatedly)
+        invalidator.start()
+        try:
+            with ThreadPoolExecutor(max_workers=8) as pool:
+                assert all(pool.map(lambda _: racing.get_token(), range(16)))
+        finally:
+            stop.set()
+            invalidator.join()
+        print("🔒 No empty token under concurrent invalidation")
+
+        # Token shorter than twice the margin: the margin shrinks to expires_in / 4, so the token
+        # is served from cache and the background refresh is not rescheduled every second
+        TokenHandler.expires_in = 6
+        short_lived = AmadeusTokenManager(token_url, "id", "secret", http_client=HttpClient(retries=0))
+        token = short_lived.get_token()
+        time.sleep(1.5)
+        assert all(short_lived.get_token() == token for _ in range(5))
+        assert short_lived.stats()["fetches"] == 1 and short_lived.stats()["cache_hits"] == 5
+        short_lived._timer.cancel()
+        print("⏱️ Short-lived token reused with a clamped refresh margin")
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    print("✅ Token manager works as expected")
+
+if __name__ == "__main__":
+    test_amadeus_token()
@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Test the query concurrency limiter: 503 + Retry-After when saturated, slots freed on errors (no API calls)
+"""
+
+import sys
+import os
+import asyncio
+import threading
+import time
+from fastapi.testclient import TestClient
+from starlette.requests import ClientDisconnect
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.concurrency import ConcurrencyLimiter, QueueFullError
+import main
+
+async def limiter_releases_on_error():
+    limiter = ConcurrencyLimiter(max_concurrent=1, max_queue_depth=0)
+    try:
+        async with limiter.slot():
+            raise ValueError("tool exploded")
+    except ValueError:
+        pass
+    assert limiter.in_flight == 0 and limiter.completed == 1
+
+    # The freed slot is taken at once, and a second caller is turned away while it is held
+    async with limiter.slot():
+        try:
+            async with limiter.slot():
+                raise AssertionError("queue of depth 0 admitted a waiter")
+        except QueueFullError:
+            pass
+    assert limiter.rejected == 1 and limiter.stats()["in_flight"] == 0
+
+async def abandoned_streams(limiter):
+    """Stream responses whose client goes away before or during the body never keep a slot"""
+    query = main.QueryRequest(question="Plan Goa")
+
+    # Response built but never sent
+    response = await main.stream_travel_agent(query)
+    assert limiter.in_flight == 0
+
+    # ASGI 2.4 server whose first send finds the client gone
+    async def receive():
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        raise OSError("client disconnected")
+
+    try:
+        await (await main.stream_travel_agent(query))({"type": "http", "asgi": {"spec_version": "2.4"}}, receive, send)
+    except ClientDisconnect:
+        pass
+    assert limiter.in_flight == 0
+
+    # Client leaves mid-stream: closing the body releases the slot
+    response = await main.stream_travel_agent(query)
+    body = response.body_iterator
+    await body.__anext__()
+    assert limiter.in_flight == 1
+    await body.aclose()
+    assert limiter.in_flight == 0 and limiter.queue_depth == 0
+
+def test_concurrency_limiter():
+    """Saturated limiter answers 503 with Retry-After; failing requests give their slot back"""
+
+    print("🧪 Testing Query Concurrency Limiter")
+    print("=" * 50)
+
+    asyncio.run(limiter_releases_on_error())
+    print("✅ Slot released after an exception inside it")
+
+    started, release = threading.Event(), threading.Event()
+
+    async def slow_plan_trip(query):
+        started.set()
+        while not release.is_set():
+            await asyncio.sleep(0.01)
+        return {"answer": "Day 1: beaches", "degraded_sections": []}
+
+    async def failing_plan_trip(query):
+        raise RuntimeError("agent failed")
+
+    async def failing_stream(query):
+        yield main.sse_event("token", {"content": "Day"})
+        raise RuntimeError("stream failed")
+
+    async def endless_stream(query):
+        while True:
+            yield main.sse_event("token", {"content": "Day"})
+            await asyncio.sleep(0.01)
+
+    limiter = ConcurrencyLimiter(max_concurrent=1, max_queue_depth=0, retry_after_seconds=7)
+    original = (main.query_limiter, main.plan_trip, main.stream_trip_events)
+    main.query_limiter = limiter
+    try:
+        # Saturated: one plan holds the only slot and the queue is full
+        main.plan_trip = slow_plan_trip
+        client = TestClient(main.app)
+        responses = []
+        first = threading.Thread(target=lambda: responses.append(client.post("/query", json={"question": "Plan Goa"})))
+        first.start()
+        assert started.wait(5)
+        for path in ("/query", "/query/stream"):
+            rejected = client.post(path, json={"question": "Plan Goa"})
+            assert rejected.status_code == 503, path
+            assert rejected.headers["retry-after"] == "7"
+            assert "queued" in rejected.json()["error"]
+        release.set()
+        first.join(5)
+        assert responses[0].status_code == 200 and responses[0].json()["answer"] == "Day 1: beaches"
+        assert limiter.rejected == 2 and limiter.in_flight == 0
+        print(f"✅ Saturated limiter -> 503 with Retry-After: {rejected.headers['retry-after']}")
+
+        # Errors inside the request, before or during streaming, release the slot
+        main.plan_trip = failing_plan_trip
+        main.stream_trip_events = failing_stream
+        error_client = TestClient(main.app, raise_server_exceptions=False)
+        for _ in range(3):
+            assert error_client.post("/query", json={"question": "Plan Goa"}).status_code == 500
+            try:
+                error_client.post("/query/stream", json={"question": "Plan Goa"})
+            except RuntimeError:
+                pass
+        deadline = time.time() + 5
+        while limiter.in_flight and time.time() < deadline:
+            time.sleep(0.01)
+        assert limiter.in_flight == 0 and limiter.completed == 7
+        main.plan_trip = slow_plan_trip
+        assert client.post("/query", json={"question": "Plan Goa"}).status_code == 200
+        print(f"✅ Failed requests released their slots; metrics: {limiter.stats()}")
+
+        main.stream_trip_events = endless_stream
+        asyncio.run(abandoned_streams(limiter))
+        print("✅ Streams abandoned before or during the body released their slots")
+    finally:
+        main.query_limiter, main.plan_trip, main.stream_trip_events = original
+
+if __name__ == "__main__":
+    test_concurrency_limiter()
@@ -0,0 +1,43 @@
+#!/usr/bin/env python3
+"""
+Test that config.yaml is parsed once and served from memory afterwards
+"""
+
+import sys
+import os
+import time
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import utils.config_loaders as config_loaders
+from utils.config_loaders import get_config_value, load_config, reload_config
+
+def test_config_loaders():
+    """Repeated lookups reuse one parsed config; reload_config() forces a fresh read"""
+
+    print("🧪 Testing Config Loader")
+    print("=" * 50)
+
+    reads = []
+    original_safe_load = config_loaders.yaml.safe_load
+    config_loaders.yaml.safe_load = lambda file: reads.append(file.name) or original_safe_load(file)
+    try:
+        reload_config()
+        config = load_config()
+        started = time.perf_counter()
+        for _ in range(1000):
+            assert get_config_value("server", "max_concurrent_queries") == config["server"]["max_concurrent_queries"]
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        assert load_config() is config
+        assert load_config(os.path.join(config_loaders.PROJECT_ROOT, "config", "config.yaml")) is config
+        assert get_config_value("server", "missing", default=3) == 3
+        assert len(reads) == 1
+        print(f"✅ 1000 lookups -> {len(reads)} file read ({elapsed_ms:.1f} ms)")
+
+        reload_config()
+        assert load_config() == config and len(reads) == 2
+        print("✅ reload_config() re-reads the file")
+    finally:
+        config_loaders.yaml.safe_load = original_safe_load
+
+if __name__ == "__main__":
+    test_config_loaders()
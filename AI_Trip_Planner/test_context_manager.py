@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Test the agent context-window manager (no API calls)
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from langchain_core.messages import AIMessage, HumanMessage, SystemMessage, ToolMessage
+from agent.context_manager import DIGEST_MARKER, ContextWindowManager, context_metrics, message_tokens
+
+def react_history(rounds, result_words=400):
+    """User request followed by `rounds` tool rounds, each with two long results"""
+    messages = [HumanMessage(content="Plan a 10 day trip to Goa, Mumbai and Delhi")]
+    for r in range(rounds):
+        calls = [{"name": "search_place_overview", "args": {"place": f"city{r}-{i}"}, "id": f"call_{r}_{i}", "type": "tool_call"}
+                 for i in range(2)]
+        messages.append(AIMessage(content=f"<think>{'reasoning ' * 200}</think>Looking up round {r}", tool_calls=calls))
+        for call in calls:
+            messages.append(ToolMessage(content=f"Result {call['id']}: " + "beach fort market " * result_words,
+                                        name=call["name"], tool_call_id=call["id"]))
+    return messages
+
+def test_context_manager():
+    """Digests of consumed results, token ceiling, tool-call pairing and prompt-size reporting"""
+
+    print("🧪 Testing Context Window Manager")
+    print("=" * 50)
+
+    system = SystemMessage(content="You are a travel planner.")
+    messages = react_history(3)
+    full_tokens = sum(message_tokens(m) for m in [system] + messages)
+
+    # Generous ceiling: latest round (unanswered) and the round before stay verbatim, older ones are digested
+    manager = ContextWindowManager(max_prompt_tokens=100000, keep_full_rounds=1, digest_tokens=60)
+    prompt = manager.build_prompt(system, messages)
+    assert prompt[0] is system and prompt[1] is messages[0]
+    assert len(prompt) == len(messages) + 1
+    tool_messages = [m for m in prompt if isinstance(m, ToolMessage)]
+    assert all(m.content.endswith(DIGEST_MARKER) for m in tool_messages[:2])
+    assert tool_messages[2].content == messages[5].content and tool_messages[5].content == messages[9].content
+    assert "<think>" not in prompt[2].content and prompt[2].content == "Looking up round 0"
+    assert prompt[-3].content == messages[-3].content  # reasoning of the unanswered turn is untouched
+    assert messages[2].content.startswith("Result call_0_0: beach") and not messages[2].content.endswith(DIGEST_MARKER)
+    tokens = context_metrics.last_prompt_tokens
+    print(f"✅ Digested consumed results: {full_tokens} -> {tokens} tokens")
+    assert tokens < full_tokens
+
+    # Tight ceiling: digests shrink, old rounds go, and the prompt fits
+    before = context_metrics.stats()
+    manager = ContextWindowManager(max_prompt_tokens=1500, keep_full_rounds=1, digest_tokens=60)
+    prompt = manager.build_prompt(system, react_history(6))
+    tokens = sum(message_tokens(m) for m in prompt)
+    assert tokens <= 1500 and context_metrics.last_prompt_tokens == tokens
+    assert isinstance(prompt[1], HumanMessage)
+    after = context_metrics.stats()
+    assert after["dropped_rounds"] > before["dropped_rounds"]
+    print(f"✅ Ceiling enforced: {tokens} tokens, {after['dropped_rounds'] - before['dropped_rounds']} rounds dropped")
+
+    # Every remaining tool result still follows the AI message that requested it
+    requested = set()
+    for message in prompt:
+        if isinstance(message, AIMessage):
+            requested = {call["id"] for call in message.tool_calls}
+        elif isinstance(message, ToolMessage):
+            assert message.tool_call_id in requested
+    assert prompt[-1].tool_call_id == "call_5_1"
+    print(f"✅ Tool-call pairing preserved; metrics: {after}")
+
+if __name__ == "__main__":
+    test_context_manager()
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Test the shared exchange rate table with a fake HTTP client (no API calls)
+"""
+
+import sys
+import os
+import tempfile
+import time
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.currency_convertor import CurrencyConverter
+import utils.exchange_rates as exchange_rates
+from utils.exchange_rates import ExchangeRateTable
+
+class FakeResponse:
+    def __init__(self, payload, status_code=200):
+        self.payload = payload
+        self.status_code = status_code
+
+    def json(self):
+        return self.payload
+
+class FakeRatesHttp:
+    def __init__(self):
+        self.urls = []
+        self.fail = False
+
+    def get(self, url, **kwargs):
+        self.urls.append(url)
+        if self.fail:
+            return FakeResponse({"result": "error"}, status_code=500)
+        return FakeResponse({"base_code": "USD", "conversion_rates": {"USD": 1.0, "INR": 83.0, "EUR": 0.9, "GBP": 0.8}})
+
+def test_exchange_rates():
+    """One table download serves every pair; disk copy survives restarts; stale table and backoff on failure"""
+
+    print("🧪 Testing Exchange Rate Table")
+    print("=" * 50)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        cache_path = os.path.join(tmp, "exchange_rates.json")
+        http = FakeRatesHttp()
+        table = ExchangeRateTable(api_key="test", base_currency="USD", refresh_interval_seconds=3600,
+                                  cache_path=cache_path, http_client=http)
+        converter = CurrencyConverter("test", rate_table=table)
+
+        assert abs(converter.convert(100, "USD", "INR") - 8300) < 1e-9
+        assert abs(converter.convert(90, "EUR", "GBP") - 80) < 1e-9
+        assert abs(converter.convert(83, "inr", "usd") - 1) < 1e-9
+        assert [round(v, 6) for v in converter.convert_many([10, 20, 0], "GBP", "EUR")] == [11.25, 22.5, 0.0]
+        assert len(http.urls) == 1 and http.urls[0].endswith("/test/latest/USD")
+        print("✅ Cross rates and batch conversion from one table download")
+
+        try:
+            converter.convert(1, "USD", "XYZ")
+            assert False, "expected unknown currency to fail"
+        except ValueError:
+            pass
+
+        # Cold start: a new table reads the disk copy instead of calling the API
+        cold = ExchangeRateTable(api_key="test", base_currency="USD", refresh_interval_seconds=3600,
+                                 cache_path=cache_path, http_client=http)
+        assert cold.rate("USD", "EUR") == 0.9
+        assert len(http.urls) == 1 and cold.stats()["disk_loads"] == 1
+        print("✅ Cold start served from the disk snapshot")
+
+        # Expired table + failing API: keep serving the previous rates without retrying on every call
+        http.fail = True
+        stale = ExchangeRateTable(api_key="test", base_currency="USD", refresh_interval_seconds=0,
+                                  cache_path=cache_path, http_client=http, retry_after_failure_seconds=0.2)
+        assert stale.convert(1, "GBP", "USD") == 1.25
+        assert stale.stats()["stale_serves"] == 1 and len(http.urls) == 2
+        for _ in range(5):
+            assert stale.convert(1, "GBP", "USD") == 1.25
+        assert len(http.urls) == 2
+        print("✅ Previous rates served when a refresh fails, with no retry until the backoff ends")
+
+        # After the backoff the API is tried again and a good response replaces the table
+        time.sleep(0.25)
+        http.fail = False
+        assert stale.convert(1, "GBP", "USD") == 1.25
+        assert len(http.urls) == 3 and stale.stats()["fetches"] == 2
+
+        # A failed snapshot write leaves no temp file behind
+        original_replace = exchange_rates.os.replace
+        def failing_replace(src, dst):
+            raise OSError("disk full")
+        exchange_rates.os.replace = failing_replace
+        try:
+            stale.rates()
+        finally:
+            exchange_rates.os.replace = original_replace
+        assert len(http.urls) == 4 and sorted(os.listdir(tmp)) == ["exchange_rates.json"]
+        print("✅ Retried after the backoff; failed snapshot writes are cleaned up")
+
+if __name__ == "__main__":
+    test_exchange_rates()
@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+Test the vectorized haversine distance engine
+"""
+
+import sys
+import os
+import math
+import time
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+from utils.geo_distance import CoordinateArrays, haversine_matrix, haversine_one_to_many
+from tools.distance_calculator_tool import DistanceCalculatorTool
+
+def scalar_haversine(lat1, lon1, lat2, lon2):
+    lat1, lon1, lat2, lon2 = map(math.radians, [lat1, lon1, lat2, lon2])
+    a = math.sin((lat2 - lat1) / 2) ** 2 + math.cos(lat1) * math.cos(lat2) * math.sin((lon2 - lon1) / 2) ** 2
+    return 2 * 6371 * math.asin(math.sqrt(a))
+
+def test_geo_distance():
+    """Vectorized results must match the scalar formula"""
+
+    print("🧪 Testing Vectorized Haversine Engine")
+    print("=" * 50)
+
+    rng = np.random.default_rng(42)
+    lats1, lons1 = rng.uniform(-90, 90, 40), rng.uniform(-180, 180, 40)
+    lats2, lons2 = rng.uniform(-90, 90, 60), rng.uniform(-180, 180, 60)
+
+    matrix = haversine_matrix(lats1, lons1, lats2, lons2)
+    assert matrix.shape == (40, 60)
+    for i in (0, 17, 39):
+        for j in (0, 31, 59):
+            assert math.isclose(matrix[i, j], scalar_haversine(lats1[i], lons1[i], lats2[j], lons2[j]), rel_tol=1e-9)
+
+    row = haversine_one_to_many(lats1[5], lons1[5], lats2, lons2)
+    assert np.allclose(row, matrix[5])
+
+    # One-to-all airports
+    calculator = DistanceCalculatorTool()
+    airports = CoordinateArrays.from_airports(calculator.airports_data)
+    start = time.perf_counter()
+    distances = airports.distances_from(40.6413, -73.7781)
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    print(f"📍 Distances from JFK to {len(airports)} airports in {elapsed_ms:.2f} ms")
+    assert airports.keys[int(np.argmin(distances))] == "JFK"
+
+    # Itinerary table tool with airport codes only (no geocoding needed)
+    table_tool = next(t for t in calculator.distance_tool_list if t.name == "calculate_itinerary_distance_table")
+    table = table_tool.invoke({"places": ["JFK", "LGA", "EWR"]})
+    print(table)
+    assert "JFK -> LGA" in table and "LGA -> EWR" in table
+
+    print("✅ Vectorized distances match the scalar formula")
+
+if __name__ == "__main__":
+    test_geo_distance()
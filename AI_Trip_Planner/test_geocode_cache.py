@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Test the persistent geocoding cache (no API calls)
+"""
+
+import sys
+import os
+import tempfile
+import time
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.geocode_cache import GeocodeCache
+
+def test_geocode_cache():
+    """Hits, negative caching, TTL expiry, LRU eviction and persistence"""
+
+    print("🧪 Testing Geocode Cache")
+    print("=" * 50)
+
+    calls = []
+    def fetcher(result):
+        def fetch():
+            calls.append(result)
+            return result
+        return fetch
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, "geocode.sqlite3")
+        cache = GeocodeCache(db_path=db_path, ttl_seconds=60, negative_ttl_seconds=60, max_entries=2)
+
+        # Miss then hit, with normalized keys
+        assert cache.get_or_fetch("London city center", fetcher((51.5, -0.12))) == (51.5, -0.12)
+        assert cache.get_or_fetch("  london   CITY center, ", fetcher((0, 0))) == (51.5, -0.12)
+        assert len(calls) == 1
+
+        # Negative results are cached
+        assert cache.get_or_fetch("Nowhere-ville", fetcher(None)) is None
+        assert cache.get_or_fetch("nowhere-ville", fetcher(None)) is None
+        assert len(calls) == 2
+        assert cache.stats()["negative_hits"] == 1
+
+        # Transient failures are not cached
+        def failing():
+            raise Exception("timeout")
+        try:
+            cache.get_or_fetch("Paris", failing)
+        except Exception:
+            pass
+        assert cache.get_or_fetch("Paris", fetcher((48.85, 2.35))) == (48.85, 2.35)
+
+        # LRU evicted London from memory, but the SQLite tier still has it
+        assert cache.get_or_fetch("London city center", fetcher((0, 0))) == (51.5, -0.12)
+        assert cache.stats()["disk_hits"] >= 1
+
+        # A new instance (process restart) reads from disk
+        restarted = GeocodeCache(db_path=db_path, ttl_seconds=60, negative_ttl_seconds=60)
+        assert restarted.get_or_fetch("Paris", fetcher((0, 0))) == (48.85, 2.35)
+
+        # Expired entries are fetched again
+        short_lived = GeocodeCache(db_path=os.path.join(tmp, "short.sqlite3"), ttl_seconds=0.05)
+        short_lived.get_or_fetch("Rome", fetcher((41.9, 12.5)))
+        time.sleep(0.1)
+        short_lived.get_or_fetch("Rome", fetcher((41.9, 12.5)))
+        assert calls.count((41.9, 12.5)) == 2
+
+        print(f"📊 Stats: {cache.stats()}")
+        print("✅ Geocode cache works as expected")
+
+if __name__ == "__main__":
+    test_geocode_cache()
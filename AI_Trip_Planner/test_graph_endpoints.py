@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""
+Test ETag revalidation on the /graph.png and /graph.mmd endpoints (no API calls)
+"""
+
+import sys
+import os
+import hashlib
+from fastapi.testclient import TestClient
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import main
+
+DIAGRAMS = {"png": b"\x89PNG fake diagram", "mmd": b"graph TD; agent --> tools;"}
+
+def fake_get_diagram(fmt="png", model_provider="groq"):
+    content = DIAGRAMS[fmt]
+    return content, '"' + hashlib.sha256(content).hexdigest()[:32] + '"'
+
+def test_graph_endpoints():
+    """ETag on every response, 304 for a matching If-None-Match, full body for a stale one"""
+
+    print("🧪 Testing Graph Diagram Endpoints")
+    print("=" * 50)
+
+    original_get_diagram = main.graph_registry.get_diagram
+    main.graph_registry.get_diagram = fake_get_diagram
+    try:
+        client = TestClient(main.app)
+        for path, fmt, media_type in (("/graph.png", "png", "image/png"), ("/graph.mmd", "mmd", "text/plain")):
+            _, etag = fake_get_diagram(fmt)
+
+            response = client.get(path)
+            assert response.status_code == 200 and response.content == DIAGRAMS[fmt]
+            assert response.headers["etag"] == etag
+            assert response.headers["content-type"].startswith(media_type)
+            assert "max-age" in response.headers["cache-control"]
+
+            revalidated = client.get(path, headers={"If-None-Match": etag})
+            assert revalidated.status_code == 304 and revalidated.content == b""
+            assert revalidated.headers["etag"] == etag
+
+            stale = client.get(path, headers={"If-None-Match": '"0123456789abcdef"'})
+            assert stale.status_code == 200 and stale.content == DIAGRAMS[fmt]
+            assert stale.headers["etag"] == etag
+            print(f"✅ {path}: ETag {etag}, 304 when current, 200 when stale")
+    finally:
+        main.graph_registry.get_diagram = original_get_diagram
+
+if __name__ == "__main__":
+    test_graph_endpoints()
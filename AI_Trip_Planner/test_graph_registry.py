@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Test the compiled agent graph registry (no API calls)
+"""
+
+import sys
+import os
+from concurrent.futures import ThreadPoolExecutor
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from langchain_core.messages import AIMessage, SystemMessage
+from langchain_core.runnables import RunnableLambda
+from langchain_core.tools import tool
+import agent.graph_registry as graph_registry_module
+from agent.agentic_workflow import GraphBuilder
+from agent.context_manager import ContextWindowManager
+from agent.graph_registry import GraphRegistry
+
+@tool
+def get_weather(city: str) -> str:
+    """Current weather for a city"""
+    return f"Sunny in {city}"
+
+class CountingGraphBuilder(GraphBuilder):
+    """GraphBuilder with a canned model instead of an LLM client; counts constructions"""
+    built = []
+
+    def __init__(self, model_provider: str = "groq", budget_preference: str = "budget_friendly"):
+        CountingGraphBuilder.built.append(model_provider)
+        self.tools = [get_weather]
+        self.llm = RunnableLambda(lambda messages: AIMessage(content="Final plan"))
+        self.llm_with_tools = self.llm
+        self.system_prompt = SystemMessage(content="You are a travel planner.")
+        self.context_manager = ContextWindowManager()
+        self.graph = None
+
+def test_graph_registry():
+    """Graphs are compiled once per provider, reused per key, and rebuilt for a new key or after clear()"""
+
+    print("🧪 Testing Graph Registry")
+    print("=" * 50)
+
+    original_builder = graph_registry_module.GraphBuilder
+    graph_registry_module.GraphBuilder = CountingGraphBuilder
+    try:
+        registry = GraphRegistry()
+
+        # Concurrent first requests share one build
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            graphs = list(pool.map(lambda _: registry.get_graph("groq", "luxurious"), range(8)))
+        assert CountingGraphBuilder.built == ["groq"]
+        assert all(graph is graphs[0] for graph in graphs)
+        assert registry.get_graph("groq", "luxurious") is graphs[0]
+        assert graphs[0].config["configurable"]["budget_preference"] == "luxurious"
+        print(f"✅ 8 concurrent callers -> {len(CountingGraphBuilder.built)} compiled graph, reused on later calls")
+
+        # A new budget preference gets its own view of the same compiled graph
+        budget_graph = registry.get_graph("groq", "budget_friendly")
+        assert budget_graph is not graphs[0]
+        assert budget_graph.config["configurable"]["budget_preference"] == "budget_friendly"
+        assert registry.get_graph("groq", "unknown") is budget_graph
+        assert CountingGraphBuilder.built == ["groq"]
+
+        # A new model provider is built separately
+        other = registry.get_graph("openai", "luxurious")
+        assert other is not graphs[0] and CountingGraphBuilder.built == ["groq", "openai"]
+        print("✅ New budget preference reuses the builder; new provider builds its own graph")
+
+        # Diagrams are rendered once per format
+        source, etag = registry.get_diagram("mmd")
+        assert b"compact_tools" in source and registry.get_diagram("mmd") == (source, etag)
+
+        # clear() drops everything; the next request rebuilds
+        registry.clear()
+        rebuilt = registry.get_graph("groq", "luxurious")
+        assert rebuilt is not graphs[0] and CountingGraphBuilder.built == ["groq", "openai", "groq"]
+        print("✅ Graphs rebuilt after clear()")
+    finally:
+        graph_registry_module.GraphBuilder = original_builder
+
+if __name__ == "__main__":
+    test_graph_registry()
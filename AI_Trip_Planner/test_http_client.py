@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Test the shared HTTP client against a local server (no external API calls)
+"""
+
+import sys
+import os
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.http_client import HttpClient
+from utils.weather_info import WeatherForecastTool
+
+class FlakyHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive
+    calls = 0
+    posts = 0
+    connections = set()
+
+    def do_GET(self):
+        FlakyHandler.calls += 1
+        FlakyHandler.connections.add(self.client_address)
+        status = 503 if FlakyHandler.calls in (1, 2) else 200
+        body = json.dumps({"main": {"temp": 21.5}, "weather": [{"description": "clear sky"}]}).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        FlakyHandler.posts += 1
+        self.send_response(503)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def log_message(self, format, *args):
+        pass
+
+def test_http_client():
+    """Retries with backoff, then reuses one pooled connection; POSTs are only resent on opt-in"""
+
+    print("🧪 Testing Shared HTTP Client")
+    print("=" * 50)
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FlakyHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{server.server_address[1]}"
+
+    try:
+        client = HttpClient(retries=2, backoff_seconds=0.01)
+        weather = WeatherForecastTool("test-key", http_client=client)
+        weather.base_url = base_url
+
+        # Two 503s are retried transparently
+        assert weather.get_current_weather("Goa")["main"]["temp"] == 21.5
+        assert client.stats()["retried"] == 2
+
+        # Further calls reuse the kept-alive connection
+        for _ in range(5):
+            weather.get_current_weather("Goa")
+        print(f"📡 {FlakyHandler.calls} requests over {len(FlakyHandler.connections)} connection(s)")
+        assert len(FlakyHandler.connections) == 1
+
+        # A POST the server may have acted on is not resent unless the caller opts in
+        assert client.post(f"{base_url}/v2/matrix/driving-car", json={}).status_code == 503
+        assert FlakyHandler.posts == 1
+        assert client.post(f"{base_url}/v1/security/oauth2/token", data={}, retry=True).status_code == 503
+        assert FlakyHandler.posts == 4
+        print(f"📡 POST without opt-in sent once; with retry=True sent {FlakyHandler.posts - 1} times")
+
+        # A POST that never reached a server is resent whatever the method
+        retried = client.stats()["retried"]
+        try:
+            client.post("http://127.0.0.1:1/unreachable", json={})
+        except Exception:
+            pass
+        assert client.stats()["retried"] == retried + 2
+        client.close()
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    print("✅ Shared HTTP client works as expected")
+
+if __name__ == "__main__":
+    test_http_client()
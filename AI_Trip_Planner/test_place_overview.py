@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Test the combined place overview tool with a local fake search backend (no API calls)
+"""
+
+import sys
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tools.Place_search_tool import PlaceSearchTool
+from utils.concurrency import fanout_executor, query_limiter
+
+class SlowFakeSearch:
+    """Stands in for TavilyPlaceSearchTool: each category takes 0.3s"""
+
+    def _answer(self, category, place):
+        time.sleep(0.3)
+        if category == "transportation":
+            raise RuntimeError("search quota exceeded")
+        return f"{category} of {place}"
+
+    def tavily_search_attractions(self, place):
+        return self._answer("attractions", place)
+
+    def tavily_search_restaurants(self, place):
+        return self._answer("restaurants", place)
+
+    def tavily_search_activity(self, place):
+        return self._answer("activities", place)
+
+    def tavily_search_transportation(self, place):
+        return self._answer("transportation", place)
+
+def test_place_overview():
+    """All four categories in one tool call, searched concurrently"""
+
+    print("🧪 Testing search_place_overview")
+    print("=" * 50)
+
+    place_tools = PlaceSearchTool()
+    place_tools.tavily_search = SlowFakeSearch()
+    overview_tool = next(t for t in place_tools.place_search_tool_list if t.name == "search_place_overview")
+
+    started = time.perf_counter()
+    overview = overview_tool.invoke({"place": "Goa"})
+    elapsed = time.perf_counter() - started
+    print(f"✅ Overview in {elapsed:.2f}s")
+
+    # Four 0.3s searches run side by side
+    assert elapsed < 0.9
+    assert overview["place"] == "Goa"
+    assert overview["attractions"] == "attractions of Goa"
+    assert overview["restaurants"] == "restaurants of Goa"
+    assert overview["activities"] == "activities of Goa"
+    assert overview["transportation"] is None
+    assert overview["errors"] == {"transportation": "search quota exceeded"}
+    print("✅ Failed category reported without losing the others")
+
+    # Every query the limiter admits can run its overview at once on the shared fan-out pool
+    assert fanout_executor.max_workers >= 4 * query_limiter.max_concurrent
+    places = [f"City{i}" for i in range(query_limiter.max_concurrent)]
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=len(places)) as callers:
+        overviews = list(callers.map(lambda place: overview_tool.invoke({"place": place}), places))
+    elapsed = time.perf_counter() - started
+    assert [o["attractions"] for o in overviews] == [f"attractions of {place}" for place in places]
+    assert elapsed < 0.9
+    print(f"✅ {len(places)} concurrent overviews in {elapsed:.2f}s")
+
+    # App shutdown stops the pool; a later overview starts a fresh one
+    fanout_executor.shutdown(wait=True)
+    assert overview_tool.invoke({"place": "Goa"})["activities"] == "activities of Goa"
+
+if __name__ == "__main__":
+    test_place_overview()
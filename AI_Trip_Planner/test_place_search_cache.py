@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Test the Tavily place search cache with a local fake client (no API calls)
+"""
+
+import sys
+import os
+import tempfile
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.place_info_search import TavilyPlaceSearchTool
+from utils.place_search_cache import PlaceSearchCache
+
+class FakeTavilyClient:
+    def __init__(self):
+        self.queries = []
+
+    def invoke(self, payload):
+        self.queries.append(payload["query"])
+        return {"answer": f"answer #{len(self.queries)}", "results": []}
+
+def test_place_search_cache():
+    """Per-category entries, normalized place names, category TTLs and persistence"""
+
+    print("🧪 Testing Place Search Cache")
+    print("=" * 50)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, "places.sqlite3")
+        client = FakeTavilyClient()
+        cache = PlaceSearchCache(db_path=db_path, category_ttl_seconds={"restaurants": 60})
+        search = TavilyPlaceSearchTool(client=client, cache=cache)
+
+        first = search.tavily_search_attractions("Goa")
+        assert search.tavily_search_attractions("  goa. ") == first
+        assert search.tavily_search_restaurants("Goa") != first
+        assert len(client.queries) == 2
+        print("✅ Repeated searches served from the cache, categories kept apart")
+
+        assert cache.category_ttl_seconds["restaurants"] == 60
+        assert cache.category_ttl_seconds["attractions"] > cache.category_ttl_seconds["restaurants"]
+
+        stats = cache.stats()
+        assert stats["categories"]["attractions"] == {"hits": 1, "misses": 1}
+        assert stats["categories"]["restaurants"] == {"hits": 0, "misses": 1}
+        print(f"✅ Stats: {stats['categories']}")
+
+        # A new process (fresh cache object) reuses the on-disk entries
+        reopened = TavilyPlaceSearchTool(client=client, cache=PlaceSearchCache(db_path=db_path))
+        assert reopened.tavily_search_attractions("Goa") == first
+        assert len(client.queries) == 2
+
+        # Failures are not cached
+        class FailingClient:
+            def invoke(self, payload):
+                raise RuntimeError("Tavily unavailable")
+        failing = TavilyPlaceSearchTool(client=FailingClient(), cache=cache)
+        try:
+            failing.tavily_search_activity("Goa")
+            assert False, "expected the search error to propagate"
+        except RuntimeError:
+            pass
+        assert search.tavily_search_activity("Goa") == "answer #3"
+
+        # TavilySearch returns {"error": exception} on API failures; that is raised, not cached
+        class ErrorResultClient:
+            def __init__(self):
+                self.calls = 0
+            def invoke(self, payload):
+                self.calls += 1
+                return {"error": ValueError("HTTP 432: usage limit exceeded")}
+        error_client = ErrorResultClient()
+        erroring = TavilyPlaceSearchTool(client=error_client, cache=cache)
+        for _ in range(2):
+            try:
+                erroring.tavily_search_transportation("Goa")
+                assert False, "expected the Tavily error result to raise"
+            except ValueError as e:
+                assert "usage limit" in str(e)
+        assert error_client.calls == 2
+        assert cache.cache.lookup("transportation|goa") == (False, None)
+        assert search.tavily_search_transportation("Goa") == "answer #4"
+
+        # Values that cannot be serialized reach neither tier
+        try:
+            cache.cache.set("transportation|mumbai", {"error": RuntimeError("boom")})
+            assert False, "expected serialization to fail"
+        except TypeError:
+            pass
+        assert cache.cache.lookup("transportation|mumbai") == (False, None)
+        print("✅ Errors propagate and are retried on the next call")
+
+if __name__ == "__main__":
+    test_place_search_cache()
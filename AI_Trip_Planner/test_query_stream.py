@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Test the /query/stream server-sent events endpoint with a local fake graph (no API calls)
+"""
+
+import sys
+import os
+import json
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi.testclient import TestClient
+from langchain_core.language_models.fake_chat_models import GenericFakeChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk
+from langchain_core.tools import tool
+from langgraph.graph import END, START, MessagesState, StateGraph
+
+import main
+from utils.token_stream import TurnTokenFilter
+
+@tool
+def get_weather(city: str) -> str:
+    """Current weather for a city"""
+    return f"Sunny in {city}"
+
+def build_fake_graph():
+    llm = GenericFakeChatModel(messages=iter([AIMessage(content="Day 1: Louvre and Seine walk")]))
+
+    async def agent(state: MessagesState):
+        await get_weather.ainvoke({"city": "Paris"})
+        return {"messages": [await llm.ainvoke(state["messages"])]}
+
+    graph = StateGraph(MessagesState)
+    graph.add_node("agent", agent)
+    graph.add_edge(START, "agent")
+    graph.add_edge("agent", END)
+    return graph.compile()
+
+def parse_events(body: str):
+    events = []
+    for block in body.strip().split("\n\n"):
+        lines = dict(line.split(": ", 1) for line in block.splitlines())
+        events.append((lines["event"], json.loads(lines["data"])))
+    return events
+
+def test_query_stream():
+    """Tokens and tool calls stream first, then enrichment sections, then the full report"""
+
+    print("🧪 Testing /query/stream")
+    print("=" * 50)
+
+    original_get_graph = main.graph_registry.get_graph
+    original_fetch_car_rentals = main.fetch_car_rentals
+    main.graph_registry.get_graph = lambda **kwargs: build_fake_graph()
+    main.fetch_car_rentals = lambda query: {"data": []}
+    try:
+        client = TestClient(main.app)
+        response = client.post("/query/stream", json={"question": "Plan 1 day in Paris"})
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/event-stream")
+        events = parse_events(response.text)
+
+        # The same question again is answered from the response cache without running the graph
+        main.graph_registry.get_graph = None
+        cached = parse_events(client.post("/query/stream", json={"question": "Plan 1 day in Paris!"}).text)
+    finally:
+        main.graph_registry.get_graph = original_get_graph
+        main.fetch_car_rentals = original_fetch_car_rentals
+
+    kinds = [kind for kind, _ in events]
+    print(f"✅ Events: {kinds}")
+    assert kinds[0] == "tool_start" and events[0][1]["tool"] == "get_weather"
+    assert kinds[1] == "tool_end" and events[1][1]["output"] == "Sunny in Paris"
+    tokens = "".join(data["content"] for kind, data in events if kind == "token")
+    assert tokens == "Day 1: Louvre and Seine walk"
+    assert [data["final"] for kind, data in events if kind == "turn_end"] == [True]
+    assert kinds[-4:] == ["agent_done", "section", "section", "done"]
+    assert [data["name"] for kind, data in events if kind == "section"] == ["airport_distances", "car_rental"]
+
+    done = events[-1][1]
+    assert done["answer"].startswith("Day 1: Louvre and Seine walk")
+    assert "## Car Rental Options" in done["answer"]
+    assert done["degraded_sections"] == []
+    print("✅ Report assembled after the streamed agent output")
+
+    assert [kind for kind, _ in cached] == ["done"]
+    assert cached[0][1]["cached"] is True and cached[0][1]["answer"] == done["answer"]
+    print("✅ Repeated question served from the response cache")
+
+class ScriptedGraph:
+    """Stands in for the agent graph: replays chat-model and chain events"""
+
+    def __init__(self, events):
+        self.events = events
+
+    async def astream_events(self, messages, config=None, version="v2"):
+        for event in self.events:
+            yield event
+
+def model_turn(run_id, chunks, tool_calls=None):
+    """Stream and end events of one LLM turn"""
+    events = [{"event": "on_chat_model_stream", "run_id": run_id, "name": "llm",
+               "data": {"chunk": AIMessageChunk(content=chunk)}} for chunk in chunks]
+    if tool_calls:
+        events.append({"event": "on_chat_model_stream", "run_id": run_id, "name": "llm", "data": {"chunk": AIMessageChunk(
+            content="", tool_call_chunks=[{"name": "get_weather", "args": "{}", "id": "call_1", "index": 0}])}})
+        events.append({"event": "on_chat_model_stream", "run_id": run_id, "name": "llm",
+                       "data": {"chunk": AIMessageChunk(content="more notes")}})
+    output = AIMessage(content="".join(chunks), tool_calls=tool_calls or [])
+    return events + [{"event": "on_chat_model_end", "run_id": run_id, "name": "llm", "data": {"output": output}}]
+
+def test_stream_token_filtering():
+    """Only the final answer turn is streamed as tokens, without <think> reasoning"""
+
+    print("🧪 Testing streamed token filtering")
+    print("=" * 50)
+
+    # Tags split across chunks are still recognised; a lone "<" is passed through
+    turn = TurnTokenFilter()
+    text = "".join(turn.feed(chunk) for chunk in ["<th", "ink>plan the ", "days</thi", "nk>Day 1", " x < y"])
+    assert text + turn.flush() == "Day 1 x < y" and turn.finish(AIMessage(content=text))
+
+    tool_calls = [{"name": "get_weather", "args": {"city": "Paris"}, "id": "call_1", "type": "tool_call"}]
+    answer = AIMessage(content="<think>ok</think>Day 1: Louvre")
+    events = (model_turn("turn-1", ["<think>need ", "weather</think>", "Checking the ", "weather"], tool_calls)
+              + model_turn("turn-2", ["<think>ok</th", "ink>", "Day 1: ", "Louvre"])
+              + [{"event": "on_chain_end", "run_id": "graph", "name": "LangGraph", "parent_ids": [],
+                  "data": {"output": {"messages": [answer]}}}])
+
+    original_build_agent_input = main.build_agent_input
+    original_fetch_car_rentals = main.fetch_car_rentals
+    main.build_agent_input = lambda query: (ScriptedGraph(events), {"messages": []}, {})
+    main.fetch_car_rentals = lambda query: {"data": []}
+    try:
+        client = TestClient(main.app)
+        streamed = parse_events(client.post("/query/stream", json={"question": "Plan 1 scripted day in Paris",
+                                                                   "use_cache": False}).text)
+    finally:
+        main.build_agent_input = original_build_agent_input
+        main.fetch_car_rentals = original_fetch_car_rentals
+
+    tokens = [(data["turn"], data["content"]) for kind, data in streamed if kind == "token"]
+    assert "".join(content for _, content in tokens if _ == "turn-2") == "Day 1: Louvre"
+    assert all("think" not in content and "more notes" not in content for _, content in tokens)
+    assert [(data["turn"], data["final"]) for kind, data in streamed if kind == "turn_end"] == [("turn-1", False), ("turn-2", True)]
+    print(f"✅ Tokens: {tokens}")
+
+if __name__ == "__main__":
+    test_query_stream()
+    test_stream_token_filtering()
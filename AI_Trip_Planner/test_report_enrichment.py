@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Test the concurrent report enrichment stage (no API calls)
+"""
+
+import sys
+import os
+import asyncio
+import time
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.report_enrichment import EnrichmentPipeline, EnrichmentTask, enrichment_metrics
+
+def slow(value, seconds):
+    time.sleep(seconds)
+    return value
+
+def failing():
+    raise RuntimeError("upstream returned 500")
+
+def test_report_enrichment():
+    """Lookups run concurrently; late or failing ones only degrade their own section"""
+
+    print("🧪 Testing Report Enrichment")
+    print("=" * 50)
+
+    pipeline = EnrichmentPipeline([
+        EnrichmentTask("car_rental", "car_rental", failing),
+        EnrichmentTask("attraction_distance:0", "airport_distances", slow, "center", 0.3),
+        EnrichmentTask("attraction_distance:1", "airport_distances", slow, "downtown", 0.3),
+        EnrichmentTask("attraction_distance:2", "airport_distances", slow, "too late", 5.0, deadline_seconds=0.5),
+        EnrichmentTask("nearest_airports", "nearest_airports", slow, ["JFK"], 0.3),
+    ], default_deadline_seconds=2.0)
+
+    started = time.perf_counter()
+    result = asyncio.run(pipeline.collect())
+    elapsed = time.perf_counter() - started
+    print(f"✅ Stage finished in {elapsed:.2f}s")
+
+    # Bounded by the slowest deadline, not the sum of the lookups
+    assert elapsed < 1.5
+    assert result.get("attraction_distance:0") == "center"
+    assert result.get("attraction_distance:1") == "downtown"
+    assert result.get("nearest_airports") == ["JFK"]
+    assert not result.ok("attraction_distance:2") and "timed out" in result.errors["attraction_distance:2"]
+    assert result.errors["car_rental"] == "upstream returned 500"
+    assert result.degraded_sections == ["car_rental", "airport_distances"]
+    print(f"✅ Degraded sections reported: {result.degraded_sections}")
+
+    # Deadlines come from config by task-name prefix unless set on the task
+    pipeline = EnrichmentPipeline([], default_deadline_seconds=3.0)
+    pipeline.deadlines = {"attraction_distance": 6}
+    assert pipeline.deadline_for(EnrichmentTask("attraction_distance:1", "airport_distances", slow)) == 6
+    assert pipeline.deadline_for(EnrichmentTask("car_rental", "car_rental", slow)) == 3.0
+    assert pipeline.deadline_for(EnrichmentTask("car_rental", "car_rental", slow, deadline_seconds=1)) == 1
+
+    # Speculative prefetch: lookups overlap a (simulated) agent run longer than their deadline
+    async def prefetch_then_collect():
+        pipeline = EnrichmentPipeline([
+            EnrichmentTask("car_rental", "car_rental", slow, "offers", 0.4),
+            EnrichmentTask("nearest_airports", "nearest_airports", slow, ["LHR"], 0.4),
+        ], default_deadline_seconds=0.2)
+        pipeline.start()
+        await asyncio.sleep(0.6)  # agent run
+        started = time.perf_counter()
+        result = await pipeline.collect()
+        return result, time.perf_counter() - started
+
+    ready_before = enrichment_metrics.ready_before_collect
+    result, join_time = asyncio.run(prefetch_then_collect())
+    assert result.get("car_rental") == "offers" and not result.degraded_sections
+    assert join_time < 0.1 and enrichment_metrics.ready_before_collect == ready_before + 2
+    print(f"✅ Prefetched lookups joined in {join_time * 1000:.0f}ms")
+
+    # A failed agent run cancels the prefetched lookups
+    async def prefetch_then_cancel():
+        pipeline = EnrichmentPipeline([EnrichmentTask("car_rental", "car_rental", slow, "offers", 0.3)])
+        pipeline.start()
+        await asyncio.sleep(0)
+        pipeline.cancel()
+        await asyncio.sleep(0)
+        return pipeline._running["car_rental"].cancelled()
+
+    assert asyncio.run(prefetch_then_cancel())
+
+if __name__ == "__main__":
+    test_report_enrichment()
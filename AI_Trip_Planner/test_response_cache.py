@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Test the trip-plan response cache (no API calls)
+"""
+
+import sys
+import os
+import time
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.response_cache import (HashedNgramEmbedder, ResponseCache, normalize_query, query_tokens, request_facts,
+                                  route_slots, same_request)
+
+def test_response_cache():
+    """Exact normalized hits, similarity hits, partitions, number/route guard and TTL"""
+
+    print("🧪 Testing Response Cache")
+    print("=" * 50)
+
+    assert normalize_query("  5 DAY trip\tto Goa ") == "5 day trip to goa"
+    assert normalize_query("trip from Delhi to Mumbai") != normalize_query("trip from Mumbai to Delhi")
+    assert query_tokens("Plan a five day trip to goa") == ["5", "day", "trip", "goa"]
+    assert query_tokens("beaches") == query_tokens("beach")
+    assert query_tokens("Paris bus tour on the Rhine express") == ["paris", "bus", "tour", "rhine", "express"]
+    assert route_slots("Plan a trip from Delhi to Mumbai via Pune") == {"from": ("delhi",), "to": ("mumbai",), "via": ("pune",)}
+    assert same_request(request_facts("5 day trip to Goa"), request_facts("5 day trip to Goa for my family"))
+    assert same_request(request_facts("5 day trip to Goa"), request_facts("Plan a 5-day Goa trip"))
+    assert not same_request(request_facts("3 day trip with 2 kids"), request_facts("2 day trip with 3 kids"))
+    assert not same_request(request_facts("from Delhi to Mumbai"), request_facts("from Mumbai to Delhi"))
+
+    cache = ResponseCache(ttl_seconds=60, max_entries=10, semantic=True, similarity_threshold=0.8)
+    budget = ResponseCache.partition("budget_friendly", (None, "GOI", None, None))
+    luxury = ResponseCache.partition("luxurious", (None, "GOI", None, None))
+    plan = {"answer": "Day 1: Baga beach", "degraded_sections": []}
+
+    cache.set("5 day trip to Goa", budget, plan)
+    assert cache.get("  5 DAY trip to  goa", budget) == plan
+    print("✅ Case and whitespace variants hit the exact key")
+
+    assert cache.get("5 day trip to Goa for my family", budget) == plan
+    assert cache.get("Plan a 5-day Goa trip", budget) == plan
+    assert cache.get("5 day Goa trip", budget) == plan
+    assert cache.stats()["semantic_hits"] == 3
+    print("✅ Similar and reworded queries hit the embedding index")
+
+    # Different budget, different numbers or a different place never share a plan
+    assert cache.get("5 day trip to Goa", luxury) is None
+    assert cache.get("7 day trip to Goa", budget) is None
+    assert cache.get("5 day trip to Kerala", budget) is None
+    assert cache.get("Weekend in Paris", budget) is None
+
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["exact_hits"]) == (4, 4, 1)
+
+    # Swapped origin/destination or swapped counts never share a plan, by key or by similarity
+    cache.set("trip from Delhi to Mumbai", budget, {"answer": "Delhi -> Mumbai"})
+    assert cache.get("Trip from Delhi to Mumbai", budget)["answer"] == "Delhi -> Mumbai"
+    assert cache.get("trip from Mumbai to Delhi", budget) is None
+    cache.set("3 day trip to Goa with 2 kids", budget, {"answer": "3 days, 2 kids"})
+    assert cache.get("2 day trip to Goa with 3 kids", budget) is None
+    assert cache.get("3 day trip to Goa with 2 kids!", budget)["answer"] == "3 days, 2 kids"
+    print("✅ Route slots and number bindings guard every hit")
+
+    # Expired entries are not served, by key or by similarity
+    short_lived = ResponseCache(ttl_seconds=0.05, semantic=True, similarity_threshold=0.8)
+    short_lived.set("5 day trip to Goa", budget, plan)
+    time.sleep(0.1)
+    assert short_lived.get("5 day trip to Goa", budget) is None
+    assert short_lived.get("5 day trip to Goa for my family", budget) is None
+    print("✅ Partitions, number guard and TTL respected")
+
+    embedder = HashedNgramEmbedder(dimensions=256)
+    vector = embedder.embed("Goa beaches")
+    assert vector.shape == (256,) and abs(float(vector @ vector) - 1.0) < 1e-5
+
+if __name__ == "__main__":
+    test_response_cache()
@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Test route-distance memoization (no API calls)
+"""
+
+import sys
+import os
+import tempfile
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.route_cache import RouteCache
+
+def test_route_cache():
+    """Cached routes, remembered wide radius, unroutable pairs and persistence"""
+
+    print("🧪 Testing Route Cache")
+    print("=" * 50)
+
+    requested = []
+    def fetch_needing_wide_radius(radius):
+        requested.append(radius)
+        return {"distance_km": 26.45, "duration_s": 1860.0} if radius >= 5000 else None
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, "routes.sqlite3")
+        cache = RouteCache(db_path=db_path)
+        jfk, times_square = (40.6413, -73.7781), (40.758, -73.9855)
+
+        route = cache.get_or_fetch(jfk, times_square, fetch_needing_wide_radius)
+        assert route == {"distance_km": 26.45, "duration_s": 1860.0}
+        assert requested == [1000, 5000]
+
+        # Same pair (within rounding precision): no upstream call at all
+        assert cache.get_or_fetch((40.64131, -73.77812), times_square, fetch_needing_wide_radius) == route
+        assert requested == [1000, 5000]
+
+        # After a restart the failing 1km request is skipped
+        restarted = RouteCache(db_path=db_path)
+        restarted.cache.memory.clear()
+        other_end = (40.7484, -73.9857)
+        restarted.get_or_fetch(jfk, other_end, fetch_needing_wide_radius)
+        requested.clear()
+        # Drop only the route entry, keep the remembered radius
+        restarted.cache.memory.clear()
+        restarted.cache.store.set(f"route|{restarted._pair_key(jfk, other_end, 'driving-car')}|5000", None, 0)
+        restarted.get_or_fetch(jfk, other_end, fetch_needing_wide_radius)
+        assert requested == [5000]
+        assert restarted.stats()["skipped_requests"] == 1
+
+        # Unroutable pairs are remembered
+        calls = []
+        def unroutable(radius):
+            calls.append(radius)
+            return None
+        assert cache.get_or_fetch((0.0, 0.0), (1.0, 1.0), unroutable) is None
+        assert cache.get_or_fetch((0.0, 0.0), (1.0, 1.0), unroutable) is None
+        assert calls == [1000, 5000]
+
+        print(f"📊 Stats: {cache.stats()}")
+        print("✅ Route cache works as expected")
+
+if __name__ == "__main__":
+    test_route_cache()
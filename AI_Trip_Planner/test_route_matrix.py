@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Test the batch route matrix mode against the local fake matrix server
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import tempfile
+import numpy as np
+from utils.airport_distance_calculator import AirportDistanceCalculator
+from utils.fake_matrix_server import FakeMatrixServer
+from utils.route_cache import RouteCache
+from utils.geo_distance import ROAD_DISTANCE_FACTOR, coordinate_distance_matrix
+from utils.route_matrix import RouteMatrixClient
+
+def test_route_matrix():
+    """Chunking respects provider limits and results line up with the input order"""
+
+    print("🧪 Testing Route Matrix Mode")
+    print("=" * 50)
+
+    rng = np.random.default_rng(3)
+    origins = [tuple(p) for p in rng.uniform([40.5, -74.2], [40.9, -73.7], size=(12, 2))]
+    destinations = [tuple(p) for p in rng.uniform([40.5, -74.2], [40.9, -73.7], size=(30, 2))]
+    expected = (coordinate_distance_matrix(origins, destinations) * ROAD_DISTANCE_FACTOR).round(2)
+
+    with FakeMatrixServer(max_locations=10) as fake:
+        client = RouteMatrixClient(api_key="test", base_url=fake.base_url, max_locations=10, max_elements=20)
+        result = client.matrix(origins, destinations)
+
+        assert np.allclose(np.array(result["distances_km"], dtype=float), expected, atol=0.011)
+        assert all(len(r["body"]["locations"]) <= 10 for r in fake.requests)
+        assert all(len(r["body"]["sources"]) * len(r["body"]["destinations"]) <= 20 for r in fake.requests)
+        print(f"📡 12 x 30 matrix resolved in {len(fake.requests)} chunked requests (limits: 10 locations, 20 elements)")
+
+        # An itinerary of N stops needs a single request
+        fake.requests.clear()
+        itinerary = origins[:8]
+        full = RouteMatrixClient(api_key="test", base_url=fake.base_url, max_locations=10, max_elements=100)
+        table = full.matrix(itinerary, itinerary)
+        assert len(fake.requests) == 1
+        assert len(fake.requests[0]["body"]["locations"]) == 8
+        assert table["distances_km"][3][3] == 0.0
+        print("📡 8-stop itinerary resolved in 1 request")
+
+    print("✅ Matrix mode works as expected")
+
+def test_airport_to_attractions_matrix():
+    """Report distances use one matrix request and fill the route cache for later lookups"""
+
+    print("🧪 Testing Airport-to-Attractions Matrix")
+    print("=" * 50)
+
+    attractions = {
+        "Times Square, New York": (40.758, -73.9855),
+        "Central Park, New York": (40.7829, -73.9654),
+        "Brooklyn Bridge, New York": (40.7061, -73.9969),
+    }
+    with FakeMatrixServer() as fake, tempfile.TemporaryDirectory() as tmp:
+        calculator = AirportDistanceCalculator()
+        calculator.get_coordinates_from_address = attractions.get
+        calculator.route_cache = RouteCache(db_path=os.path.join(tmp, "routes.sqlite3"))
+        calculator.route_matrix = RouteMatrixClient(api_key="test", base_url=fake.base_url)
+
+        results = calculator.get_airport_to_attractions_distances("JFK", list(attractions) + ["Nowhere"])
+        assert len(fake.requests) == 1
+        assert [r["success"] for r in results] == [True, True, True, False]
+        assert "Could not find coordinates" in results[3]["error"]
+        print(f"📡 {len(attractions)} attraction distances in 1 matrix request")
+
+        # Matrix results went into the route cache: single-route and repeat lookups make no requests
+        jfk = calculator.get_airport_coordinates("JFK")
+        def unexpected_fetch(radius):
+            raise AssertionError("route should come from the cache")
+        route = calculator.route_cache.get_or_fetch(jfk, attractions["Times Square, New York"], unexpected_fetch)
+        assert route["distance_km"] == results[0]["distance_km"]
+        assert calculator.get_airport_to_attractions_distances("JFK", list(attractions)) == results[:3]
+        assert len(fake.requests) == 1
+        assert calculator.route_cache.stats()["matrix_fills"] == 3
+        print("✅ Matrix results reused from the route cache")
+
+class DetourMatrix:
+    """Matrix fake: estimated road distances, except destinations in `detours` are far by road"""
+
+    def __init__(self, detours):
+        self.detours = detours
+        self.requests = []
+
+    def matrix(self, origins, destinations):
+        self.requests.append((list(origins), list(destinations)))
+        distances = (coordinate_distance_matrix(origins, destinations) * ROAD_DISTANCE_FACTOR).round(2).tolist()
+        for row in distances:
+            for j, destination in enumerate(destinations):
+                if destination in self.detours:
+                    row[j] = 950.0
+        return {"distances_km": distances, "durations_s": None}
+
+def test_nearest_airports_over_fetch():
+    """An airport that is close as the crow flies but out of radius by road does not cost a result"""
+
+    print("🧪 Testing Nearest Airports by Road")
+    print("=" * 50)
+
+    london = (51.5074, -0.1278)
+    with tempfile.TemporaryDirectory() as tmp:
+        calculator = AirportDistanceCalculator()
+        calculator.get_coordinates_from_address = lambda address: london
+        calculator.route_cache = RouteCache(db_path=os.path.join(tmp, "routes.sqlite3"))
+
+        by_air = calculator.spatial_index.nearest(*london, k=10, radius_km=200)
+        closest = by_air[0][0]
+        calculator.route_matrix = DetourMatrix({calculator.get_airport_coordinates(closest)})
+
+        airports = calculator.find_nearest_airports_to_city("London", limit=3, radius_km=200)
+        assert len(airports) == 3
+        assert closest not in [airport["code"] for airport in airports]
+        assert [airport["distance_km"] for airport in airports] == sorted(airport["distance_km"] for airport in airports)
+        assert all(airport["distance_km"] <= 200 for airport in airports)
+        assert len(calculator.route_matrix.requests) == 1 and len(calculator.route_matrix.requests[0][1]) == 9
+        print(f"✅ {closest} is out of radius by road; still got {[a['code'] for a in airports]} from 1 matrix request")
+
+if __name__ == "__main__":
+    test_route_matrix()
+    test_airport_to_attractions_matrix()
+    test_nearest_airports_over_fetch()
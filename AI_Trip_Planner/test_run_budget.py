@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Test agent step and wall-clock budgets with forced final synthesis (no API calls)
+"""
+
+import sys
+import os
+import asyncio
+import itertools
+import time
+from fastapi.testclient import TestClient
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from langchain_core.messages import AIMessage, HumanMessage, SystemMessage
+from langchain_core.runnables import RunnableLambda
+from langchain_core.tools import tool
+from agent.agentic_workflow import GraphBuilder
+from agent.context_manager import ContextWindowManager
+from agent.run_budget import RunBudget, budget_metrics
+from agent.tool_executor import MIN_TURN_TIMEOUT_SECONDS, ConcurrentToolExecutor
+from prompt_library.prompt import FINAL_SYNTHESIS_PROMPT
+import main
+
+@tool
+def get_weather(city: str) -> str:
+    """Current weather for a city"""
+    return f"Sunny in {city}"
+
+def build_looping_graph(final_prompts):
+    """Real agent graph whose tool-bound model never stops calling tools"""
+    counter = itertools.count()
+
+    def keep_researching(messages):
+        i = next(counter)
+        return AIMessage(content="", tool_calls=[{"name": "get_weather", "args": {"city": f"City{i}"}, "id": f"call_{i}", "type": "tool_call"}])
+
+    def write_answer(messages):
+        final_prompts.append(messages)
+        return AIMessage(content="Final plan: Day 1 beaches")
+
+    builder = GraphBuilder.__new__(GraphBuilder)
+    builder.tools = [get_weather]
+    builder.llm = RunnableLambda(write_answer)
+    builder.llm_with_tools = RunnableLambda(keep_researching)
+    builder.system_prompt = SystemMessage(content="You are a travel planner.")
+    builder.context_manager = ContextWindowManager()
+    return builder.build_graph()
+
+def test_run_budget():
+    """Tool-round and time budgets force one final no-tools turn; tool turns leave room for it"""
+
+    print("🧪 Testing Agent Run Budgets")
+    print("=" * 50)
+
+    final_prompts = []
+    graph = build_looping_graph(final_prompts)
+    before = dict(budget_metrics.forced_finalizations)
+
+    # Step budget: two tool rounds, then the plain model writes the answer
+    budget = RunBudget(max_tool_rounds=2, max_seconds=60)
+    config = {"configurable": {"max_tool_rounds": 2, "max_seconds": 60, "run_started_at": time.time()},
+              "recursion_limit": budget.recursion_limit}
+    output = asyncio.run(graph.ainvoke({"messages": [HumanMessage(content="Plan Goa")]}, config=config))
+    messages = output["messages"]
+    assert RunBudget.tool_rounds(messages) == 2
+    assert messages[-1].content == "Final plan: Day 1 beaches" and not messages[-1].tool_calls
+    assert final_prompts[-1][-1].content == FINAL_SYNTHESIS_PROMPT
+    assert budget_metrics.forced_finalizations["tool_rounds"] == before["tool_rounds"] + 1
+    print(f"✅ Step budget: {RunBudget.tool_rounds(messages)} tool rounds, then a final answer ({len(messages)} messages)")
+
+    # Time budget: a run that is already past its margin answers immediately (sync path too)
+    config = {"configurable": {"max_seconds": 30, "run_started_at": time.time() - 15}}
+    messages = graph.invoke({"messages": [HumanMessage(content="Plan Goa")]}, config=config)["messages"]
+    assert len(messages) == 2 and messages[-1].content == "Final plan: Day 1 beaches"
+    assert budget_metrics.forced_finalizations["time"] == before["time"] + 1
+    print("✅ Time budget: final answer without tool rounds")
+
+    # Budget defaults come from config; the run start is optional
+    budget = RunBudget.from_config({"configurable": {"max_tool_rounds": 3}})
+    assert budget.max_tool_rounds == 3 and budget.remaining_seconds() is None
+    assert budget.finalize_reason([HumanMessage(content="hi")]) is None
+    assert RunBudget().max_tool_rounds == 6 and budget.recursion_limit == 13
+
+    # A zero time budget is spent, not unlimited
+    budget = RunBudget(max_seconds=0, started_at=time.time())
+    assert budget.remaining_seconds() <= 0 and budget.finalize_reason([]) == "time"
+
+    # Per-request overrides are validated before any agent work starts
+    client = TestClient(main.app)
+    for body in ({"max_tool_rounds": 0}, {"max_tool_rounds": -2}, {"max_seconds": 0}, {"max_seconds": -5}):
+        response = client.post("/query", json={"question": "Plan Goa", **body})
+        assert response.status_code == 422, body
+    print("✅ Zero or negative budgets rejected with 422")
+
+    # Tool turns are shortened so the finalize margin survives, but never below the floor
+    executor = ConcurrentToolExecutor([get_weather], turn_timeout_seconds=45)
+    assert executor.turn_timeout_for(None) == 45
+    config = {"configurable": {"max_seconds": 90, "run_started_at": time.time() - 60}}
+    assert 9 <= executor.turn_timeout_for(config) <= 10
+    config["configurable"]["run_started_at"] = time.time() - 85
+    assert executor.turn_timeout_for(config) == MIN_TURN_TIMEOUT_SECONDS
+    print(f"✅ Tool turn deadlines follow the remaining budget; metrics: {budget_metrics.stats()}")
+
+if __name__ == "__main__":
+    test_run_budget()
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Test request coalescing in the geocode, place search and exchange rate layers (no API calls)
+"""
+
+import sys
+import os
+import tempfile
+import threading
+import time
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.exchange_rates import ExchangeRateTable
+from utils.geocode_cache import GeocodeCache
+from utils.place_search_cache import PlaceSearchCache
+from utils.single_flight import SingleFlight, get_single_flight, single_flight_stats
+
+def run_concurrently(fn, count=5):
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(fn())) for _ in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+class SlowRatesHttp:
+    def __init__(self):
+        self.calls = 0
+
+    def get(self, url, **kwargs):
+        self.calls += 1
+        time.sleep(0.2)
+        class Response:
+            status_code = 200
+            def json(self):
+                return {"conversion_rates": {"USD": 1.0, "EUR": 0.9}}
+        return Response()
+
+def test_single_flight():
+    """Identical concurrent misses share one upstream call in every coalesced layer"""
+
+    print("🧪 Testing Single-Flight Coalescing")
+    print("=" * 50)
+
+    upstream_calls = []
+    def slow_upstream(value):
+        def fetch():
+            upstream_calls.append(value)
+            time.sleep(0.2)
+            return value
+        return fetch
+
+    with tempfile.TemporaryDirectory() as tmp:
+        geocode = GeocodeCache(db_path=os.path.join(tmp, "geocode.sqlite3"), single_flight=SingleFlight("geocode-test"))
+        results = run_concurrently(lambda: geocode.get_or_fetch("Eiffel Tower, Paris", slow_upstream((48.8584, 2.2945))))
+        assert results == [(48.8584, 2.2945)] * 5 and len(upstream_calls) == 1
+        assert geocode.single_flight.stats()["collapsed"] == 4
+        print("✅ Geocoder: 5 concurrent calls, 1 request")
+
+        places = PlaceSearchCache(db_path=os.path.join(tmp, "places.sqlite3"), single_flight=SingleFlight("tavily-test"))
+        results = run_concurrently(lambda: places.get_or_fetch("attractions", "Goa", slow_upstream("Baga beach")))
+        assert results == ["Baga beach"] * 5 and len(upstream_calls) == 2
+        print("✅ Tavily: 5 concurrent calls, 1 request")
+
+        http = SlowRatesHttp()
+        table = ExchangeRateTable(api_key="test", cache_path=os.path.join(tmp, "rates.json"), http_client=http,
+                                  single_flight=SingleFlight("rates-test"))
+        results = run_concurrently(lambda: table.convert(10, "USD", "EUR"))
+        assert results == [9.0] * 5 and http.calls == 1
+        print("✅ Exchange rates: 5 concurrent conversions, 1 table refresh")
+
+    # Named instances are shared process-wide and reported together
+    assert get_single_flight("geocode") is get_single_flight("geocode")
+    assert "geocode" in single_flight_stats()
+
+if __name__ == "__main__":
+    test_single_flight()
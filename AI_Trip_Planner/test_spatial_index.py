@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""
+Test the airport spatial index against a brute-force scan
+"""
+
+import sys
+import os
+import random
+import time
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from airportsdata import load as load_airports
+from utils.airport_spatial_index import AirportSpatialIndex
+from utils.geo_distance import CoordinateArrays
+
+def brute_force_nearest(coordinates, lat, lon, k, radius_km):
+    distances = coordinates.distances_from(lat, lon)
+    matches = sorted((float(d), code) for code, d in zip(coordinates.keys, distances) if d <= radius_km)
+    return [code for _, code in matches[:k]]
+
+def test_spatial_index():
+    """Index results must match a full scan, including near the poles and the antimeridian"""
+
+    print("🧪 Testing Airport Spatial Index")
+    print("=" * 50)
+
+    airports = load_airports('IATA')
+    index = AirportSpatialIndex(airports)
+    coordinates = CoordinateArrays.from_airports(airports)
+
+    # Known cities
+    nearest = [code for code, _ in index.nearest(51.5074, -0.1278, k=3, radius_km=200)]
+    print(f"✈️ Nearest airports to London: {nearest}")
+    assert "LCY" in nearest or "LHR" in nearest
+
+    # Random points, antimeridian and polar cases
+    random.seed(7)
+    points = [(random.uniform(-85, 85), random.uniform(-180, 180)) for _ in range(50)]
+    points += [(-17.7, 179.9), (64.8, -179.9), (78.2, 15.6), (-77.8, 166.6)]
+
+    start = time.perf_counter()
+    for lat, lon in points:
+        for radius_km in (50, 200, 1000):
+            got = [code for code, _ in index.nearest(lat, lon, k=5, radius_km=radius_km)]
+            assert got == brute_force_nearest(coordinates, lat, lon, 5, radius_km), (lat, lon, radius_km)
+    elapsed = time.perf_counter() - start
+
+    print(f"✅ {len(points) * 3} queries matched brute force ({elapsed:.2f}s including brute force)")
+
+if __name__ == "__main__":
+    test_spatial_index()
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Test the concurrent tool-execution node (no API calls)
+"""
+
+import sys
+import os
+import asyncio
+import json
+import time
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from langchain_core.messages import AIMessage, HumanMessage
+from langchain_core.tools import tool
+from agent.tool_executor import ConcurrentToolExecutor, tool_metrics
+from utils.concurrency import blocking_executor, tool_pool
+
+@tool
+def slow_lookup(city: str) -> str:
+    """Sync tool that blocks for a second"""
+    time.sleep(1.0)
+    return f"slow {city}"
+
+@tool
+async def fast_lookup(city: str) -> dict:
+    """Async tool that answers quickly"""
+    await asyncio.sleep(0.05)
+    return {"city": city, "ok": True}
+
+@tool
+async def hung_lookup(city: str) -> str:
+    """Async tool that never answers in time"""
+    await asyncio.sleep(30)
+    return city
+
+@tool
+def broken_lookup(city: str) -> str:
+    """Sync tool that raises"""
+    raise RuntimeError("upstream 500")
+
+def turn(*names):
+    calls = [{"name": name, "args": {"city": "Goa"}, "id": f"call_{i}", "type": "tool_call"} for i, name in enumerate(names)]
+    return {"messages": [HumanMessage(content="Plan Goa"), AIMessage(content="", tool_calls=calls)]}
+
+def test_tool_executor():
+    """Concurrent calls, per-tool and per-turn deadlines, structured error messages"""
+
+    print("🧪 Testing Concurrent Tool Executor")
+    print("=" * 50)
+
+    executor = ConcurrentToolExecutor([slow_lookup, fast_lookup, hung_lookup, broken_lookup],
+                                      tool_timeout_seconds=5, turn_timeout_seconds=10,
+                                      tool_timeouts={"hung_lookup": 0.3})
+
+    # Two one-second sync calls and an async call finish together, not one after another
+    before = tool_metrics.stats()
+    started = time.perf_counter()
+    result = asyncio.run(executor.ainvoke(turn("slow_lookup", "slow_lookup", "fast_lookup")))
+    elapsed = time.perf_counter() - started
+    messages = result["messages"]
+    print(f"✅ 3 tool calls in {elapsed:.2f}s")
+    assert elapsed < 1.8
+    assert [m.tool_call_id for m in messages] == ["call_0", "call_1", "call_2"]
+    assert messages[0].content == "slow Goa" and messages[0].status == "success"
+    assert json.loads(messages[2].content) == {"city": "Goa", "ok": True}
+
+    # A hung tool and a failing tool become error messages; the healthy call still answers
+    messages = asyncio.run(executor.ainvoke(turn("hung_lookup", "broken_lookup", "fast_lookup")))["messages"]
+    hung, broken, fast = messages
+    assert hung.status == "error" and json.loads(hung.content)["status"] == "timed_out"
+    assert json.loads(hung.content)["timeout_seconds"] == 0.3
+    assert broken.status == "error" and "upstream 500" in json.loads(broken.content)["error"]
+    assert fast.status == "success"
+    print("✅ Timed-out and failing calls returned structured error messages")
+
+    # The turn deadline caps the whole turn
+    executor = ConcurrentToolExecutor([slow_lookup, fast_lookup], tool_timeout_seconds=5, turn_timeout_seconds=0.3)
+    started = time.perf_counter()
+    messages = executor.invoke(turn("slow_lookup", "fast_lookup"))["messages"]
+    assert time.perf_counter() - started < 0.9
+    assert messages[0].status == "error" and "turn deadline" in json.loads(messages[0].content)["error"]
+    assert messages[1].status == "success"
+    print("✅ Turn deadline enforced through the sync entry point")
+
+    # Unknown tools are reported, not raised
+    message = asyncio.run(executor.ainvoke(turn("no_such_tool")))["messages"][0]
+    assert message.status == "error" and "unknown tool" in json.loads(message.content)["error"]
+
+    # A timed-out sync tool keeps running on the agent-tools pool, not on the enrichment executor
+    time.sleep(1.0)  # let the calls abandoned above finish
+    executor = ConcurrentToolExecutor([slow_lookup], tool_timeout_seconds=0.2, turn_timeout_seconds=5)
+    message = asyncio.run(executor.ainvoke(turn("slow_lookup")))["messages"][0]
+    assert json.loads(message.content)["status"] == "timed_out"
+    assert tool_pool.stats()["active"] == 1 and blocking_executor.stats()["active"] == 0
+    time.sleep(1.0)
+    assert tool_pool.stats()["active"] == 0
+    print("✅ Timed-out sync tool held an agent-tools thread only")
+
+    # The sync entry point refuses to block a running event loop and points at ainvoke()
+    async def invoke_inside_loop():
+        return executor.invoke(turn("fast_lookup"))
+    executor = ConcurrentToolExecutor([fast_lookup])
+    try:
+        asyncio.run(invoke_inside_loop())
+        assert False, "expected invoke() inside a running loop to fail"
+    except RuntimeError as e:
+        assert "ainvoke" in str(e)
+    print("✅ invoke() inside a running event loop raises instead of blocking it")
+
+    after = tool_metrics.stats()
+    assert after["calls"] - before["calls"] == 10
+    assert after["timed_out"] - before["timed_out"] == 3
+    assert after["turn_timeouts"] - before["turn_timeouts"] == 1
+    print(f"✅ Metrics: {after}")
+
+if __name__ == "__main__":
+    test_tool_executor()
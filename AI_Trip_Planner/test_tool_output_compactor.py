@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Test tool-output compaction and the local token estimator (no API calls)
+"""
+
+import sys
+import os
+import json
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from langchain_core.messages import AIMessage, HumanMessage, ToolMessage
+from langgraph.graph.message import add_messages
+from agent.tool_output_compactor import ToolOutputCompactor, compaction_metrics
+from utils.token_estimator import estimate_tokens, truncate_to_tokens
+
+def tavily_result(place):
+    results = []
+    for i in range(8):
+        results.append({
+            "title": f"Attraction {i % 4} in {place}",
+            "url": f"https://example.com/{place}/{i % 4}",
+            "content": f"Attraction {i % 4} is a beach fort with sunset views, see https://example.com/more " * 6,
+            "raw_content": "<html>" + "page text " * 300 + "</html>",
+            "score": 0.9 - i / 100,
+        })
+    return {"query": f"top attractive places in and around {place}", "answer": None, "images": [],
+            "results": results, "response_time": 1.2, "follow_up_questions": None}
+
+def test_tool_output_compactor():
+    """URL/metadata stripping, deduplication, forecast summaries, token budgets and id-preserving replacement"""
+
+    print("🧪 Testing Tool Output Compactor")
+    print("=" * 50)
+
+    # Token estimator: plain English lands near 1 token per word, truncation respects the budget
+    assert estimate_tokens("") == 0
+    assert 8 <= estimate_tokens("Plan a five day trip to Goa with beaches and forts") <= 14
+    assert estimate_tokens("12345678") == 3
+    long_text = "sunset cruise along the Mandovi river " * 100
+    cut = truncate_to_tokens(long_text, 50)
+    assert estimate_tokens(cut) <= 50 and cut.endswith("[truncated]")
+    print(f"✅ Estimated {estimate_tokens(long_text)} tokens, truncated to {estimate_tokens(cut)}")
+
+    compactor = ToolOutputCompactor(default_budget_tokens=300, budgets={"get_weather_forecast": 120})
+
+    # Raw Tavily dict embedded as a Python repr by search_attractions
+    raw = f"Following are the attractions of Goa: {tavily_result('Goa')}"
+    compacted = compactor.compact("search_attractions", raw)
+    print(f"✅ Attractions: {estimate_tokens(raw)} -> {estimate_tokens(compacted)} tokens")
+    assert compacted.startswith("Following are the attractions of Goa:")
+    assert "http" not in compacted and "raw_content" not in compacted and "score" not in compacted
+    assert estimate_tokens(compacted) <= 300
+    results = json.loads(compacted.split(": ", 1)[1])["results"]
+    assert len(results) == 4  # duplicate results dropped
+    assert [result["title"] for result in results] == [f"Attraction {i} in Goa" for i in range(4)]
+
+    # 3-hourly forecast lines become one line per day
+    forecast = "Weather forecast for Goa:\n" + "\n".join(
+        f"2026-10-{18 + i // 8}: {26 + i % 8 * 0.5} degree celcius , {'light rain' if i % 3 else 'clear sky'}"
+        for i in range(40))
+    compacted = compactor.compact("get_weather_forecast", forecast)
+    lines = compacted.split("\n")
+    assert lines[0] == "Weather forecast for Goa:" and len(lines) == 6
+    assert lines[1] == "2026-10-18: 26-30°C, light rain, clear sky"
+    print(f"✅ Forecast: {estimate_tokens(forecast)} -> {estimate_tokens(compacted)} tokens")
+
+    # Plain text keeps markdown tables intact while dropping repeated lines
+    text = "Goa is sunny.\nGoa is sunny.\n| From | To |\n|---|---|\n| A | B |\n| From | To |\n|---|---|"
+    assert compactor.compact("calculate_distance_between_places", text).count("|---|---|") == 2
+    assert compactor.compact("calculate_distance_between_places", text).count("Goa is sunny.") == 1
+
+    # Graph node: only this turn's results are compacted; ids are kept so they replace the raw messages
+    state = {"messages": add_messages([], [
+        HumanMessage(content="Plan a Goa trip"),
+        AIMessage(content="", tool_calls=[
+            {"name": "search_attractions", "args": {"place": "Goa"}, "id": "call_1", "type": "tool_call"},
+            {"name": "convert_currency", "args": {}, "id": "call_2", "type": "tool_call"},
+            {"name": "get_weather_forecast", "args": {"city": "Goa"}, "id": "call_3", "type": "tool_call"}]),
+        ToolMessage(content=raw, name="search_attractions", tool_call_id="call_1"),
+        ToolMessage(content="100 USD = 8300 INR", name="convert_currency", tool_call_id="call_2"),
+        ToolMessage(content='{"status": "timed_out"}', name="get_weather_forecast", tool_call_id="call_3", status="error"),
+    ])}
+    before = compaction_metrics.stats()
+    update = compactor(state)
+    assert len(update["messages"]) == 1
+    replacement = update["messages"][0]
+    assert replacement.id == state["messages"][2].id and replacement.tool_call_id == "call_1"
+    merged = add_messages(state["messages"], update["messages"])
+    assert len(merged) == 5 and "http" not in merged[2].content
+    assert merged[2].response_metadata["compacted_from_tokens"] == estimate_tokens(raw)
+    after = compaction_metrics.stats()
+    assert after["messages"] - before["messages"] == 2 and after["compacted"] - before["compacted"] == 1
+    print(f"✅ Node replaced the raw result in place; metrics: {after}")
+
+if __name__ == "__main__":
+    test_tool_output_compactor()
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Test the weather response cache and request coalescing with a fake HTTP client (no API calls)
+"""
+
+import sys
+import os
+import threading
+import time
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.single_flight import SingleFlight
+from utils.weather_cache import FORECAST_BUCKET_SECONDS, WeatherCache, next_forecast_bucket
+from utils.weather_info import WeatherForecastTool
+
+class FakeResponse:
+    def __init__(self, payload, status_code=200):
+        self.payload = payload
+        self.status_code = status_code
+
+    def json(self):
+        return self.payload
+
+class FakeWeatherHttp:
+    """Records requests; every call takes 0.2s so concurrent callers overlap"""
+
+    def __init__(self):
+        self.requests = []
+
+    def get(self, url, params=None, **kwargs):
+        self.requests.append((url.rsplit("/", 1)[-1], dict(params)))
+        time.sleep(0.2)
+        if params.get("q") == "Atlantis":
+            return FakeResponse({"cod": "404"}, status_code=404)
+        coord = {"lat": 15.4909, "lon": 73.8278}
+        if url.endswith("/weather"):
+            return FakeResponse({"coord": coord, "main": {"temp": 301.2}, "weather": [{"description": "clear sky"}]})
+        return FakeResponse({"city": {"coord": coord}, "list": []})
+
+def test_weather_cache():
+    """TTL per kind, coordinate reuse, empty responses and single-flight coalescing"""
+
+    print("🧪 Testing Weather Cache")
+    print("=" * 50)
+
+    http = FakeWeatherHttp()
+    weather = WeatherForecastTool("test-key", http_client=http, cache=WeatherCache(current_ttl_seconds=300, single_flight=SingleFlight("weather-test")))
+
+    # Five concurrent requests for the same city share one upstream call
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(weather.get_current_weather("Panaji"))) for _ in range(5)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(http.requests) == 1 and len(results) == 5
+    assert all(result["main"]["temp"] == 301.2 for result in results)
+    stats = weather.cache.stats()
+    assert stats["single_flight"]["collapsed"] == 4
+    print(f"✅ Concurrent requests coalesced: {stats['single_flight']}")
+
+    # Cached afterwards; the forecast reuses the resolved coordinates instead of the name
+    weather.get_current_weather(" panaji ")
+    assert len(http.requests) == 1
+    weather.get_forecast_weather("Panaji")
+    weather.get_forecast_weather("Panaji")
+    assert len(http.requests) == 2
+    endpoint, params = http.requests[-1]
+    assert endpoint == "forecast" and "q" not in params and params["lat"] == 15.4909
+    print("✅ Forecast requested by coordinates and cached")
+
+    # Forecasts expire at the next 3-hour bucket boundary
+    now = 1_700_000_000.0
+    assert next_forecast_bucket(now) % FORECAST_BUCKET_SECONDS == 0
+    assert 0 < next_forecast_bucket(now) - now <= FORECAST_BUCKET_SECONDS
+    assert next_forecast_bucket(next_forecast_bucket(now)) == next_forecast_bucket(now) + FORECAST_BUCKET_SECONDS
+
+    # Unknown places are not cached
+    assert weather.get_current_weather("Atlantis") == {}
+    assert weather.get_current_weather("Atlantis") == {}
+    assert len(http.requests) == 4
+
+    # Errors reach every coalesced caller and are not remembered
+    flight = SingleFlight("test")
+    errors = []
+    def failing():
+        time.sleep(0.1)
+        raise RuntimeError("upstream down")
+    def call():
+        try:
+            flight.do("key", failing)
+        except RuntimeError as e:
+            errors.append(str(e))
+    threads = [threading.Thread(target=call) for _ in range(3)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert errors == ["upstream down"] * 3
+    assert flight.do("key", lambda: "recovered") == "recovered"
+    assert flight.stats()["executions"] == 2 and flight.stats()["in_flight"] == 0
+    print("✅ Errors shared by coalesced callers, then retried")
+
+if __name__ == "__main__":
+    test_weather_cache()
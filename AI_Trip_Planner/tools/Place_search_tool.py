@@ -1,6 +1,7 @@
 import os
 from utils.place_info_search import TavilyPlaceSearchTool
-from typing import List
+from utils.concurrency import fanout_executor
+from typing import Dict, List
 from langchain.tools import tool
 from dotenv import load_dotenv
 
@@ -12,6 +13,28 @@ class PlaceSearchTool:
         self.tavily_search = TavilyPlaceSearchTool()
         self.place_search_tool_list = self._setup_tools()
 
+    def place_overview(self, place: str) -> Dict[str, object]:
+        """Attractions, restaurants, activities and transportation for a place, searched concurrently"""
+        searches = {
+            "attractions": self.tavily_search.tavily_search_attractions,
+            "restaurants": self.tavily_search.tavily_search_restaurants,
+            "activities": self.tavily_search.tavily_search_activity,
+            "transportation": self.tavily_search.tavily_search_transportation,
+        }
+        # Categories run side by side on the shared fan-out pool, so an overview costs the slowest search
+        futures = {category: fanout_executor.submit(search, place) for category, search in searches.items()}
+        overview: Dict[str, object] = {"place": place}
+        errors = {}
+        for category, future in futures.items():
+            try:
+                overview[category] = future.result()
+            except Exception as e:
+                overview[category] = None
+                errors[category] = str(e)
+        if errors:
+            overview["errors"] = errors
+        return overview
+
     def _setup_tools(self) -> List:
         """Setup all tools for the place search tool"""
         @tool
@@ -38,4 +61,9 @@ class PlaceSearchTool:
             tavily_result = self.tavily_search.tavily_search_transportation(place)
             return f"Following are the modes of transportation available in {place}: {tavily_result}"
         
-        return [search_attractions, search_restaurants, search_activities, search_transportation]
\ No newline at end of file
+        @tool
+        def search_place_overview(place:str) -> dict:
+            """Search attractions, restaurants, activities and transportation of a place in one call"""
+            return self.place_overview(place)
+        
+        return [search_place_overview, search_attractions, search_restaurants, search_activities, search_transportation]
\ No newline at end of file
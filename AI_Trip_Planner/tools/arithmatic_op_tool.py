@@ -1,8 +1,7 @@
-import os
 from dotenv import load_dotenv
 load_dotenv()
 from langchain.tools import tool
-from langchain_community.utilities.alpha_vantage import AlphaVantageAPIWrapper
+from utils.exchange_rates import get_exchange_rate_table
 
 @tool
 def multiply(a: int, b: int) -> int:
@@ -34,8 +33,7 @@ def add(a: int, b: int) -> int:
 
 @tool
 def currency_converter(from_curr: str, to_curr: str, value: float)->float:
-    os.environ["ALPHAVANTAGE_API_KEY"] = os.getenv('ALPHAVANTAGE_API_KEY')
-    alpha_vantage = AlphaVantageAPIWrapper()
-    response = alpha_vantage._get_exchange_rate(from_curr, to_curr)
-    exchange_rate = response['Realtime Currency Exchange Rate']['5. Exchange Rate']
-    return value * float(exchange_rate)
\ No newline at end of file
+    """
+    Convert a value between currencies using the shared exchange rate table.
+    """
+    return get_exchange_rate_table().convert(value, from_curr, to_curr)
\ No newline at end of file
@@ -18,4 +18,9 @@ class CurrencyConverterTool:
             """Convert amount from one currency to another"""
             return self.currency_service.convert(amount, from_currency, to_currency)
         
-        return [convert_currency]
\ No newline at end of file
+        @tool
+        def convert_currency_amounts(amounts:List[float], from_currency:str, to_currency:str):
+            """Convert a list of amounts from one currency to another in one call"""
+            return self.currency_service.convert_many(amounts, from_currency, to_currency)
+        
+        return [convert_currency, convert_currency_amounts]
\ No newline at end of file
@@ -1,71 +1,90 @@
 import os
-from typing import List
+from typing import List, Optional
 from langchain.tools import tool
 from dotenv import load_dotenv
-import requests
-from airportsdata import load as load_airports
+from utils.airport_directory import get_airport_directory
+from utils.airport_spatial_index import get_airport_spatial_index
+from utils.geocode_cache import get_geocode_cache
+from utils.route_cache import get_route_cache
+from utils.route_matrix import RouteMatrixClient
+from utils.http_client import HttpClient, get_http_client
+from utils.geo_distance import ROAD_DISTANCE_FACTOR, coordinate_distance_matrix
 
 class DistanceCalculatorTool:
-    def __init__(self):
+    def __init__(self, http_client: Optional[HttpClient] = None):
         load_dotenv()
+        self.http = http_client or get_http_client()
         self.openroute_api_key = os.environ.get("MAP_KEY")
-        self.airports_data = load_airports('IATA')
+        self.airport_directory = get_airport_directory()
+        self.airports_data = self.airport_directory.airports
+        self.spatial_index = get_airport_spatial_index()
+        self.geocode_cache = get_geocode_cache()
+        self.route_cache = get_route_cache()
+        self.route_matrix = RouteMatrixClient(api_key=self.openroute_api_key, http_client=self.http)
         self.distance_tool_list = self._setup_tools()
 
     def _get_coordinates_from_address(self, address: str) -> tuple:
-        """Get coordinates from address using OpenRouteService Geocoding API"""
+        """Get coordinates from address using OpenRouteService Geocoding API (cached)"""
         try:
-            url = "https://api.openrouteservice.org/geocode/search"
-            headers = {"Authorization": self.openroute_api_key}
-            params = {"text": address, "size": 1}
-            
-            response = requests.get(url, headers=headers, params=params)
-            if response.status_code == 200:
-                data = response.json()
-                if data.get('features'):
-                    coords = data['features'][0]['geometry']['coordinates']
-                    return (coords[1], coords[0])  # Return as (lat, lon)
-            return None
+            return self.geocode_cache.get_or_fetch(address, lambda: self._geocode(address))
         except Exception as e:
             print(f"Error getting coordinates for {address}: {e}")
             return None
 
+    def _geocode(self, address: str) -> tuple:
+        """Call the geocoder; returns None when there is no match and raises on API errors"""
+        url = "https://api.openrouteservice.org/geocode/search"
+        headers = {"Authorization": self.openroute_api_key}
+        params = {"text": address, "size": 1}
+        
+        response = self.http.get(url, headers=headers, params=params, timeout=15)
+        if response.status_code != 200:
+            raise Exception(f"Geocoding failed with status {response.status_code}")
+        data = response.json()
+        if data.get('features'):
+            coords = data['features'][0]['geometry']['coordinates']
+            return (coords[1], coords[0])  # Return as (lat, lon)
+        return None
+
     def _get_airport_coordinates(self, airport_code: str) -> tuple:
         """Get airport coordinates from IATA code"""
         try:
-            if airport_code in self.airports_data:
-                airport_info = self.airports_data[airport_code]
-                lat = airport_info.get('lat')
-                lon = airport_info.get('lon')
-                if lat and lon:
-                    return (lat, lon)
-            return None
+            return self.airport_directory.coordinates(airport_code)
         except Exception as e:
             print(f"Error getting airport coordinates for {airport_code}: {e}")
             return None
 
     def _calculate_driving_distance(self, start_coords: tuple, end_coords: tuple) -> float:
-        """Calculate driving distance using OpenRouteService"""
+        """Calculate driving distance using OpenRouteService (cached)"""
         try:
-            url = "https://api.openrouteservice.org/v2/directions/driving-car"
-            headers = {"Authorization": self.openroute_api_key}
-            body = {
-                "coordinates": [
-                    [start_coords[1], start_coords[0]],  # [lon, lat]
-                    [end_coords[1], end_coords[0]]
-                ]
-            }
-            response = requests.post(url, json=body, headers=headers)
-            if response.status_code == 200:
-                data = response.json()
-                # distance in meters, convert to kilometers
-                distance_km = data['features'][0]['properties']['segments'][0]['distance'] / 1000
-                return round(distance_km, 2)
-            return None
+            route = self.route_cache.get_or_fetch(
+                start_coords, end_coords, lambda radius: self._request_route(start_coords, end_coords, radius)
+            )
+            return round(route["distance_km"], 2) if route else None
         except Exception as e:
             print(f"Error calculating distance: {e}")
             return None
 
+    def _request_route(self, start_coords: tuple, end_coords: tuple, radius: int) -> dict:
+        """POST to the directions API; returns None when no routable point is found within radius meters"""
+        url = "https://api.openrouteservice.org/v2/directions/driving-car"
+        headers = {"Authorization": self.openroute_api_key}
+        body = {
+            "coordinates": [
+                [start_coords[1], start_coords[0]],  # [lon, lat]
+                [end_coords[1], end_coords[0]]
+            ],
+            "radiuses": [radius, radius]
+        }
+        response = self.http.post(url, json=body, headers=headers, timeout=20)
+        if response.status_code == 404:
+            return None
+        if response.status_code != 200:
+            raise Exception(f"Directions request failed with status {response.status_code}")
+        segment = response.json()['features'][0]['properties']['segments'][0]
+        # distance in meters, convert to kilometers
+        return {"distance_km": segment['distance'] / 1000, "duration_s": segment.get('duration')}
+
     def _setup_tools(self) -> List:
         """Setup all tools for distance calculation"""
         
@@ -158,10 +177,8 @@ class DistanceCalculatorTool:
             nearest_airport = None
             min_distance = float('inf')
             
-            # Check major airports (limit search for performance)
-            major_airports = ['JFK', 'LHR', 'CDG', 'DXB', 'NRT', 'LAX', 'ORD', 'DEL', 'BOM', 'SIN']
-            
-            for airport_code in major_airports:
+            # Route only the closest few airports found by the spatial index
+            for airport_code, _ in self.spatial_index.nearest(city_coords[0], city_coords[1], k=3, radius_km=500):
                 airport_coords = self._get_airport_coordinates(airport_code)
                 if airport_coords:
                     distance = self._calculate_driving_distance(city_coords, airport_coords)
@@ -171,8 +188,59 @@ class DistanceCalculatorTool:
             
             if nearest_airport:
                 airport_name = self.airports_data.get(nearest_airport, {}).get('name', nearest_airport)
-                return f"Nearest major airport to {city_name}: {airport_name} ({nearest_airport}) - {min_distance} km away"
+                return f"Nearest airport to {city_name}: {airport_name} ({nearest_airport}) - {min_distance} km away"
             else:
                 return f"Could not find nearest airport to {city_name}"
 
-        return [calculate_airport_to_attraction_distance, calculate_distance_between_places, find_nearest_airport_to_city]
+        @tool
+        def calculate_itinerary_distance_table(places: List[str]) -> str:
+            """
+            Calculate driving distances between every pair of places in an itinerary in one step.
+            Prefer this over repeated calculate_distance_between_places calls when
+            comparing three or more places.
+            
+            Args:
+                places (List[str]): Places/addresses in the itinerary (uppercase IATA codes are accepted)
+            
+            Returns:
+                str: Table of road distances in km between all places
+            """
+            resolved_places = []
+            coords = []
+            missing = []
+            for place in places:
+                place_coords = None
+                if len(place.strip()) == 3 and place.strip().isupper():
+                    place_coords = self._get_airport_coordinates(place.strip())
+                place_coords = place_coords or self._get_coordinates_from_address(place)
+                if place_coords:
+                    resolved_places.append(place)
+                    coords.append(place_coords)
+                else:
+                    missing.append(place)
+            
+            if len(coords) < 2:
+                return f"Could not find coordinates for enough places to build a distance table: {', '.join(missing) or places}"
+            
+            # One matrix request for all pairs; straight-line estimates fill anything it could not route
+            estimates = coordinate_distance_matrix(coords, coords) * ROAD_DISTANCE_FACTOR
+            try:
+                routes = self.route_cache.get_or_fetch_matrix(coords, coords, self.route_matrix.matrix)
+                road = [[route["distance_km"] if route else None for route in row] for row in routes]
+                lines = ["Driving distances (km):"]
+            except Exception as e:
+                print(f"Error calculating distance matrix: {e}")
+                road = None
+                lines = ["Approximate road distances (km, straight-line x1.2):"]
+            for i, origin in enumerate(resolved_places):
+                for j in range(i + 1, len(resolved_places)):
+                    if road and road[i][j] is not None:
+                        lines.append(f"{origin} -> {resolved_places[j]}: {road[i][j]:.2f} km")
+                    else:
+                        lines.append(f"{origin} -> {resolved_places[j]}: ~{estimates[i, j]:.2f} km (straight-line estimate)")
+            if missing:
+                lines.append(f"Could not find coordinates for: {', '.join(missing)}")
+            return "\n".join(lines)
+
+        return [calculate_airport_to_attraction_distance, calculate_distance_between_places, find_nearest_airport_to_city,
+                calculate_itinerary_distance_table]
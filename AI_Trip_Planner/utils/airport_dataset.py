@@ -0,0 +1,225 @@
+import mmap
+import os
+import struct
+import sys
+import tempfile
+import numpy as np
+from collections.abc import Mapping
+from functools import lru_cache
+from typing import Dict, Iterator, List, Optional
+import airportsdata
+from utils.config_loaders import get_config_value
+from utils.geo_distance import CoordinateArrays
+
+MAGIC = b"APDS"
+FORMAT_VERSION = 1
+# magic, format version, reserved, airport count, string count, source version string id, reserved
+HEADER = struct.Struct("<4sHHIIII")
+FLOAT_FIELDS = ("lat", "lon", "elevation")
+STRING_FIELDS = ("icao", "name", "city", "subd", "country", "tz", "lid")
+
+
+def default_dataset_path() -> str:
+    directory = get_config_value("cache", "directory", default="cache")
+    return os.path.join(directory, get_config_value("cache", "airport_dataset", default="airports.bin"))
+
+
+def build_airport_dataset(path: Optional[str] = None, airports_data: Optional[Dict[str, dict]] = None,
+                          source_version: Optional[str] = None) -> str:
+    """
+    Serialize the IATA airport table into the columnar binary file read by AirportDataset
+
+    Layout (little-endian): header, float64 columns (lat, lon, elevation), uint32 string-id
+    columns, uint32 string offsets, the sorted 3-byte IATA column, then the UTF-8 string blob.
+    Strings are interned, so repeated countries, cities and time zones are stored once.
+    The file is written to a temp file and renamed, so readers never see a partial file.
+    """
+    path = path or default_dataset_path()
+    if airports_data is None:
+        airports_data = airportsdata.load('IATA')
+        source_version = source_version or airportsdata.__version__
+    codes = sorted(code for code in airports_data if code.isascii() and len(code) == 3)
+
+    strings: List[str] = []
+    string_ids: Dict[str, int] = {}
+
+    def intern(value) -> int:
+        value = "" if value is None else str(value)
+        if value not in string_ids:
+            string_ids[value] = len(strings)
+            strings.append(value)
+        return string_ids[value]
+
+    source_id = intern(source_version or "")
+    floats = np.full((len(FLOAT_FIELDS), len(codes)), np.nan, dtype="<f8")
+    ids = np.zeros((len(STRING_FIELDS), len(codes)), dtype="<u4")
+    for row, code in enumerate(codes):
+        info = airports_data[code]
+        for column, field in enumerate(FLOAT_FIELDS):
+            if info.get(field) is not None:
+                floats[column, row] = float(info[field])
+        for column, field in enumerate(STRING_FIELDS):
+            ids[column, row] = intern(info.get(field))
+
+    encoded = [value.encode("utf-8") for value in strings]
+    offsets = np.zeros(len(encoded) + 1, dtype="<u4")
+    offsets[1:] = np.cumsum([len(value) for value in encoded])
+
+    directory = os.path.dirname(path) or "."
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".airports-", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as file:
+            file.write(HEADER.pack(MAGIC, FORMAT_VERSION, 0, len(codes), len(strings), source_id, 0))
+            file.write(floats.tobytes())
+            file.write(ids.tobytes())
+            file.write(offsets.tobytes())
+            file.write(np.array(codes, dtype="S3").tobytes())
+            file.write(b"".join(encoded))
+        os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    return path
+
+
+class AirportDataset(Mapping):
+    """
+    Read-only, memory-mapped view of the airport table built by build_airport_dataset().
+
+    Behaves like the airportsdata {iata: record} dict, but records are decoded on access from
+    the mapped columns, so every worker process shares one page-cached copy of the data.
+    Coordinates are exposed as numpy arrays backed directly by the mapping.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, "rb") as file:
+            self._mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, _, count, string_count, source_id, _ = HEADER.unpack_from(self._mmap, 0)
+        if magic != MAGIC or version != FORMAT_VERSION:
+            self._mmap.close()
+            raise ValueError(f"{path} is not an airport dataset (format {FORMAT_VERSION})")
+        self.count = count
+
+        offset = HEADER.size
+        self._floats = np.frombuffer(self._mmap, dtype="<f8", count=len(FLOAT_FIELDS) * count, offset=offset)
+        self._floats = self._floats.reshape(len(FLOAT_FIELDS), count)
+        offset += self._floats.nbytes
+        self._ids = np.frombuffer(self._mmap, dtype="<u4", count=len(STRING_FIELDS) * count, offset=offset)
+        self._ids = self._ids.reshape(len(STRING_FIELDS), count)
+        offset += self._ids.nbytes
+        self._offsets = np.frombuffer(self._mmap, dtype="<u4", count=string_count + 1, offset=offset)
+        offset += self._offsets.nbytes
+        self._iata = np.frombuffer(self._mmap, dtype="S3", count=count, offset=offset)
+        self._blob_start = offset + self._iata.nbytes
+        self.source_version = self.string(source_id)
+
+    @property
+    def lats(self) -> np.ndarray:
+        return self._floats[FLOAT_FIELDS.index("lat")]
+
+    @property
+    def lons(self) -> np.ndarray:
+        return self._floats[FLOAT_FIELDS.index("lon")]
+
+    @property
+    def codes(self) -> List[str]:
+        return [code.decode("ascii") for code in self._iata]
+
+    def string(self, string_id: int) -> str:
+        start = self._blob_start + int(self._offsets[string_id])
+        end = self._blob_start + int(self._offsets[string_id + 1])
+        return self._mmap[start:end].decode("utf-8")
+
+    def column(self, field: str) -> List:
+        """Every row's value for one field, in row (IATA) order"""
+        if field == "iata":
+            return self.codes
+        if field in FLOAT_FIELDS:
+            return self._floats[FLOAT_FIELDS.index(field)].tolist()
+        decoded: Dict[int, str] = {}
+        values = []
+        for string_id in self._ids[STRING_FIELDS.index(field)].tolist():
+            if string_id not in decoded:
+                decoded[string_id] = self.string(string_id)
+            values.append(decoded[string_id])
+        return values
+
+    def _row(self, code) -> int:
+        if not isinstance(code, str) or len(code) != 3 or not code.isascii():
+            return -1
+        key = code.encode("ascii")
+        row = int(np.searchsorted(self._iata, key))
+        return row if row < self.count and self._iata[row] == key else -1
+
+    def record(self, row: int) -> dict:
+        record = {"iata": self._iata[row].decode("ascii")}
+        for column, field in enumerate(STRING_FIELDS):
+            record[field] = self.string(int(self._ids[column, row]))
+        for column, field in enumerate(FLOAT_FIELDS):
+            value = float(self._floats[column, row])
+            record[field] = None if np.isnan(value) else value
+        return record
+
+    def __getitem__(self, code: str) -> dict:
+        row = self._row(code)
+        if row < 0:
+            raise KeyError(code)
+        return self.record(row)
+
+    def __contains__(self, code) -> bool:
+        return self._row(code) >= 0
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.codes)
+
+    def __len__(self) -> int:
+        return self.count
+
+    def coordinate_arrays(self) -> CoordinateArrays:
+        """Coordinates for CoordinateArrays without copying the mapped columns"""
+        valid = ~(np.isnan(self.lats) | np.isnan(self.lons))
+        if valid.all():
+            return CoordinateArrays(self.codes, self.lats, self.lons)
+        return CoordinateArrays([code for code, ok in zip(self.codes, valid) if ok], self.lats[valid], self.lons[valid])
+
+    def close(self):
+        self._floats = self._ids = self._offsets = self._iata = None
+        try:
+            self._mmap.close()
+        except BufferError:
+            # Arrays handed out (e.g. to CoordinateArrays) still view the mapping; it is released with them
+            pass
+
+
+def load_airport_dataset(path: Optional[str] = None) -> AirportDataset:
+    """Map the airport dataset, building it first if it is missing or from another airportsdata release"""
+    path = path or default_dataset_path()
+    if os.path.exists(path):
+        try:
+            dataset = AirportDataset(path)
+            if dataset.source_version == airportsdata.__version__:
+                return dataset
+            dataset.close()
+        except (ValueError, struct.error) as e:
+            print(f"Rebuilding airport dataset {path}: {e}")
+    build_airport_dataset(path)
+    return AirportDataset(path)
+
+
+@lru_cache(maxsize=1)
+def get_airport_dataset() -> AirportDataset:
+    """Process-wide mapped airport dataset"""
+    return load_airport_dataset()
+
+
+if __name__ == "__main__":
+    # Usage: python -m utils.airport_dataset build [output_path]
+    if len(sys.argv) < 2 or sys.argv[1] != "build":
+        print("Usage: python -m utils.airport_dataset build [output_path]")
+        sys.exit(1)
+    output = build_airport_dataset(sys.argv[2] if len(sys.argv) > 2 else None)
+    print(f"Wrote {len(AirportDataset(output))} airports to {output} ({os.path.getsize(output)} bytes)")
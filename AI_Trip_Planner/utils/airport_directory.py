@@ -0,0 +1,188 @@
+import difflib
+import re
+import unicodedata
+from functools import lru_cache
+from typing import Dict, List, Mapping, Optional, Tuple
+from utils.airport_dataset import AirportDataset, get_airport_dataset
+
+# Busiest passenger hubs; ranked first when a city has several airports
+MAJOR_AIRPORTS = {
+    "ATL", "DFW", "DEN", "ORD", "LAX", "JFK", "LAS", "MCO", "MIA", "CLT", "SEA", "PHX", "EWR", "SFO", "IAH",
+    "BOS", "MSP", "DTW", "FLL", "YYZ", "YVR", "MEX", "GRU", "BOG", "LHR", "CDG", "AMS", "FRA", "IST", "MAD",
+    "BCN", "FCO", "MUC", "ZRH", "VIE", "CPH", "OSL", "ARN", "DUB", "LIS", "ATH", "DXB", "DOH", "AUH", "RUH",
+    "JED", "CAI", "JNB", "DEL", "BOM", "BLR", "CCU", "MAA", "HYD", "GOI", "COK", "SIN", "KUL", "BKK", "HKG",
+    "ICN", "HND", "NRT", "KIX", "PEK", "PVG", "CAN", "TPE", "MNL", "CGK", "DPS", "SGN", "HAN", "SYD", "MEL",
+}
+
+# Common alternate names / regions that the dataset files under a different city
+CITY_ALIASES = {
+    "goa": "dabolim", "bengaluru": "bangalore", "calcutta": "kolkata", "bombay": "mumbai", "madras": "chennai",
+    "kochi": "cochin", "nyc": "new york", "peking": "beijing", "saigon": "ho chi minh city",
+}
+
+# Name keywords used to rank airports within a city: positive = likely passenger airport
+NAME_WEIGHTS = [
+    ("international", 2), ("airport", 1),
+    ("heliport", -4), ("seaplane", -4), ("skyport", -4), ("air base", -4), ("airbase", -4), ("afb", -4),
+    ("raf ", -4), ("naval", -4), ("military", -4), ("station", -3), ("bus", -3), ("railway", -3),
+    ("airstrip", -2), ("airfield", -1),
+]
+
+
+def normalize_name(name: str) -> str:
+    """Lowercase, strip accents and punctuation, collapse whitespace"""
+    name = unicodedata.normalize("NFKD", name or "").encode("ascii", "ignore").decode("ascii")
+    return re.sub(r"[^a-z0-9]+", " ", name.lower()).strip()
+
+
+class CityTrie:
+    """Prefix tree over normalized city names (each word suffix is indexed, so 'delhi' finds 'new delhi')"""
+
+    _END = "$"
+
+    def __init__(self):
+        self._root: Dict[str, dict] = {}
+
+    def insert(self, key: str, city: str):
+        node = self._root
+        for char in key:
+            node = node.setdefault(char, {})
+        node.setdefault(self._END, set()).add(city)
+
+    def add_city(self, city: str):
+        words = city.split()
+        for i in range(len(words)):
+            self.insert(" ".join(words[i:]), city)
+
+    def search(self, prefix: str, limit: int = 10) -> List[str]:
+        """Cities with a name (or trailing words) starting with prefix, shortest first"""
+        node = self._root
+        for char in prefix:
+            node = node.get(char)
+            if node is None:
+                return []
+        matches = set()
+        stack = [node]
+        while stack:
+            current = stack.pop()
+            for key, child in current.items():
+                if key == self._END:
+                    matches.update(child)
+                else:
+                    stack.append(child)
+        return sorted(matches, key=lambda city: (len(city), city))[:limit]
+
+
+class AirportDirectory:
+    """
+    Airport dataset loaded once per process with hash indexes on IATA, ICAO, normalized city
+    and (country, city), plus a city-name trie for prefix and fuzzy lookups.
+    """
+
+    def __init__(self, airports_data: Optional[Mapping[str, dict]] = None):
+        # Defaults to the shared memory-mapped dataset rather than a per-process dict-of-dicts
+        self.airports: Mapping[str, dict] = airports_data if airports_data is not None else get_airport_dataset()
+        self._by_icao: Dict[str, str] = {}
+        self._by_city: Dict[str, List[str]] = {}
+        self._by_country_city: Dict[Tuple[str, str], List[str]] = {}
+        self._city_trie = CityTrie()
+
+        codes, icaos, names, cities, countries = self._columns("iata", "icao", "name", "city", "country")
+        self._names: Dict[str, str] = {code: (name or '').lower() for code, name in zip(codes, names)}
+        for code, icao, city, country in zip(codes, icaos, cities, countries):
+            if icao:
+                self._by_icao[icao.upper()] = code
+            city = normalize_name(city or '')
+            if not city:
+                continue
+            self._by_city.setdefault(city, []).append(code)
+            self._by_country_city.setdefault(((country or '').upper(), city), []).append(code)
+
+        for codes in list(self._by_city.values()) + list(self._by_country_city.values()):
+            codes.sort(key=self._rank_key)
+        for city in self._by_city:
+            self._city_trie.add_city(city)
+
+    def _columns(self, *fields: str) -> List[list]:
+        """Per-field value lists, read straight from the dataset columns when available"""
+        if isinstance(self.airports, AirportDataset):
+            return [self.airports.column(field) for field in fields]
+        codes = list(self.airports)
+        return [codes if field == "iata" else [self.airports[code].get(field) for code in codes] for field in fields]
+
+    def _rank_key(self, code: str) -> Tuple[int, int, str]:
+        """Sort key: major hubs first, then by name keywords, then by code"""
+        name = self._names.get(code, '')
+        score = sum(weight for keyword, weight in NAME_WEIGHTS if keyword in name)
+        return (0 if code in MAJOR_AIRPORTS else 1, -score, code)
+
+    def __contains__(self, code: str) -> bool:
+        return self.resolve_code(code) is not None
+
+    def __len__(self) -> int:
+        return len(self.airports)
+
+    def resolve_code(self, code: str) -> Optional[str]:
+        """IATA code for an IATA or ICAO code"""
+        if not code:
+            return None
+        code = code.strip().upper()
+        if code in self.airports:
+            return code
+        return self._by_icao.get(code)
+
+    def get(self, code: str) -> Optional[dict]:
+        """Airport record for an IATA or ICAO code"""
+        iata = self.resolve_code(code)
+        return self.airports[iata] if iata else None
+
+    def coordinates(self, code: str) -> Optional[Tuple[float, float]]:
+        airport = self.get(code)
+        if airport and airport.get('lat') is not None and airport.get('lon') is not None:
+            return (float(airport['lat']), float(airport['lon']))
+        return None
+
+    def airports_in_city(self, city: str, country: Optional[str] = None) -> List[str]:
+        """Ranked IATA codes for an exact (normalized) city name, optionally within a country (ISO code)"""
+        key = normalize_name(city)
+        key = CITY_ALIASES.get(key, key)
+        if country:
+            return list(self._by_country_city.get((country.upper(), key), []))
+        return list(self._by_city.get(key, []))
+
+    def search_cities(self, prefix: str, limit: int = 10) -> List[str]:
+        """Normalized city names matching a prefix"""
+        return self._city_trie.search(normalize_name(prefix), limit)
+
+    def fuzzy_cities(self, name: str, limit: int = 3, cutoff: float = 0.8) -> List[str]:
+        """Normalized city names close to a (possibly misspelled) name"""
+        return difflib.get_close_matches(normalize_name(name), self._by_city.keys(), n=limit, cutoff=cutoff)
+
+    def city_to_iata(self, city: str, country: Optional[str] = None, fuzzy: bool = True) -> Optional[str]:
+        """
+        Best IATA code for a city name
+
+        Tries an exact match, then a prefix match, then (optionally) a fuzzy match.
+        Codes are ranked so the main passenger airport wins when a city has several.
+        """
+        if not city or not city.strip():
+            return None
+        codes = self.airports_in_city(city, country)
+        if codes:
+            return codes[0]
+
+        candidates = self.search_cities(city, limit=5)
+        if not candidates and fuzzy:
+            candidates = self.fuzzy_cities(city)
+        ranked = []
+        for candidate in candidates:
+            ranked.extend(self.airports_in_city(candidate, country))
+        if not ranked:
+            return None
+        return min(ranked, key=self._rank_key)
+
+
+@lru_cache(maxsize=1)
+def get_airport_directory() -> AirportDirectory:
+    """Process-wide airport directory shared by main.py and the distance utilities"""
+    return AirportDirectory()
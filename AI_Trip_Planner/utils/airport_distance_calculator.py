@@ -1,37 +1,40 @@
 import os
-import requests
-from airportsdata import load as load_airports
+from functools import lru_cache
 from typing import Tuple, Optional, Dict, List
 from dotenv import load_dotenv
+from utils.airport_directory import get_airport_directory
+from utils.airport_spatial_index import get_airport_spatial_index
+from utils.geocode_cache import get_geocode_cache
+from utils.route_cache import get_route_cache
+from utils.route_matrix import RouteMatrixClient
+from utils.http_client import HttpClient, get_http_client
+from utils.geo_distance import ROAD_DISTANCE_FACTOR, coordinate_distance_matrix, haversine_distance
 
 class AirportDistanceCalculator:
     """Utility class for calculating distances from airports to various locations"""
     
-    def __init__(self):
+    def __init__(self, http_client: Optional[HttpClient] = None):
         load_dotenv()
+        self.http = http_client or get_http_client()
         self.openroute_api_key = os.environ.get("MAP_KEY")
-        self.airports_data = load_airports('IATA')
+        self.airport_directory = get_airport_directory()
+        self.airports_data = self.airport_directory.airports
+        self.spatial_index = get_airport_spatial_index()
+        self.geocode_cache = get_geocode_cache()
+        self.route_cache = get_route_cache()
+        self.route_matrix = RouteMatrixClient(api_key=self.openroute_api_key, http_client=self.http)
     
     def get_airport_coordinates(self, airport_code: str) -> Optional[Tuple[float, float]]:
         """Get latitude and longitude for an airport given its IATA code"""
         try:
-            if airport_code.upper() in self.airports_data:
-                airport_info = self.airports_data[airport_code.upper()]
-                lat = airport_info.get('lat')
-                lon = airport_info.get('lon')
-                if lat and lon:
-                    return (float(lat), float(lon))
-            return None
+            return self.airport_directory.coordinates(airport_code)
         except Exception as e:
             print(f"Error getting airport coordinates for {airport_code}: {e}")
             return None
     
     def get_coordinates_from_address(self, address: str) -> Optional[Tuple[float, float]]:
-        """Get coordinates from address using OpenRouteService Geocoding API"""
+        """Get coordinates from address using OpenRouteService Geocoding API (cached)"""
         try:
-            url = "https://api.openrouteservice.org/geocode/search"
-            headers = {"Authorization": self.openroute_api_key}
-            
             # Improve address specificity
             enhanced_address = address
             if "Times Square" in address and "New York" in address:
@@ -49,73 +52,85 @@ class AirportDistanceCalculator:
             # Remove None values
             params = {k: v for k, v in params.items() if v is not None}
             
-            response = requests.get(url, headers=headers, params=params, timeout=15)
-            if response.status_code == 200:
-                data = response.json()
-                if data.get('features'):
-                    coords = data['features'][0]['geometry']['coordinates']
-                    return (float(coords[1]), float(coords[0]))  # Return as (lat, lon)
-            return None
+            # Key on what is actually sent upstream so identical requests from other geocoders share entries
+            cache_key = enhanced_address
+            if "boundary.country" in params:
+                cache_key += f" | country:{params['boundary.country']}"
+            return self.geocode_cache.get_or_fetch(cache_key, lambda: self._geocode(params))
         except Exception as e:
             print(f"Error getting coordinates for {address}: {e}")
             return None
     
+    def _geocode(self, params: Dict[str, any]) -> Optional[Tuple[float, float]]:
+        """Call the geocoder; returns None when there is no match and raises on API errors"""
+        url = "https://api.openrouteservice.org/geocode/search"
+        headers = {"Authorization": self.openroute_api_key}
+        response = self.http.get(url, headers=headers, params=params, timeout=15)
+        if response.status_code != 200:
+            raise Exception(f"Geocoding failed with status {response.status_code}")
+        data = response.json()
+        if data.get('features'):
+            coords = data['features'][0]['geometry']['coordinates']
+            return (float(coords[1]), float(coords[0]))  # Return as (lat, lon)
+        return None
+    
     def calculate_driving_distance(self, start_coords: Tuple[float, float], end_coords: Tuple[float, float]) -> Optional[float]:
         """Calculate driving distance in kilometers between two coordinate points"""
         try:
-            url = "https://api.openrouteservice.org/v2/directions/driving-car"
-            headers = {"Authorization": self.openroute_api_key}
-            body = {
-                "coordinates": [
-                    [start_coords[1], start_coords[0]],  # [lon, lat]
-                    [end_coords[1], end_coords[0]]
-                ],
-                "radiuses": [1000, 1000]  # Allow up to 1km radius to find routable points
-            }
-            response = requests.post(url, json=body, headers=headers, timeout=20)
-            if response.status_code == 200:
-                data = response.json()
-                # distance in meters, convert to kilometers
-                distance_km = data['features'][0]['properties']['segments'][0]['distance'] / 1000
-                return round(distance_km, 2)
-            elif response.status_code == 404:
-                # Try with larger radius if 404 (routable point not found)
-                body["radiuses"] = [5000, 5000]  # 5km radius
-                response = requests.post(url, json=body, headers=headers, timeout=20)
-                if response.status_code == 200:
-                    data = response.json()
-                    distance_km = data['features'][0]['properties']['segments'][0]['distance'] / 1000
-                    return round(distance_km, 2)
-                else:
-                    # Fall back to straight-line distance calculation
-                    return self._calculate_haversine_distance(start_coords, end_coords)
-            return None
+            route = self.get_driving_route(start_coords, end_coords)
+            if route is None:
+                # No routable point even with a 5km radius: fall back to straight-line distance
+                return self._calculate_haversine_distance(start_coords, end_coords)
+            return round(route["distance_km"], 2)
         except Exception as e:
             print(f"Error calculating distance: {e}")
             # Fall back to straight-line distance
             return self._calculate_haversine_distance(start_coords, end_coords)
     
+    def get_driving_route(self, start_coords: Tuple[float, float], end_coords: Tuple[float, float]) -> Optional[Dict[str, float]]:
+        """Driving route as {"distance_km", "duration_s"} from the shared route cache, or None if unroutable"""
+        return self.route_cache.get_or_fetch(
+            start_coords, end_coords, lambda radius: self._request_route(start_coords, end_coords, radius)
+        )
+    
+    def _request_route(self, start_coords: Tuple[float, float], end_coords: Tuple[float, float], radius: int) -> Optional[Dict[str, float]]:
+        """POST to the directions API; returns None when no routable point is found within radius meters"""
+        url = "https://api.openrouteservice.org/v2/directions/driving-car"
+        headers = {"Authorization": self.openroute_api_key}
+        body = {
+            "coordinates": [
+                [start_coords[1], start_coords[0]],  # [lon, lat]
+                [end_coords[1], end_coords[0]]
+            ],
+            "radiuses": [radius, radius]  # Allow snapping to routable points within this radius
+        }
+        response = self.http.post(url, json=body, headers=headers, timeout=20)
+        if response.status_code == 404:
+            return None
+        if response.status_code != 200:
+            raise Exception(f"Directions request failed with status {response.status_code}")
+        segment = response.json()['features'][0]['properties']['segments'][0]
+        # distance in meters, convert to kilometers
+        return {"distance_km": segment['distance'] / 1000, "duration_s": segment.get('duration')}
+    
     def _calculate_haversine_distance(self, coord1: Tuple[float, float], coord2: Tuple[float, float]) -> float:
         """Calculate straight-line distance using Haversine formula as fallback"""
-        import math
-        
-        lat1, lon1 = coord1
-        lat2, lon2 = coord2
-        
-        # Convert to radians
-        lat1, lon1, lat2, lon2 = map(math.radians, [lat1, lon1, lat2, lon2])
-        
-        # Haversine formula
-        dlat = lat2 - lat1
-        dlon = lon2 - lon1
-        a = math.sin(dlat/2)**2 + math.cos(lat1) * math.cos(lat2) * math.sin(dlon/2)**2
-        c = 2 * math.asin(math.sqrt(a))
-        
-        # Earth's radius in kilometers
-        r = 6371
+        distance = haversine_distance(coord1, coord2)
+        return round(distance * ROAD_DISTANCE_FACTOR, 2)  # Add 20% to approximate road distance
+    
+    def calculate_distance_matrix(self, origins: List[Tuple[float, float]], destinations: List[Tuple[float, float]]) -> List[List[float]]:
+        """
+        Estimate road distances for every origin/destination pair in one vectorized pass
         
-        distance = r * c
-        return round(distance * 1.2, 2)  # Add 20% to approximate road distance
+        Args:
+            origins: List of (lat, lon) tuples
+            destinations: List of (lat, lon) tuples
+            
+        Returns:
+            len(origins) x len(destinations) nested list of approximate road distances in km
+        """
+        matrix = coordinate_distance_matrix(origins, destinations) * ROAD_DISTANCE_FACTOR
+        return matrix.round(2).tolist()
     
     def get_airport_to_attraction_distance(self, airport_code: str, attraction_address: str) -> Dict[str, any]:
         """
@@ -151,6 +166,65 @@ class AirportDistanceCalculator:
         
         # Calculate distance
         distance = self.calculate_driving_distance(airport_coords, attraction_coords)
+        return self._apply_distance(result, distance)
+    
+    def get_airport_to_attractions_distances(self, airport_code: str, attraction_addresses: List[str]) -> List[Dict[str, any]]:
+        """
+        Distance information from one airport to several attractions using a single matrix request
+        
+        Returns:
+            list: One dict per attraction, same shape as get_airport_to_attraction_distance
+        """
+        results = [{
+            "success": False,
+            "airport_code": airport_code,
+            "attraction": attraction_address,
+            "distance_km": None,
+            "travel_time": None,
+            "airport_name": None,
+            "error": None
+        } for attraction_address in attraction_addresses]
+        
+        airport_coords = self.get_airport_coordinates(airport_code)
+        if not airport_coords:
+            for result in results:
+                result["error"] = f"Could not find airport with code {airport_code}"
+            return results
+        
+        airport_name = self.airports_data.get(airport_code.upper(), {}).get('name', airport_code)
+        routable = []
+        for result in results:
+            result["airport_name"] = airport_name
+            attraction_coords = self.get_coordinates_from_address(result["attraction"])
+            if attraction_coords:
+                routable.append((result, attraction_coords))
+            else:
+                result["error"] = f"Could not find coordinates for {result['attraction']}"
+        if not routable:
+            return results
+        
+        distances = self.calculate_driving_distances(airport_coords, [coords for _, coords in routable])
+        for (result, _), distance in zip(routable, distances):
+            self._apply_distance(result, distance)
+        return results
+    
+    def calculate_driving_distances(self, start_coords: Tuple[float, float], destinations: List[Tuple[float, float]]) -> List[Optional[float]]:
+        """Driving distances in km from one point to several, using a single cached matrix request"""
+        if not destinations:
+            return []
+        try:
+            # Pairs already in the route cache are not requested; new matrix results are cached
+            routes = self.route_cache.get_or_fetch_matrix([start_coords], destinations, self.route_matrix.matrix)[0]
+            distances = [round(route["distance_km"], 2) if route else None for route in routes]
+        except Exception as e:
+            print(f"Error calculating distance matrix: {e}")
+            distances = [None] * len(destinations)
+        # Pairs missing from the matrix fall back to a single route request
+        return [distance if distance is not None else self.calculate_driving_distance(start_coords, end_coords)
+                for distance, end_coords in zip(distances, destinations)]
+    
+    def _apply_distance(self, result: Dict[str, any], distance: Optional[float]) -> Dict[str, any]:
+        """Fill distance, travel time and status into a distance result"""
         if distance is not None:
             result["success"] = True
             result["distance_km"] = distance
@@ -166,13 +240,18 @@ class AirportDistanceCalculator:
         
         return result
     
-    def find_nearest_airports_to_city(self, city_name: str, limit: int = 3) -> List[Dict[str, any]]:
+    def find_nearest_airports_to_city(self, city_name: str, limit: int = 3, radius_km: float = 200) -> List[Dict[str, any]]:
         """
         Find the nearest airports to a given city
         
+        Candidates come from the spatial index by great-circle distance. More than limit of
+        them are routed (in one matrix request), since a close airport can still be out of
+        radius by road; the rest are ranked by driving distance.
+        
         Args:
             city_name: Name of the city
             limit: Maximum number of airports to return
+            radius_km: Only airports within this driving distance are returned
             
         Returns:
             List of airport information dictionaries
@@ -181,23 +260,27 @@ class AirportDistanceCalculator:
         if not city_coords:
             return []
         
-        airport_distances = []
-        
-        # Check a broader range of airports
-        for airport_code, airport_info in self.airports_data.items():
+        candidates = []
+        for airport_code, _ in self.spatial_index.nearest(city_coords[0], city_coords[1],
+                                                          k=max(3 * limit, limit + 5), radius_km=radius_km):
             airport_coords = self.get_airport_coordinates(airport_code)
             if airport_coords:
-                distance = self.calculate_driving_distance(city_coords, airport_coords)
-                if distance and distance <= 200:  # Only consider airports within 200km
-                    airport_distances.append({
-                        "code": airport_code,
-                        "name": airport_info.get('name', airport_code),
-                        "city": airport_info.get('city', ''),
-                        "country": airport_info.get('country', ''),
-                        "distance_km": distance
-                    })
-        
-        # Sort by distance and return top results
+                candidates.append((airport_code, airport_coords))
+        
+        airport_distances = []
+        distances = self.calculate_driving_distances(city_coords, [coords for _, coords in candidates])
+        for (airport_code, _), distance in zip(candidates, distances):
+            if distance and distance <= radius_km:
+                airport_info = self.airports_data.get(airport_code, {})
+                airport_distances.append({
+                    "code": airport_code,
+                    "name": airport_info.get('name', airport_code),
+                    "city": airport_info.get('city', ''),
+                    "country": airport_info.get('country', ''),
+                    "distance_km": distance
+                })
+        
+        # Sort by driving distance and return top results
         airport_distances.sort(key=lambda x: x['distance_km'])
         return airport_distances[:limit]
     
@@ -209,3 +292,9 @@ class AirportDistanceCalculator:
         return (f"Distance from {distance_data['airport_name']} ({distance_data['airport_code']}) "
                 f"to {distance_data['attraction']}: {distance_data['distance_km']} km "
                 f"(approximately {distance_data['travel_time']} by car)")
+
+
+@lru_cache(maxsize=1)
+def get_airport_distance_calculator() -> AirportDistanceCalculator:
+    """Process-wide calculator used to enrich travel reports"""
+    return AirportDistanceCalculator()
@@ -0,0 +1,85 @@
+import math
+import numpy as np
+from functools import lru_cache
+from typing import Dict, List, Tuple
+from utils.airport_directory import get_airport_directory
+from utils.geo_distance import EARTH_RADIUS_KM, CoordinateArrays
+
+
+class AirportSpatialIndex:
+    """
+    Grid bucket index over airport coordinates.
+
+    Airports are bucketed into fixed-size lat/lon cells once; a nearest-airport query only
+    scores the airports in the cells that can intersect the search radius, in one vectorized
+    haversine pass over their coordinate arrays.
+    """
+
+    def __init__(self, airports_data: Dict[str, dict], cell_size_deg: float = 1.0):
+        self.cell_size_deg = cell_size_deg
+        self.n_rows = int(math.ceil(180 / cell_size_deg))
+        self.n_cols = int(math.ceil(360 / cell_size_deg))
+        self.coordinates = CoordinateArrays.from_airports(airports_data)
+
+        buckets: Dict[Tuple[int, int], List[int]] = {}
+        for i, (lat, lon) in enumerate(zip(self.coordinates.lats, self.coordinates.lons)):
+            buckets.setdefault(self._cell(lat, lon), []).append(i)
+        self._buckets: Dict[Tuple[int, int], np.ndarray] = {
+            cell: np.asarray(indices, dtype=np.int64) for cell, indices in buckets.items()
+        }
+
+    def _row(self, lat: float) -> int:
+        return min(self.n_rows - 1, max(0, int(math.floor((lat + 90) / self.cell_size_deg))))
+
+    def _col(self, lon: float) -> int:
+        return int(math.floor((lon + 180) / self.cell_size_deg)) % self.n_cols
+
+    def _cell(self, lat: float, lon: float) -> Tuple[int, int]:
+        return (self._row(lat), self._col(lon))
+
+    def _candidate_cells(self, lat: float, lon: float, radius_km: float) -> List[Tuple[int, int]]:
+        """Cells whose airports may lie within radius_km of (lat, lon)"""
+        angular_radius = radius_km / EARTH_RADIUS_KM
+        dlat = math.degrees(angular_radius)
+        rows = range(self._row(lat - dlat), self._row(lat + dlat) + 1)
+
+        # Longitude half-width of the search cap; the whole parallel when the cap covers a pole
+        ratio = math.sin(min(angular_radius, math.pi / 2)) / max(math.cos(math.radians(lat)), 1e-12)
+        if lat + dlat >= 90 or lat - dlat <= -90 or ratio >= 1:
+            cols = range(self.n_cols)
+        else:
+            dlon = math.degrees(math.asin(ratio))
+            first = int(math.floor((lon - dlon + 180) / self.cell_size_deg))
+            last = int(math.floor((lon + dlon + 180) / self.cell_size_deg))
+            cols = range(self.n_cols) if last - first + 1 >= self.n_cols else [c % self.n_cols for c in range(first, last + 1)]
+
+        return [(row, col) for row in rows for col in cols]
+
+    def nearest(self, lat: float, lon: float, k: int = 3, radius_km: float = 200.0) -> List[Tuple[str, float]]:
+        """
+        Find the k airports closest to (lat, lon) by great-circle distance
+
+        Args:
+            lat, lon: Query point
+            k: Maximum number of airports to return
+            radius_km: Only airports within this great-circle distance are considered
+
+        Returns:
+            List of (airport_code, distance_km) sorted by distance
+        """
+        buckets = [self._buckets[cell] for cell in self._candidate_cells(lat, lon, radius_km) if cell in self._buckets]
+        if not buckets:
+            return []
+        indices = np.concatenate(buckets)
+        distances = self.coordinates.distances_from(lat, lon, indices)
+        within = distances <= radius_km
+        candidates = sorted(
+            (float(distance), self.coordinates.keys[i]) for i, distance in zip(indices[within], distances[within])
+        )
+        return [(code, distance) for distance, code in candidates[:k]]
+
+
+@lru_cache(maxsize=1)
+def get_airport_spatial_index() -> AirportSpatialIndex:
+    """Process-wide spatial index over the IATA airport table"""
+    return AirportSpatialIndex(get_airport_directory().airports)
@@ -0,0 +1,126 @@
+import threading
+import time
+from typing import Dict, Optional
+from utils.http_client import HttpClient, get_http_client
+
+
+class AmadeusTokenManager:
+    """
+    Process-wide cache for the Amadeus OAuth client-credentials token.
+
+    The token is reused until refresh_margin_seconds before its expires_in, and a background
+    timer refreshes it ahead of expiry so requests normally never wait on the token endpoint.
+    For short-lived tokens the margin is capped at a quarter of expires_in, so a token is
+    still served for half its lifetime and refreshes stay spaced out. The timer only refreshes
+    a token that was used since the last fetch; on an idle worker the token lapses and the next
+    caller fetches one.
+    Refreshes are single-flight: concurrent callers that find no valid token wait for the one
+    in-progress fetch instead of each calling the token endpoint.
+    """
+
+    def __init__(self, token_url: str, client_id: str, client_secret: str, http_client: Optional[HttpClient] = None,
+                 refresh_margin_seconds: float = 120, background_refresh: bool = True):
+        self.token_url = token_url
+        self.client_id = client_id
+        self.client_secret = client_secret
+        self.http = http_client or get_http_client()
+        self.refresh_margin_seconds = refresh_margin_seconds
+        self.background_refresh = background_refresh
+        self._token: Optional[str] = None
+        self._expires_at = 0.0
+        self._margin = refresh_margin_seconds
+        self._used_since_refresh = False
+        # _lock guards the token state and is only held briefly; _refresh_lock makes fetches single-flight
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+        self._timer: Optional[threading.Timer] = None
+        self.fetches = 0
+        self.cache_hits = 0
+        self.lapsed = 0
+
+    def _fresh_token(self) -> Optional[str]:
+        """The cached token if it is still served (caller holds _lock)"""
+        if self._token is not None and time.time() < self._expires_at - self._margin:
+            return self._token
+        return None
+
+    def get_token(self) -> str:
+        """Return a valid access token, fetching one only if none is cached"""
+        with self._lock:
+            self._used_since_refresh = True
+            token = self._fresh_token()
+        if token is not None:
+            self.cache_hits += 1
+            return token
+        with self._refresh_lock:
+            # Another thread may have refreshed while we waited for the lock
+            with self._lock:
+                token = self._fresh_token()
+            if token is not None:
+                self.cache_hits += 1
+                return token
+            return self._refresh()
+
+    def invalidate(self):
+        """Drop the cached token (e.g. after a 401) so the next call fetches a new one"""
+        with self._lock:
+            self._token = None
+            self._expires_at = 0.0
+
+    def _refresh(self) -> str:
+        """Fetch a new token (caller holds _refresh_lock)"""
+        data = {
+            "grant_type": "client_credentials",
+            "client_id": self.client_id,
+            "client_secret": self.client_secret
+        }
+        self.fetches += 1
+        response = self.http.post(self.token_url, data=data, retry=True)
+        if response.status_code != 200:
+            raise Exception(f"Failed to get Amadeus access token: {response.text}")
+        payload = response.json()
+        expires_in = float(payload.get("expires_in", 1799))
+        token = payload["access_token"]
+        with self._lock:
+            self._token = token
+            self._expires_at = time.time() + expires_in
+            self._margin = min(self.refresh_margin_seconds, expires_in / 4)
+            self._used_since_refresh = False
+            # Refresh one margin before the token stops being served, so callers never see it stale
+            delay = self._expires_at - 2 * self._margin - time.time()
+        self._schedule_refresh(delay)
+        return token
+
+    def _schedule_refresh(self, delay: float):
+        if not self.background_refresh:
+            return
+        if self._timer is not None:
+            self._timer.cancel()
+        self._timer = threading.Timer(max(delay, 1.0), self._background_refresh)
+        self._timer.daemon = True
+        self._timer.start()
+
+    def _background_refresh(self):
+        try:
+            with self._refresh_lock:
+                with self._lock:
+                    used = self._used_since_refresh
+                if not used:
+                    # Nobody asked for the token since the last fetch: let it lapse
+                    self.lapsed += 1
+                    self._timer = None
+                    return
+                self._refresh()
+        except Exception as e:
+            print(f"Background Amadeus token refresh failed: {e}")
+            # Retry shortly while the current token is still usable
+            if time.time() < self._expires_at:
+                self._schedule_refresh(30)
+
+    def stats(self) -> Dict[str, float]:
+        return {
+            "fetches": self.fetches,
+            "cache_hits": self.cache_hits,
+            "lapsed": self.lapsed,
+            "expires_in": max(0.0, round(self._expires_at - time.time(), 1)),
+        }
@@ -0,0 +1,173 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+
+class TTLCache:
+    """
+    Thread-safe in-memory LRU cache with per-entry expiry and hit/miss counters.
+
+    Values may be None (useful for negative caching), so lookups return a (found, value) pair.
+    """
+
+    def __init__(self, max_entries: int = 1024, ttl_seconds: float = 3600, name: str = "cache"):
+        self.name = name
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def lookup(self, key: Hashable) -> Tuple[bool, Any]:
+        """Return (True, value) for a live entry, otherwise (False, None)"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires_at, value = entry
+                if expires_at > time.time():
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return True, value
+                del self._entries[key]
+            self.misses += 1
+            return False, None
+
+    def peek(self, key: Hashable) -> Tuple[bool, Any]:
+        """Like lookup(), but without touching LRU order or hit/miss counters"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > time.time():
+                return True, entry[1]
+            return False, None
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        found, value = self.lookup(key)
+        return value if found else default
+
+    def set(self, key: Hashable, value: Any, ttl_seconds: Optional[float] = None, expires_at: Optional[float] = None):
+        """Store a value for ttl_seconds (defaults to the cache TTL) or until an absolute expires_at"""
+        if expires_at is None:
+            expires_at = time.time() + (self.ttl_seconds if ttl_seconds is None else ttl_seconds)
+        with self._lock:
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def delete(self, key: Hashable):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> Dict[str, Any]:
+        """Counters for monitoring"""
+        total = self.hits + self.misses
+        return {
+            "name": self.name,
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": round(self.hits / total, 4) if total else 0.0,
+        }
+
+
+class SQLiteCacheStore:
+    """Persistent key/value store in SQLite with per-row expiry; values are stored as JSON"""
+
+    def __init__(self, db_path: str, table: str):
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.db_path = db_path
+        self.table = table
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(db_path, check_same_thread=False)
+        with self._lock, self._connection:
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute(
+                f"CREATE TABLE IF NOT EXISTS {table} (key TEXT PRIMARY KEY, value TEXT, expires_at REAL NOT NULL)"
+            )
+
+    def lookup(self, key: str) -> Tuple[bool, Any, float]:
+        """Return (True, value, expires_at) for a live row, otherwise (False, None, 0)"""
+        with self._lock:
+            row = self._connection.execute(
+                f"SELECT value, expires_at FROM {self.table} WHERE key = ?", (key,)
+            ).fetchone()
+        if row is None or row[1] <= time.time():
+            return False, None, 0.0
+        return True, json.loads(row[0]), row[1]
+
+    def set(self, key: str, value: Any, expires_at: float):
+        self.set_encoded(key, json.dumps(value), expires_at)
+
+    def set_encoded(self, key: str, encoded: str, expires_at: float):
+        """Store a value already serialized with json.dumps"""
+        with self._lock, self._connection:
+            self._connection.execute(
+                f"INSERT OR REPLACE INTO {self.table} (key, value, expires_at) VALUES (?, ?, ?)",
+                (key, encoded, expires_at),
+            )
+
+    def purge_expired(self) -> int:
+        """Delete expired rows and return how many were removed"""
+        with self._lock, self._connection:
+            cursor = self._connection.execute(f"DELETE FROM {self.table} WHERE expires_at <= ?", (time.time(),))
+        return cursor.rowcount
+
+    def count(self) -> int:
+        with self._lock:
+            return self._connection.execute(f"SELECT COUNT(*) FROM {self.table}").fetchone()[0]
+
+
+class PersistentTTLCache:
+    """In-memory TTLCache in front of a SQLiteCacheStore, sharing expiry times between both tiers"""
+
+    def __init__(self, db_path: str, table: str, ttl_seconds: float, max_entries: int = 1024):
+        self.memory = TTLCache(max_entries=max_entries, ttl_seconds=ttl_seconds, name=table)
+        self.store = SQLiteCacheStore(db_path, table)
+        self.ttl_seconds = ttl_seconds
+        self.disk_hits = 0
+
+    def lookup(self, key: str) -> Tuple[bool, Any]:
+        found, value = self.memory.lookup(key)
+        if found:
+            return True, value
+        found, value, expires_at = self.store.lookup(key)
+        if found:
+            self.disk_hits += 1
+            self.memory.set(key, value, expires_at=expires_at)
+        return found, value
+
+    def set(self, key: str, value: Any, ttl_seconds: Optional[float] = None):
+        # Serialize first: a value that cannot be persisted must not be served from memory either
+        encoded = json.dumps(value)
+        expires_at = time.time() + (self.ttl_seconds if ttl_seconds is None else ttl_seconds)
+        self.store.set_encoded(key, encoded, expires_at)
+        self.memory.set(key, value, expires_at=expires_at)
+
+    def stats(self) -> Dict[str, Any]:
+        stats = self.memory.stats()
+        stats["memory_hits"] = stats["hits"]
+        stats["disk_hits"] = self.disk_hits
+        stats["misses"] = self.memory.misses - self.disk_hits
+        stats["hits"] = self.memory.hits + self.disk_hits
+        total = stats["hits"] + stats["misses"]
+        stats["hit_rate"] = round(stats["hits"] / total, 4) if total else 0.0
+        stats["persisted_entries"] = self.store.count()
+        return stats
@@ -1,30 +1,31 @@
 
-import requests
 import os
+from typing import Optional
 from dotenv import load_dotenv
 load_dotenv()
+from functools import lru_cache
+from utils.http_client import HttpClient, get_http_client
+from utils.amadeus_token_manager import AmadeusTokenManager
+from utils.config_loaders import get_config_value
 
 class CarRentalService:
-    def __init__(self):
+    def __init__(self, http_client: Optional[HttpClient] = None, token_manager: Optional[AmadeusTokenManager] = None):
+        self.http = http_client or get_http_client()
         self.amadeus_api_key = os.getenv("AMADEUS_API_KEY", "")
         self.amadeus_api_secret = os.getenv("AMADEUS_API_SECRET", "")
         print(f"AMADEUS_API_KEY: '{self.amadeus_api_key}'")
         print(f"AMADEUS_API_SECRET: '{self.amadeus_api_secret}'")
         self.base_url = "https://test.api.amadeus.com/v1/shopping/transfer-offers"
         self.token_url = "https://test.api.amadeus.com/v1/security/oauth2/token"
-        self.access_token = self._get_access_token()
-        print(f"Access Token: '{self.access_token}'")
+        # Token is fetched lazily and cached across requests
+        self.token_manager = token_manager or AmadeusTokenManager(
+            self.token_url, self.amadeus_api_key, self.amadeus_api_secret, http_client=self.http,
+            refresh_margin_seconds=get_config_value("amadeus", "token_refresh_margin_seconds", default=120)
+        )
 
-    def _get_access_token(self):
-        data = {
-            "grant_type": "client_credentials",
-            "client_id": self.amadeus_api_key,
-            "client_secret": self.amadeus_api_secret
-        }
-        response = requests.post(self.token_url, data=data)
-        if response.status_code != 200:
-            raise Exception(f"Failed to get Amadeus access token: {response.text}")
-        return response.json()["access_token"]
+    @property
+    def access_token(self) -> str:
+        return self.token_manager.get_token()
 
     def search_cars(self, startLocationCode: str, endLocationCode: str, transferType: str, startDateTime: str, duration: str, passengers: int):
         """
@@ -51,7 +52,13 @@ class CarRentalService:
             "duration": duration,
             "passengers": passengers
         }
-        response = requests.post(self.base_url, headers=headers, json=params)
+        # A transfer-offers search has no side effects, so it is safe to resend
+        response = self.http.post(self.base_url, headers=headers, json=params, retry=True)
+        if response.status_code == 401:
+            # Token revoked or expired early: fetch a new one and retry once
+            self.token_manager.invalidate()
+            headers["Authorization"] = f"Bearer {self.access_token}"
+            response = self.http.post(self.base_url, headers=headers, json=params, retry=True)
         print(f"Request URL: {response.url}")
         print(f"Response Status Code: {response.status_code}")
         print(f"Response Body: {response.text}")
@@ -59,3 +66,9 @@ class CarRentalService:
         if response.status_code != 200:
             raise Exception(f"Car rental API call failed: {response.text}")
         return response.json()
+
+
+@lru_cache(maxsize=1)
+def get_car_rental_service() -> CarRentalService:
+    """Long-lived CarRentalService shared by every request (reuses the cached OAuth token)"""
+    return CarRentalService()
@@ -0,0 +1,141 @@
+import asyncio
+import functools
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from typing import Any, Callable, Dict, Optional
+from utils.config_loaders import get_config_value
+
+
+class QueueFullError(Exception):
+    """Raised when too many requests are already waiting for a concurrency slot"""
+
+
+class BlockingExecutor:
+    """Bounded thread pool for sync I/O (HTTP clients, SDKs) that must not run on the event loop"""
+
+    def __init__(self, max_workers: int = 32, thread_name_prefix: str = "blocking-io"):
+        self.max_workers = max_workers
+        self.thread_name_prefix = thread_name_prefix
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+        self.active = 0
+        self.submitted = 0
+
+    @property
+    def executor(self) -> ThreadPoolExecutor:
+        """The thread pool, (re)created on first use and after shutdown()"""
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix=self.thread_name_prefix)
+            return self._executor
+
+    def _track(self, func: Callable, *args, **kwargs) -> Any:
+        with self._lock:
+            self.active += 1
+        try:
+            return func(*args, **kwargs)
+        finally:
+            with self._lock:
+                self.active -= 1
+
+    async def run(self, func: Callable, *args, **kwargs) -> Any:
+        """Run func(*args, **kwargs) on the pool and await its result"""
+        self.submitted += 1
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, functools.partial(self._track, func, *args, **kwargs))
+
+    def submit(self, func: Callable, *args, **kwargs) -> Future:
+        """Run func(*args, **kwargs) on the pool from sync code"""
+        self.submitted += 1
+        return self.executor.submit(self._track, func, *args, **kwargs)
+
+    def shutdown(self, wait: bool = False):
+        """Stop the worker threads (queued work is cancelled); a later call starts a fresh pool"""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait, cancel_futures=True)
+
+    def stats(self) -> Dict[str, int]:
+        return {"max_workers": self.max_workers, "active": self.active, "submitted": self.submitted}
+
+
+class ConcurrencyLimiter:
+    """
+    Caps how many requests run at once; the rest wait in a queue whose depth is reported
+    for monitoring and optionally bounded. Rejected clients are told to retry after
+    retry_after_seconds.
+    """
+
+    def __init__(self, max_concurrent: int = 8, max_queue_depth: Optional[int] = None, retry_after_seconds: int = 5):
+        self.max_concurrent = max_concurrent
+        self.max_queue_depth = max_queue_depth
+        self.retry_after_seconds = retry_after_seconds
+        self._semaphore = asyncio.Semaphore(max_concurrent)
+        self.in_flight = 0
+        self.queue_depth = 0
+        self.max_queue_depth_seen = 0
+        self.completed = 0
+        self.rejected = 0
+
+    def check_capacity(self):
+        """Raise QueueFullError if a request arriving now would be turned away"""
+        if self.max_queue_depth is not None and self._semaphore.locked() and self.queue_depth >= self.max_queue_depth:
+            self.rejected += 1
+            raise QueueFullError(f"Too many queued requests ({self.queue_depth}), try again later")
+
+    @asynccontextmanager
+    async def slot(self):
+        """Wait for a free slot (raises QueueFullError if the wait queue is full)"""
+        self.check_capacity()
+        self.queue_depth += 1
+        self.max_queue_depth_seen = max(self.max_queue_depth_seen, self.queue_depth)
+        try:
+            await self._semaphore.acquire()
+        finally:
+            self.queue_depth -= 1
+        self.in_flight += 1
+        try:
+            yield
+        finally:
+            self.in_flight -= 1
+            self.completed += 1
+            self._semaphore.release()
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "max_concurrent": self.max_concurrent,
+            "in_flight": self.in_flight,
+            "queue_depth": self.queue_depth,
+            "max_queue_depth_seen": self.max_queue_depth_seen,
+            "max_queue_depth": self.max_queue_depth,
+            "completed": self.completed,
+            "rejected": self.rejected,
+        }
+
+
+_server_settings = get_config_value("server", default={}) or {}
+
+# Shared instances used by the FastAPI app
+blocking_executor = BlockingExecutor(max_workers=_server_settings.get("blocking_io_workers", 32))
+query_limiter = ConcurrencyLimiter(
+    max_concurrent=_server_settings.get("max_concurrent_queries", 8),
+    max_queue_depth=_server_settings.get("max_queue_depth", 64),
+    retry_after_seconds=_server_settings.get("retry_after_seconds", 5),
+)
+# Sub-requests fanned out by sync tools (e.g. the four searches of a place overview). Sized so every
+# admitted query can run its fan-out at once; kept apart from blocking_executor, whose threads
+# may be the ones waiting on these results.
+fanout_executor = BlockingExecutor(
+    max_workers=_server_settings.get("fanout_workers", 4 * query_limiter.max_concurrent),
+    thread_name_prefix="fanout",
+)
+# Sync agent tools. A tool call that misses its deadline keeps its thread until it returns, so
+# tools get their own pool instead of starving report enrichment on blocking_executor.
+tool_pool = BlockingExecutor(max_workers=_server_settings.get("tool_workers", 32), thread_name_prefix="agent-tools")
+
+
+async def run_blocking(func: Callable, *args, **kwargs) -> Any:
+    """Run sync code on the shared bounded executor"""
+    return await blocking_executor.run(func, *args, **kwargs)
@@ -1,8 +1,31 @@
 import yaml
 import os
+from functools import lru_cache
 
-def load_config(config_path: str = "config/config.yaml") -> dict:
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+@lru_cache(maxsize=8)
+def _read_config(config_path: str) -> dict:
     with open(config_path, "r") as file:
-        config = yaml.safe_load(file)
-        # print(config)
-    return config
\ No newline at end of file
+        return yaml.safe_load(file)
+
+def load_config(config_path: str = "config/config.yaml") -> dict:
+    """Parsed config, read from disk once per resolved path (treat the returned dict as read-only)"""
+    # Fall back to the project root so the config is found from any working directory
+    if not os.path.isabs(config_path) and not os.path.exists(config_path):
+        config_path = os.path.join(PROJECT_ROOT, config_path)
+    return _read_config(os.path.realpath(config_path))
+
+def reload_config():
+    """Forget the parsed config so the next load_config() reads the file again"""
+    _read_config.cache_clear()
+
+def get_config_value(*keys, default=None):
+    """Return a nested config value (e.g. get_config_value("cache", "geocode")), or default if missing"""
+    try:
+        value = load_config()
+        for key in keys:
+            value = value[key]
+        return value
+    except (FileNotFoundError, KeyError, TypeError):
+        return default
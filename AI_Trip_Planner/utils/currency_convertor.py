@@ -1,16 +1,20 @@
-import requests
+from typing import List, Optional, Sequence
+from utils.exchange_rates import ExchangeRateTable, get_exchange_rate_table
+from utils.http_client import HttpClient
 
 class CurrencyConverter:
-    def __init__(self, api_key: str):
-        self.base_url = f"https://v6.exchangerate-api.com/v6/{api_key}/latest/"
+    def __init__(self, api_key: str, http_client: Optional[HttpClient] = None, rate_table: Optional[ExchangeRateTable] = None):
+        if rate_table is None:
+            # Share the process-wide table unless this converter needs its own key or client
+            shared = get_exchange_rate_table()
+            use_shared = (not api_key or api_key == shared.api_key) and http_client is None
+            rate_table = shared if use_shared else ExchangeRateTable(api_key=api_key, http_client=http_client)
+        self.rate_table = rate_table
     
     def convert(self, amount:float, from_currency:str, to_currency:str):
         """Convert the amount from one currency to another"""
-        url = f"{self.base_url}/{from_currency}"
-        response = requests.get(url)
-        if response.status_code != 200:
-            raise Exception("API call failed:", response.json())
-        rates = response.json()["conversion_rates"]
-        if to_currency not in rates:
-            raise ValueError(f"{to_currency} not found in exchange rates.")
-        return amount * rates[to_currency]
\ No newline at end of file
+        return self.rate_table.convert(amount, from_currency, to_currency)
+
+    def convert_many(self, amounts: Sequence[float], from_currency: str, to_currency: str) -> List[float]:
+        """Convert several amounts from one currency to another"""
+        return self.rate_table.convert_many(amounts, from_currency, to_currency)
@@ -1,6 +1,6 @@
-import requests
+from utils.http_client import HttpClient, get_http_client
 
-def get_driving_distance(api_key, start_coords, end_coords):
+def get_driving_distance(api_key, start_coords, end_coords, http_client: HttpClient = None):
     """
     Returns driving distance in kilometers between two (lat, lon) pairs using OpenRouteService.
     """
@@ -12,7 +12,7 @@ def get_driving_distance(api_key, start_coords, end_coords):
             [end_coords[1], end_coords[0]]
         ]
     }
-    response = requests.post(url, json=body, headers=headers)
+    response = (http_client or get_http_client()).post(url, json=body, headers=headers)
     if response.status_code == 200:
         data = response.json()
         # distance in meters
@@ -0,0 +1,148 @@
+import json
+import os
+import tempfile
+import time
+from functools import lru_cache
+from typing import Dict, List, Optional, Sequence
+from dotenv import load_dotenv
+from utils.config_loaders import get_config_value
+from utils.http_client import HttpClient, get_http_client
+from utils.single_flight import SingleFlight, get_single_flight
+
+EXCHANGE_RATE_API_URL = "https://v6.exchangerate-api.com/v6"
+
+
+class ExchangeRateTable:
+    """
+    One base-currency rate table shared by every currency conversion.
+
+    The table is downloaded at most once per refresh interval, kept in memory and written to
+    disk so a cold start can reuse it. Any cross rate is derived locally from the base table
+    (from -> base -> to), so conversions between arbitrary pairs need no extra requests.
+    When a refresh fails, the previous table keeps being served and the API is not tried again
+    for retry_after_failure_seconds. Concurrent conversions that find the table expired share
+    one refresh.
+    """
+
+    def __init__(self, api_key: Optional[str] = None, base_currency: Optional[str] = None,
+                 refresh_interval_seconds: Optional[float] = None, cache_path: Optional[str] = None,
+                 http_client: Optional[HttpClient] = None, single_flight: Optional[SingleFlight] = None,
+                 retry_after_failure_seconds: Optional[float] = None):
+        load_dotenv()
+        settings = get_config_value("exchange_rates", default={}) or {}
+        directory = get_config_value("cache", "directory", default="cache")
+        self.api_key = api_key or os.environ.get("EXCHANGE_RATE_API_KEY")
+        self.base_currency = (base_currency or settings.get("base_currency", "USD")).upper()
+        self.refresh_interval_seconds = (refresh_interval_seconds if refresh_interval_seconds is not None
+                                         else settings.get("refresh_interval_seconds", 3600))
+        self.retry_after_failure_seconds = (retry_after_failure_seconds if retry_after_failure_seconds is not None
+                                            else settings.get("retry_after_failure_seconds", 300))
+        self.cache_path = cache_path or os.path.join(directory, "exchange_rates.json")
+        self.http = http_client or get_http_client()
+        self._rates: Optional[Dict[str, float]] = None
+        self._fetched_at = 0.0
+        self._next_retry_at = 0.0
+        self.single_flight = single_flight or get_single_flight("exchange_rates")
+        self.fetches = 0
+        self.disk_loads = 0
+        self.stale_serves = 0
+
+    def _is_fresh(self) -> bool:
+        return self._rates is not None and time.time() - self._fetched_at < self.refresh_interval_seconds
+
+    def _backing_off(self) -> bool:
+        """A recent refresh failed: keep serving the stale table instead of calling the API again"""
+        return self._rates is not None and time.time() < self._next_retry_at
+
+    def _load_from_disk(self):
+        try:
+            with open(self.cache_path, "r") as file:
+                snapshot = json.load(file)
+        except (OSError, ValueError):
+            return
+        if snapshot.get("base") == self.base_currency and snapshot.get("rates"):
+            if self._rates is None or snapshot["fetched_at"] > self._fetched_at:
+                self._rates = {code: float(rate) for code, rate in snapshot["rates"].items()}
+                self._fetched_at = float(snapshot["fetched_at"])
+                self.disk_loads += 1
+
+    def _save_to_disk(self):
+        directory = os.path.dirname(self.cache_path) or "."
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".exchange-rates-", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w") as file:
+                json.dump({"base": self.base_currency, "fetched_at": self._fetched_at, "rates": self._rates}, file)
+            os.replace(tmp_path, self.cache_path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    def _fetch(self):
+        self.fetches += 1
+        response = self.http.get(f"{EXCHANGE_RATE_API_URL}/{self.api_key}/latest/{self.base_currency}")
+        if response.status_code != 200:
+            raise Exception("API call failed:", response.json())
+        self._rates = {code: float(rate) for code, rate in response.json()["conversion_rates"].items()}
+        self._fetched_at = time.time()
+        try:
+            self._save_to_disk()
+        except OSError as e:
+            print(f"Could not save exchange rates to {self.cache_path}: {e}")
+
+    def rates(self) -> Dict[str, float]:
+        """Current base-currency table, refreshed when older than the refresh interval"""
+        if self._is_fresh() or self._backing_off():
+            return self._rates
+        return self.single_flight.do((self.cache_path, self.base_currency), self._refresh)
+
+    def _refresh(self) -> Dict[str, float]:
+        if self._is_fresh() or self._backing_off():
+            return self._rates
+        self._load_from_disk()
+        if self._is_fresh():
+            return self._rates
+        try:
+            self._fetch()
+        except Exception as e:
+            if self._rates is None:
+                raise
+            self.stale_serves += 1
+            self._next_retry_at = time.time() + self.retry_after_failure_seconds
+            print(f"Exchange rate refresh failed, using rates from {time.ctime(self._fetched_at)} "
+                  f"for {self.retry_after_failure_seconds:g}s: {e}")
+        return self._rates
+
+    def rate(self, from_currency: str, to_currency: str) -> float:
+        """Units of to_currency per one unit of from_currency"""
+        from_currency, to_currency = from_currency.upper(), to_currency.upper()
+        rates = self.rates()
+        for currency in (from_currency, to_currency):
+            if currency not in rates:
+                raise ValueError(f"{currency} not found in exchange rates.")
+        return rates[to_currency] / rates[from_currency]
+
+    def convert(self, amount: float, from_currency: str, to_currency: str) -> float:
+        return amount * self.rate(from_currency, to_currency)
+
+    def convert_many(self, amounts: Sequence[float], from_currency: str, to_currency: str) -> List[float]:
+        """Convert several amounts with one rate lookup"""
+        rate = self.rate(from_currency, to_currency)
+        return [amount * rate for amount in amounts]
+
+    def stats(self) -> Dict[str, float]:
+        return {
+            "base_currency": self.base_currency,
+            "currencies": len(self._rates or {}),
+            "age_seconds": round(time.time() - self._fetched_at, 1) if self._rates else None,
+            "fetches": self.fetches,
+            "disk_loads": self.disk_loads,
+            "stale_serves": self.stale_serves,
+        }
+
+
+@lru_cache(maxsize=1)
+def get_exchange_rate_table() -> ExchangeRateTable:
+    """Process-wide exchange rate table used by every currency tool"""
+    return ExchangeRateTable()
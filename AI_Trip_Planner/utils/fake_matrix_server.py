@@ -0,0 +1,84 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from utils.geo_distance import ROAD_DISTANCE_FACTOR, coordinate_distance_matrix
+
+# Average speed used for fake durations (same assumption as the travel time estimates)
+AVERAGE_SPEED_KMH = 50
+
+
+class FakeMatrixServer:
+    """
+    Local stand-in for the OpenRouteService /v2/matrix endpoint.
+
+    Distances are straight-line x ROAD_DISTANCE_FACTOR, durations assume AVERAGE_SPEED_KMH.
+    Requests above max_locations are rejected like the real API, and every request body is
+    recorded so tests can assert on how many calls were made.
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, max_locations: int = 50):
+        self.max_locations = max_locations
+        self.requests = []
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+                server.requests.append({"path": self.path, "body": body})
+                status, payload = server.handle_matrix(self.path, body)
+                data = json.dumps(payload).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, format, *args):
+                pass
+
+        self._httpd = ThreadingHTTPServer((host, port), Handler)
+        self._thread = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def handle_matrix(self, path: str, body: dict):
+        if not path.startswith("/v2/matrix/"):
+            return 404, {"error": "not found"}
+        locations = body.get("locations") or []
+        if len(locations) > self.max_locations:
+            return 400, {"error": f"Request exceeds {self.max_locations} locations"}
+        sources = body.get("sources") or list(range(len(locations)))
+        destinations = body.get("destinations") or list(range(len(locations)))
+        origin_coords = [(locations[i][1], locations[i][0]) for i in sources]
+        destination_coords = [(locations[i][1], locations[i][0]) for i in destinations]
+        distances = coordinate_distance_matrix(origin_coords, destination_coords) * ROAD_DISTANCE_FACTOR
+        durations = distances / AVERAGE_SPEED_KMH * 3600
+        return 200, {"distances": distances.round(2).tolist(), "durations": durations.round(1).tolist()}
+
+    def start(self) -> "FakeMatrixServer":
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def __enter__(self) -> "FakeMatrixServer":
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+if __name__ == "__main__":
+    # Usage: python -m utils.fake_matrix_server  (then set ORS_BASE_URL to the printed URL)
+    fake = FakeMatrixServer(port=8090)
+    print(f"Fake ORS matrix server listening on {fake.base_url}")
+    try:
+        fake._httpd.serve_forever()
+    except KeyboardInterrupt:
+        fake.stop()
@@ -0,0 +1,95 @@
+import numpy as np
+from typing import Iterable, List, Sequence, Tuple
+
+EARTH_RADIUS_KM = 6371.0
+# Straight-line distances are scaled by this factor to approximate road distance
+ROAD_DISTANCE_FACTOR = 1.2
+
+
+def _as_radians(values) -> np.ndarray:
+    return np.radians(np.ascontiguousarray(values, dtype=np.float64))
+
+
+def haversine_distance(coord1: Tuple[float, float], coord2: Tuple[float, float]) -> float:
+    """Great-circle distance in kilometers between two (lat, lon) points"""
+    return float(haversine_one_to_many(coord1[0], coord1[1], [coord2[0]], [coord2[1]])[0])
+
+
+def haversine_one_to_many(lat: float, lon: float, lats, lons) -> np.ndarray:
+    """
+    Great-circle distances in kilometers from one point to many points in a single vectorized pass
+
+    Args:
+        lat, lon: Origin in degrees
+        lats, lons: Destination latitudes/longitudes in degrees (array-like, same length)
+
+    Returns:
+        np.ndarray: float64 distances, one per destination
+    """
+    return _haversine(np.radians(lat), np.radians(lon), _as_radians(lats), _as_radians(lons))
+
+
+def haversine_matrix(lats1, lons1, lats2, lons2) -> np.ndarray:
+    """
+    N x M great-circle distance matrix in kilometers
+
+    Args:
+        lats1, lons1: N origin coordinates in degrees
+        lats2, lons2: M destination coordinates in degrees
+
+    Returns:
+        np.ndarray: float64 matrix where [i, j] is the distance from origin i to destination j
+    """
+    lat1 = _as_radians(lats1)[:, np.newaxis]
+    lon1 = _as_radians(lons1)[:, np.newaxis]
+    return _haversine(lat1, lon1, _as_radians(lats2)[np.newaxis, :], _as_radians(lons2)[np.newaxis, :])
+
+
+def _haversine(lat1, lon1, lat2, lon2) -> np.ndarray:
+    """Haversine on radians with numpy broadcasting"""
+    a = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+
+
+def coordinate_distance_matrix(coords1: Sequence[Tuple[float, float]], coords2: Sequence[Tuple[float, float]]) -> np.ndarray:
+    """N x M great-circle matrix for lists of (lat, lon) tuples"""
+    origins = np.asarray(coords1, dtype=np.float64).reshape(-1, 2)
+    destinations = np.asarray(coords2, dtype=np.float64).reshape(-1, 2)
+    return haversine_matrix(origins[:, 0], origins[:, 1], destinations[:, 0], destinations[:, 1])
+
+
+class CoordinateArrays:
+    """Point coordinates kept as contiguous float64 arrays alongside their keys"""
+
+    def __init__(self, keys: Iterable[str], lats, lons):
+        self.keys: List[str] = list(keys)
+        self.lats = np.ascontiguousarray(lats, dtype=np.float64)
+        self.lons = np.ascontiguousarray(lons, dtype=np.float64)
+
+    @classmethod
+    def from_airports(cls, airports_data: dict) -> "CoordinateArrays":
+        """Build from an airportsdata-style {code: {"lat": ..., "lon": ...}} mapping"""
+        if hasattr(airports_data, "coordinate_arrays"):
+            # Memory-mapped AirportDataset: reuse its coordinate columns without copying
+            return airports_data.coordinate_arrays()
+        keys, lats, lons = [], [], []
+        for code, info in airports_data.items():
+            if info.get('lat') is None or info.get('lon') is None:
+                continue
+            keys.append(code)
+            lats.append(float(info['lat']))
+            lons.append(float(info['lon']))
+        return cls(keys, lats, lons)
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def distances_from(self, lat: float, lon: float, indices=None) -> np.ndarray:
+        """Distances from (lat, lon) to every point (or to the points at `indices`)"""
+        if indices is None:
+            return haversine_one_to_many(lat, lon, self.lats, self.lons)
+        return haversine_one_to_many(lat, lon, self.lats[indices], self.lons[indices])
+
+    def distance_matrix(self, lats, lons) -> np.ndarray:
+        """len(lats) x len(self) distance matrix from the given origins to every point"""
+        return haversine_matrix(lats, lons, self.lats, self.lons)
@@ -0,0 +1,120 @@
+import os
+import re
+import sys
+from functools import lru_cache
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+from utils.cache import PersistentTTLCache
+from utils.config_loaders import get_config_value
+from utils.single_flight import SingleFlight, get_single_flight
+
+# Destinations preloaded by the warm-up command
+POPULAR_DESTINATIONS = [
+    "London", "Paris", "New York", "Tokyo", "Dubai", "Singapore", "Bangkok", "Rome",
+    "Barcelona", "Istanbul", "Sydney", "Bali", "Goa", "Delhi", "Mumbai", "Kolkata",
+    "Jaipur", "Bangalore", "Amsterdam", "Los Angeles",
+]
+
+
+class GeocodeCache:
+    """
+    Shared cache for geocoding results keyed by normalized address text.
+
+    An in-memory LRU sits in front of an on-disk SQLite store. Addresses that the geocoder
+    could not resolve are cached too (with a shorter TTL) so they are not retried on every call.
+    Concurrent misses for the same address share one geocoder request.
+    """
+
+    def __init__(self, db_path: Optional[str] = None, ttl_seconds: Optional[float] = None,
+                 negative_ttl_seconds: Optional[float] = None, max_entries: Optional[int] = None,
+                 single_flight: Optional[SingleFlight] = None):
+        settings = get_config_value("cache", "geocode", default={}) or {}
+        directory = get_config_value("cache", "directory", default="cache")
+        self.ttl_seconds = ttl_seconds if ttl_seconds is not None else settings.get("ttl_seconds", 30 * 24 * 3600)
+        self.negative_ttl_seconds = (negative_ttl_seconds if negative_ttl_seconds is not None
+                                     else settings.get("negative_ttl_seconds", 24 * 3600))
+        self.cache = PersistentTTLCache(
+            db_path=db_path or os.path.join(directory, "geocode.sqlite3"),
+            table="geocode",
+            ttl_seconds=self.ttl_seconds,
+            max_entries=max_entries or settings.get("max_entries", 10000),
+        )
+        self.single_flight = single_flight or get_single_flight("geocode")
+        self.negative_hits = 0
+
+    @staticmethod
+    def normalize(address: str) -> str:
+        """Lowercase, collapse whitespace and trim punctuation so trivially different strings share an entry"""
+        return re.sub(r"\s+", " ", address.lower()).strip(" ,.;")
+
+    def get_or_fetch(self, address: str, fetch: Callable[[], Optional[Tuple[float, float]]]) -> Optional[Tuple[float, float]]:
+        """
+        Return cached (lat, lon) for the address, calling fetch() on a miss.
+
+        fetch() should return None when the geocoder has no result (cached as a negative entry)
+        and raise on transient failures (not cached).
+        """
+        key = self.normalize(address)
+        found, value = self.cache.lookup(key)
+        if found:
+            if value is None:
+                self.negative_hits += 1
+                return None
+            return (value[0], value[1])
+
+        return self.single_flight.do(key, lambda: self._fetch_and_store(key, fetch))
+
+    def _fetch_and_store(self, key: str, fetch: Callable[[], Optional[Tuple[float, float]]]) -> Optional[Tuple[float, float]]:
+        coords = fetch()
+        if coords is None:
+            self.cache.set(key, None, ttl_seconds=self.negative_ttl_seconds)
+            return None
+        coords = (float(coords[0]), float(coords[1]))
+        self.cache.set(key, list(coords))
+        return coords
+
+    def stats(self) -> Dict[str, float]:
+        stats = self.cache.stats()
+        stats["negative_hits"] = self.negative_hits
+        return stats
+
+    def warm_up(self, geocode: Callable[[str], Optional[Tuple[float, float]]], addresses: Iterable[str]) -> List[str]:
+        """Geocode each address through the cache and return the ones that could not be resolved"""
+        unresolved = []
+        for address in addresses:
+            if geocode(address) is None:
+                unresolved.append(address)
+        return unresolved
+
+
+@lru_cache(maxsize=1)
+def get_geocode_cache() -> GeocodeCache:
+    """Process-wide geocode cache shared by every geocoder"""
+    return GeocodeCache()
+
+
+def warm_up_popular_destinations(destinations: Iterable[str] = POPULAR_DESTINATIONS) -> Dict[str, object]:
+    """Preload the address variants /query geocodes for each destination; returns unresolved addresses and cache stats"""
+    from utils.airport_distance_calculator import AirportDistanceCalculator
+
+    calculator = AirportDistanceCalculator()
+    addresses = []
+    for destination in destinations:
+        addresses.extend([
+            destination,
+            f"{destination} city center",
+            f"downtown {destination}",
+            f"main tourist area {destination}",
+        ])
+    unresolved = calculator.geocode_cache.warm_up(calculator.get_coordinates_from_address, addresses)
+    return {"unresolved": unresolved, "stats": calculator.geocode_cache.stats()}
+
+
+if __name__ == "__main__":
+    # Usage: python -m utils.geocode_cache warm [destination ...]
+    if len(sys.argv) < 2 or sys.argv[1] != "warm":
+        print("Usage: python -m utils.geocode_cache warm [destination ...]")
+        sys.exit(1)
+    result = warm_up_popular_destinations(sys.argv[2:] or POPULAR_DESTINATIONS)
+    print(f"Geocode cache stats: {result['stats']}")
+    if result["unresolved"]:
+        print(f"Could not resolve: {', '.join(result['unresolved'])}")
@@ -0,0 +1,115 @@
+import threading
+import time
+import httpx
+from functools import lru_cache
+from typing import Any, Dict, Optional
+from utils.config_loaders import get_config_value
+
+# Status codes worth retrying: rate limiting and transient upstream failures
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+# Methods that are safe to send twice; others are only retried if the caller opts in
+IDEMPOTENT_METHODS = {"GET", "HEAD", "OPTIONS", "PUT", "DELETE"}
+# Errors raised before the request reached the server, so any method can be resent
+NOT_SENT_ERRORS = (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout)
+
+try:
+    import h2  # noqa: F401  (enables HTTP/2 in httpx)
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+
+class HttpClient:
+    """
+    Shared HTTP client for every external API.
+
+    Wraps a long-lived httpx client so TCP/TLS connections are pooled per host and kept alive
+    between tool calls, with uniform timeouts and retry-with-backoff on connection errors,
+    timeouts and retryable status codes. Only idempotent methods are retried by default: a
+    POST is resent only when it never reached the server, unless the caller passes
+    retry=True. HTTP/2 is used when the h2 package is installed.
+    """
+
+    def __init__(self, timeout_seconds: Optional[float] = None, connect_timeout_seconds: Optional[float] = None,
+                 max_connections: Optional[int] = None, max_keepalive_connections: Optional[int] = None,
+                 keepalive_expiry_seconds: Optional[float] = None, retries: Optional[int] = None,
+                 backoff_seconds: Optional[float] = None, http2: Optional[bool] = None):
+        settings = get_config_value("http", default={}) or {}
+
+        def setting(value, key, default):
+            return value if value is not None else settings.get(key, default)
+
+        self.timeout = httpx.Timeout(
+            setting(timeout_seconds, "timeout_seconds", 20.0),
+            connect=setting(connect_timeout_seconds, "connect_timeout_seconds", 5.0),
+        )
+        self.limits = httpx.Limits(
+            max_connections=setting(max_connections, "max_connections", 100),
+            max_keepalive_connections=setting(max_keepalive_connections, "max_keepalive_connections", 20),
+            keepalive_expiry=setting(keepalive_expiry_seconds, "keepalive_expiry_seconds", 30.0),
+        )
+        self.retries = setting(retries, "retries", 2)
+        self.backoff_seconds = setting(backoff_seconds, "backoff_seconds", 0.5)
+        self.http2 = setting(http2, "http2", True) and HTTP2_AVAILABLE
+
+        self._client: Optional[httpx.Client] = None
+        self._lock = threading.Lock()
+        self.requests_sent = 0
+        self.retried = 0
+
+    @property
+    def client(self) -> httpx.Client:
+        if self._client is None:
+            with self._lock:
+                if self._client is None:
+                    self._client = httpx.Client(timeout=self.timeout, limits=self.limits, http2=self.http2)
+        return self._client
+
+    def _backoff(self, attempt: int, response: Optional[httpx.Response]) -> float:
+        retry_after = response.headers.get("Retry-After") if response is not None else None
+        if retry_after and retry_after.isdigit():
+            return min(float(retry_after), 30.0)
+        return self.backoff_seconds * (2 ** attempt)
+
+    def request(self, method: str, url: str, retry: Optional[bool] = None, **kwargs) -> httpx.Response:
+        """
+        Send a request, retrying connection errors, timeouts and retryable status codes
+
+        Args:
+            retry: Allow resending after the server may have received the request (defaults to
+                True for idempotent methods); errors before sending are always retried
+        """
+        if retry is None:
+            retry = method.upper() in IDEMPOTENT_METHODS
+        for attempt in range(self.retries + 1):
+            response = None
+            try:
+                self.requests_sent += 1
+                response = self.client.request(method, url, **kwargs)
+                if not retry or response.status_code not in RETRY_STATUS_CODES or attempt == self.retries:
+                    return response
+            except (httpx.TransportError, httpx.TimeoutException) as e:
+                if attempt == self.retries or not (retry or isinstance(e, NOT_SENT_ERRORS)):
+                    raise
+            self.retried += 1
+            time.sleep(self._backoff(attempt, response))
+
+    def get(self, url: str, **kwargs) -> httpx.Response:
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url: str, **kwargs) -> httpx.Response:
+        return self.request("POST", url, **kwargs)
+
+    def close(self):
+        if self._client is not None:
+            self._client.close()
+            self._client = None
+
+    def stats(self) -> Dict[str, Any]:
+        return {"requests_sent": self.requests_sent, "retried": self.retried, "http2": self.http2}
+
+
+@lru_cache(maxsize=1)
+def get_http_client() -> HttpClient:
+    """Process-wide HTTP client injected into every service class by default"""
+    return HttpClient()
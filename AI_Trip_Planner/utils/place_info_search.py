@@ -1,49 +1,65 @@
-
+from functools import lru_cache
+from typing import Any, Optional
 from langchain_tavily import TavilySearch
+from utils.place_search_cache import PlaceSearchCache, get_place_search_cache
+
+# Search query per category
+QUERY_TEMPLATES = {
+    "attractions": "top attractive places in and around {place}",
+    "restaurants": "what are the top 10 restaurants and eateries in and around {place}.",
+    "activities": "activities in and around {place}",
+    "transportation": "What are the different modes of transportations available in {place}",
+}
+
 
+@lru_cache(maxsize=1)
+def get_tavily_client() -> TavilySearch:
+    """Process-wide TavilySearch client, created on first use (it needs TAVILY_API_KEY)"""
+    return TavilySearch(topic="general", include_answer="advanced")
 
 
 class TavilyPlaceSearchTool:
-    def __init__(self):
-        pass
+    def __init__(self, client: Optional[TavilySearch] = None, cache: Optional[PlaceSearchCache] = None):
+        self._client = client
+        self.cache = cache or get_place_search_cache()
+
+    @property
+    def client(self) -> TavilySearch:
+        return self._client or get_tavily_client()
+
+    def _search(self, category: str, place: str) -> Any:
+        """Run the category's Tavily query for a place, through the place search cache"""
+        def fetch():
+            result = self.client.invoke({"query": QUERY_TEMPLATES[category].format(place=place)})
+            # TavilySearch reports API failures as {"error": exception} instead of raising
+            if isinstance(result, dict) and "error" in result:
+                error = result["error"]
+                raise error if isinstance(error, Exception) else RuntimeError(f"Tavily search failed: {error}")
+            if isinstance(result, dict) and result.get("answer"):
+                return result["answer"]
+            return result
+        return self.cache.get_or_fetch(category, place, fetch)
 
     def tavily_search_attractions(self, place: str) -> dict:
         """
         Searches for attractions in the specified place using TavilySearch.
         """
-        tavily_tool = TavilySearch(topic="general", include_answer="advanced")
-        result = tavily_tool.invoke({"query": f"top attractive places in and around {place}"})
-        if isinstance(result, dict) and result.get("answer"):
-            return result["answer"]
-        return result
+        return self._search("attractions", place)
     
     def tavily_search_restaurants(self, place: str) -> dict:
         """
         Searches for available restaurants in the specified place using TavilySearch.
         """
-        tavily_tool = TavilySearch(topic="general", include_answer="advanced")
-        result = tavily_tool.invoke({"query": f"what are the top 10 restaurants and eateries in and around {place}."})
-        if isinstance(result, dict) and result.get("answer"):
-            return result["answer"]
-        return result
+        return self._search("restaurants", place)
     
     def tavily_search_activity(self, place: str) -> dict:
         """
         Searches for popular activities in the specified place using TavilySearch.
         """
-        tavily_tool = TavilySearch(topic="general", include_answer="advanced")
-        result = tavily_tool.invoke({"query": f"activities in and around {place}"})
-        if isinstance(result, dict) and result.get("answer"):
-            return result["answer"]
-        return result
+        return self._search("activities", place)
 
     def tavily_search_transportation(self, place: str) -> dict:
         """
         Searches for available modes of transportation in the specified place using TavilySearch.
         """
-        tavily_tool = TavilySearch(topic="general", include_answer="advanced")
-        result = tavily_tool.invoke({"query": f"What are the different modes of transportations available in {place}"})
-        if isinstance(result, dict) and result.get("answer"):
-            return result["answer"]
-        return result
-    
\ No newline at end of file
+        return self._search("transportation", place)
@@ -0,0 +1,77 @@
+import os
+import re
+from functools import lru_cache
+from typing import Any, Callable, Dict, Optional
+from utils.cache import PersistentTTLCache
+from utils.config_loaders import get_config_value
+from utils.single_flight import SingleFlight, get_single_flight
+
+# Default lifetime per search category: attractions rarely change, restaurants more often
+CATEGORY_TTL_SECONDS = {
+    "attractions": 14 * 24 * 3600,
+    "activities": 7 * 24 * 3600,
+    "transportation": 14 * 24 * 3600,
+    "restaurants": 2 * 24 * 3600,
+}
+
+
+class PlaceSearchCache:
+    """
+    Shared cache for Tavily place searches keyed by (category, normalized place).
+
+    Each category has its own TTL. Like the geocode cache, an in-memory LRU sits in front of
+    an on-disk SQLite store so results survive restarts and are shared between workers.
+    Concurrent misses for the same entry share one Tavily request.
+    """
+
+    def __init__(self, db_path: Optional[str] = None, category_ttl_seconds: Optional[Dict[str, float]] = None,
+                 max_entries: Optional[int] = None, single_flight: Optional[SingleFlight] = None):
+        settings = get_config_value("cache", "places", default={}) or {}
+        directory = get_config_value("cache", "directory", default="cache")
+        self.category_ttl_seconds = dict(CATEGORY_TTL_SECONDS)
+        self.category_ttl_seconds.update(settings.get("ttl_seconds", {}) or {})
+        self.category_ttl_seconds.update(category_ttl_seconds or {})
+        self.default_ttl_seconds = min(self.category_ttl_seconds.values())
+        self.cache = PersistentTTLCache(
+            db_path=db_path or os.path.join(directory, "places.sqlite3"),
+            table="places",
+            ttl_seconds=self.default_ttl_seconds,
+            max_entries=max_entries or settings.get("max_entries", 5000),
+        )
+        self.single_flight = single_flight or get_single_flight("tavily")
+        self.category_hits: Dict[str, int] = {category: 0 for category in self.category_ttl_seconds}
+        self.category_misses: Dict[str, int] = {category: 0 for category in self.category_ttl_seconds}
+
+    @staticmethod
+    def normalize(place: str) -> str:
+        """Lowercase, collapse whitespace and trim punctuation so trivially different names share an entry"""
+        return re.sub(r"\s+", " ", place.lower()).strip(" ,.;")
+
+    def get_or_fetch(self, category: str, place: str, fetch: Callable[[], Any]) -> Any:
+        """Return the cached result for (category, place), calling fetch() on a miss; errors are not cached"""
+        key = f"{category}|{self.normalize(place)}"
+        found, value = self.cache.lookup(key)
+        if found:
+            self.category_hits[category] = self.category_hits.get(category, 0) + 1
+            return value
+        self.category_misses[category] = self.category_misses.get(category, 0) + 1
+
+        def fetch_and_store():
+            value = fetch()
+            self.cache.set(key, value, ttl_seconds=self.category_ttl_seconds.get(category, self.default_ttl_seconds))
+            return value
+        return self.single_flight.do(key, fetch_and_store)
+
+    def stats(self) -> Dict[str, Any]:
+        stats = self.cache.stats()
+        stats["categories"] = {
+            category: {"hits": self.category_hits.get(category, 0), "misses": self.category_misses.get(category, 0)}
+            for category in self.category_ttl_seconds
+        }
+        return stats
+
+
+@lru_cache(maxsize=1)
+def get_place_search_cache() -> PlaceSearchCache:
+    """Process-wide place search cache"""
+    return PlaceSearchCache()
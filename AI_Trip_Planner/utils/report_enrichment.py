@@ -0,0 +1,142 @@
+import asyncio
+import time
+from typing import Any, Callable, Dict, List, Optional
+from utils.concurrency import run_blocking
+from utils.config_loaders import get_config_value
+
+
+class EnrichmentTask:
+    """One independent blocking lookup that feeds a section of the travel report"""
+
+    def __init__(self, name: str, section: str, func: Callable, *args, deadline_seconds: Optional[float] = None):
+        self.name = name
+        self.section = section
+        self.func = func
+        self.args = args
+        self.deadline_seconds = deadline_seconds
+        self.elapsed = 0.0
+
+
+class EnrichmentResult:
+    """Values of the lookups that finished in time, and why the others did not"""
+
+    def __init__(self):
+        self.values: Dict[str, Any] = {}
+        self.errors: Dict[str, str] = {}
+        self.timings: Dict[str, float] = {}
+        self._sections: Dict[str, str] = {}
+
+    def ok(self, name: str) -> bool:
+        return name in self.values
+
+    def get(self, name: str, default: Any = None) -> Any:
+        return self.values.get(name, default)
+
+    @property
+    def degraded_sections(self) -> List[str]:
+        """Report sections with at least one lookup that failed or missed its deadline"""
+        sections = []
+        for name in self.errors:
+            if self._sections[name] not in sections:
+                sections.append(self._sections[name])
+        return sections
+
+
+class EnrichmentMetrics:
+    """Process-wide outcome counters for enrichment lookups"""
+
+    def __init__(self):
+        self.completed = 0
+        self.timed_out = 0
+        self.failed = 0
+        self.cancelled = 0
+        self.ready_before_collect = 0
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "completed": self.completed,
+            "timed_out": self.timed_out,
+            "failed": self.failed,
+            "cancelled": self.cancelled,
+            "ready_before_collect": self.ready_before_collect,
+        }
+
+
+enrichment_metrics = EnrichmentMetrics()
+
+
+class EnrichmentPipeline:
+    """
+    Runs the report lookups (car rentals, distances, nearest airports) concurrently.
+
+    Each task runs on the shared blocking executor, so the stage takes as long as its slowest
+    lookup instead of the sum of all of them. The lookups only depend on the request, so they
+    can be started speculatively before the agent run and joined afterwards. Per-task deadlines
+    count from collect(), so time spent overlapping the agent run is never held against a lookup.
+    A task that fails or times out only degrades its own section. A timed-out worker thread
+    cannot be interrupted; its late result is discarded.
+    """
+
+    def __init__(self, tasks: List[EnrichmentTask], default_deadline_seconds: Optional[float] = None):
+        settings = get_config_value("enrichment", default={}) or {}
+        self.tasks = tasks
+        self.deadlines: Dict[str, float] = settings.get("deadlines", {}) or {}
+        self.default_deadline_seconds = (default_deadline_seconds if default_deadline_seconds is not None
+                                         else settings.get("default_deadline_seconds", 8.0))
+        self._running: Optional[Dict[str, asyncio.Task]] = None
+
+    def deadline_for(self, task: EnrichmentTask) -> float:
+        if task.deadline_seconds is not None:
+            return task.deadline_seconds
+        return self.deadlines.get(task.name.split(":")[0], self.default_deadline_seconds)
+
+    async def _run_task(self, task: EnrichmentTask) -> Any:
+        started = time.perf_counter()
+        try:
+            return await run_blocking(task.func, *task.args)
+        finally:
+            task.elapsed = time.perf_counter() - started
+
+    async def _await_task(self, task: EnrichmentTask) -> Any:
+        running = self._running[task.name]
+        try:
+            return await asyncio.wait_for(asyncio.shield(running), timeout=self.deadline_for(task))
+        except asyncio.TimeoutError:
+            running.cancel()
+            raise
+
+    def start(self):
+        """Launch every task (idempotent); results are gathered by collect()"""
+        if self._running is None:
+            self._running = {task.name: asyncio.create_task(self._run_task(task)) for task in self.tasks}
+
+    def cancel(self):
+        """Abandon started tasks (e.g. when the agent run fails before collect())"""
+        for running in (self._running or {}).values():
+            if not running.done():
+                running.cancel()
+                enrichment_metrics.cancelled += 1
+            elif not running.cancelled():
+                running.exception()  # mark retrieved so asyncio does not log it
+
+    async def collect(self) -> EnrichmentResult:
+        """Wait for every task to finish or hit its deadline"""
+        self.start()
+        enrichment_metrics.ready_before_collect += sum(running.done() for running in self._running.values())
+        outcomes = await asyncio.gather(*(self._await_task(task) for task in self.tasks), return_exceptions=True)
+        result = EnrichmentResult()
+        for task, outcome in zip(self.tasks, outcomes):
+            result._sections[task.name] = task.section
+            result.timings[task.name] = round(task.elapsed, 3)
+            if isinstance(outcome, asyncio.TimeoutError):
+                enrichment_metrics.timed_out += 1
+                result.errors[task.name] = f"timed out after {self.deadline_for(task)}s"
+            elif isinstance(outcome, BaseException):
+                enrichment_metrics.failed += 1
+                result.errors[task.name] = str(outcome) or type(outcome).__name__
+            else:
+                enrichment_metrics.completed += 1
+                result.values[task.name] = outcome
+        if result.errors:
+            print(f"Degraded report sections {result.degraded_sections}: {result.errors}")
+        return result
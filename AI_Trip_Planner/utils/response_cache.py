@@ -0,0 +1,229 @@
+import hashlib
+import re
+import threading
+import zlib
+import numpy as np
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple
+from utils.cache import TTLCache
+from utils.config_loaders import get_config_value
+
+# Filler words that do not change what trip is being asked for
+STOPWORDS = {
+    "a", "an", "the", "to", "for", "in", "of", "on", "at", "and", "with", "me", "my", "i", "we", "us", "our",
+    "please", "plan", "planning", "make", "create", "give", "want", "would", "like", "can", "could", "you",
+    "help", "need", "some", "itinerary",
+}
+NUMBER_WORDS = {
+    "one": "1", "two": "2", "three": "3", "four": "4", "five": "5", "six": "6", "seven": "7",
+    "eight": "8", "nine": "9", "ten": "10", "fortnight": "14", "week": "7",
+}
+
+
+# Words that introduce the origin, destination or a stop ("from Delhi to Mumbai via Pune")
+ROUTE_MARKERS = ("from", "to", "via")
+# Verbs that can sit between a route marker and the place ("want to visit Goa")
+ROUTE_VERBS = {"go", "visit", "travel", "see", "explore", "fly", "drive", "get"}
+
+# (number bindings, route slots) for one query; see request_facts()
+RequestFacts = Tuple[Tuple[Tuple[str, str], ...], Dict[str, Tuple[str, ...]]]
+
+
+def fold_token(token: str) -> str:
+    """Number words as digits, simple plurals folded ("days" -> "day", "beaches" -> "beach", "paris" kept)"""
+    token = NUMBER_WORDS.get(token, token)
+    if len(token) > 4 and token.endswith(("ches", "shes", "xes")):
+        return token[:-2]
+    if len(token) > 3 and token.endswith("s") and not token.endswith(("is", "us", "ss")):
+        return token[:-1]
+    return token
+
+
+def _words(query: str) -> List[str]:
+    return re.findall(r"[a-z0-9']+", re.sub(r"(\d+)", r" \1 ", (query or "").lower()))
+
+
+def query_tokens(query: str) -> List[str]:
+    """Lowercased content words with number words as digits and simple plurals folded"""
+    return [token for token in (fold_token(word) for word in _words(query)) if token not in STOPWORDS]
+
+
+def normalize_query(query: str) -> str:
+    """Exact-key form: case and whitespace folded, word order kept ("Delhi to Mumbai" != "Mumbai to Delhi")"""
+    return " ".join((query or "").lower().split())
+
+
+def number_bindings(tokens: List[str]) -> Tuple[Tuple[str, str], ...]:
+    """Each number with the word it counts, in order: "3 day trip, 2 kids" -> (("3", "day"), ("2", "kid"))"""
+    bindings = []
+    for i, token in enumerate(tokens):
+        if token.isdigit():
+            following = next((word for word in tokens[i + 1:] if not word.isdigit()), "")
+            bindings.append((token, following))
+    return tuple(bindings)
+
+
+def route_slots(query: str) -> Dict[str, Tuple[str, ...]]:
+    """Places named after each route marker: "from Delhi to Mumbai" -> {"from": ("delhi",), "to": ("mumbai",)}"""
+    words = _words(query)
+    slots: Dict[str, Tuple[str, ...]] = {}
+    for i, word in enumerate(words):
+        if word not in ROUTE_MARKERS:
+            continue
+        place = next((fold_token(w) for w in words[i + 1:]
+                      if w not in STOPWORDS and w not in ROUTE_VERBS and w not in ROUTE_MARKERS), None)
+        if place is not None:
+            slots[word] = slots.get(word, ()) + (place,)
+    return slots
+
+
+def request_facts(query: str) -> RequestFacts:
+    """What a cached plan must agree on with a new query: number bindings and route slots"""
+    return number_bindings(query_tokens(query)), route_slots(query)
+
+
+def same_request(stored: RequestFacts, query: RequestFacts) -> bool:
+    """
+    True when two queries' request_facts() can share a cached plan: the same numbers bound to
+    the same words, and the same places in every route slot both name. Other word order is free,
+    so "5 day trip to Goa" answers "Plan a 5-day Goa trip", but "from Delhi to Mumbai" never
+    answers "from Mumbai to Delhi" and "3 day, 2 kids" never answers "2 day, 3 kids".
+    """
+    stored_bindings, stored_slots = stored
+    bindings, slots = query
+    if stored_bindings != bindings:
+        return False
+    return all(stored_slots[marker] == slots[marker] for marker in stored_slots.keys() & slots.keys())
+
+
+class HashedNgramEmbedder:
+    """
+    Local text embedding: word unigrams and character trigrams hashed into a fixed-size,
+    L2-normalized vector (no model download, no network).
+    """
+
+    def __init__(self, dimensions: int = 1024):
+        self.dimensions = dimensions
+
+    def _features(self, tokens: List[str]) -> List[str]:
+        features = [f"w:{token}" for token in tokens]
+        for token in tokens:
+            padded = f"#{token}#"
+            features.extend(f"c:{padded[i:i + 3]}" for i in range(len(padded) - 2))
+        return features
+
+    def embed(self, query: str) -> np.ndarray:
+        vector = np.zeros(self.dimensions, dtype=np.float32)
+        for feature in self._features(sorted(set(query_tokens(query)))):
+            digest = zlib.crc32(feature.encode("utf-8"))
+            vector[digest % self.dimensions] += 1.0 if digest & 0x80000000 else -1.0
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+
+class ResponseCache:
+    """
+    Cache of complete trip-plan responses in front of the agent graph.
+
+    Entries are keyed on the query text (case and whitespace folded, word order kept) plus
+    budget preference and location fields. When the exact key misses, an optional similarity
+    lookup compares hashed n-gram embeddings of queries with the same budget and locations.
+    Every hit, exact or similar, must also pass same_request(), so "5 day" never answers
+    "7 day" and "from Delhi to Mumbai" never answers "from Mumbai to Delhi".
+    """
+
+    def __init__(self, ttl_seconds: Optional[float] = None, max_entries: Optional[int] = None,
+                 semantic: Optional[bool] = None, similarity_threshold: Optional[float] = None,
+                 dimensions: Optional[int] = None):
+        settings = get_config_value("response_cache", default={}) or {}
+        self.enabled = settings.get("enabled", True)
+        self.semantic = semantic if semantic is not None else settings.get("semantic", True)
+        self.similarity_threshold = (similarity_threshold if similarity_threshold is not None
+                                     else settings.get("similarity_threshold", 0.9))
+        self.cache = TTLCache(
+            max_entries=max_entries or settings.get("max_entries", 1000),
+            ttl_seconds=ttl_seconds if ttl_seconds is not None else settings.get("ttl_seconds", 6 * 3600),
+            name="responses",
+        )
+        self.embedder = HashedNgramEmbedder(dimensions or settings.get("dimensions", 1024))
+        # partition -> (entry keys, entry request facts, embedding matrix)
+        self._index: Dict[str, Tuple[List[str], List[RequestFacts], np.ndarray]] = {}
+        self._lock = threading.Lock()
+        self.lookups = 0
+        self.exact_hits = 0
+        self.semantic_hits = 0
+
+    @staticmethod
+    def partition(budget_preference: str, locations: Tuple[Optional[str], ...] = ()) -> str:
+        """Responses are only shared between requests with the same budget and location fields"""
+        return "|".join([budget_preference or ""] + [(location or "").strip().lower() for location in locations])
+
+    def key(self, query: str, partition: str) -> str:
+        return hashlib.sha256(f"{partition}|{normalize_query(query)}".encode("utf-8")).hexdigest()
+
+    def get(self, query: str, partition: str) -> Optional[Dict[str, Any]]:
+        """Cached response for this query (exact normalized match, then nearest similar query)"""
+        if not self.enabled:
+            return None
+        self.lookups += 1
+        facts = request_facts(query)
+        found, entry = self.cache.lookup(self.key(query, partition))
+        if found and same_request(entry[0], facts):
+            self.exact_hits += 1
+            return entry[1]
+        if not self.semantic:
+            return None
+
+        with self._lock:
+            keys, fact_lists, matrix = self._index.get(partition, ([], [], None))
+            if not keys:
+                return None
+            similarities = matrix @ self.embedder.embed(query)
+            for i in np.argsort(-similarities):
+                if similarities[i] < self.similarity_threshold:
+                    break
+                if not same_request(fact_lists[i], facts):
+                    continue
+                found, entry = self.cache.peek(keys[i])
+                if found:
+                    self.semantic_hits += 1
+                    return entry[1]
+        return None
+
+    def set(self, query: str, partition: str, response: Dict[str, Any]):
+        if not self.enabled:
+            return
+        key = self.key(query, partition)
+        facts = request_facts(query)
+        self.cache.set(key, (facts, response))
+        if not self.semantic:
+            return
+        with self._lock:
+            keys, fact_lists, matrix = self._index.get(partition, ([], [], None))
+            # Drop entries the TTL cache has expired or evicted, and any older copy of this key
+            live = [i for i, existing in enumerate(keys) if existing != key and self.cache.peek(existing)[0]]
+            vector = self.embedder.embed(query)[np.newaxis, :]
+            keys = [keys[i] for i in live] + [key]
+            fact_lists = [fact_lists[i] for i in live] + [facts]
+            matrix = np.vstack([matrix[live], vector]) if live else vector
+            self._index[partition] = (keys, fact_lists, matrix)
+
+    def clear(self):
+        with self._lock:
+            self.cache.clear()
+            self._index.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        stats = self.cache.stats()
+        hits = self.exact_hits + self.semantic_hits
+        stats.update({"hits": hits, "misses": self.lookups - hits,
+                      "hit_rate": round(hits / self.lookups, 4) if self.lookups else 0.0,
+                      "exact_hits": self.exact_hits, "semantic_hits": self.semantic_hits,
+                      "semantic": self.semantic, "similarity_threshold": self.similarity_threshold})
+        return stats
+
+
+@lru_cache(maxsize=1)
+def get_response_cache() -> ResponseCache:
+    """Process-wide trip-plan response cache"""
+    return ResponseCache()
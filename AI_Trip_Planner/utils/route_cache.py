@@ -0,0 +1,145 @@
+import os
+from functools import lru_cache
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+from utils.cache import PersistentTTLCache
+from utils.config_loaders import get_config_value
+
+# Search radiuses (meters) tried in order when snapping coordinates to the road network
+DEFAULT_RADIUSES = (1000, 5000)
+
+
+class RouteCache:
+    """
+    Persistent cache of routing results keyed on rounded (start, end, profile, radius).
+
+    Besides distance/duration it remembers which coordinate pairs only routed with a wider
+    search radius, so later calls skip the request that is known to fail, and which pairs
+    could not be routed at all.
+    """
+
+    def __init__(self, db_path: Optional[str] = None, ttl_seconds: Optional[float] = None,
+                 negative_ttl_seconds: Optional[float] = None, max_entries: Optional[int] = None,
+                 precision: Optional[int] = None):
+        settings = get_config_value("cache", "routes", default={}) or {}
+        directory = get_config_value("cache", "directory", default="cache")
+        self.precision = precision if precision is not None else settings.get("precision", 4)
+        self.negative_ttl_seconds = (negative_ttl_seconds if negative_ttl_seconds is not None
+                                     else settings.get("negative_ttl_seconds", 24 * 3600))
+        self.cache = PersistentTTLCache(
+            db_path=db_path or os.path.join(directory, "routes.sqlite3"),
+            table="routes",
+            ttl_seconds=ttl_seconds if ttl_seconds is not None else settings.get("ttl_seconds", 30 * 24 * 3600),
+            max_entries=max_entries or settings.get("max_entries", 10000),
+        )
+        self.skipped_requests = 0
+        self.matrix_fills = 0
+
+    def _pair_key(self, start: Tuple[float, float], end: Tuple[float, float], profile: str) -> str:
+        p = self.precision
+        return f"{profile}|{round(start[0], p)},{round(start[1], p)}|{round(end[0], p)},{round(end[1], p)}"
+
+    def get_or_fetch(self, start: Tuple[float, float], end: Tuple[float, float],
+                     fetch: Callable[[int], Optional[Dict[str, float]]], profile: str = "driving-car",
+                     radiuses: Sequence[int] = DEFAULT_RADIUSES) -> Optional[Dict[str, float]]:
+        """
+        Return {"distance_km", "duration_s"} for the route, calling fetch(radius) on a miss.
+
+        fetch(radius) should return None when no routable point is found within radius meters
+        (the next radius is then tried) and raise on other API errors (nothing is cached).
+        """
+        pair_key = self._pair_key(start, end, profile)
+        first_radius = radiuses[0]
+
+        found, working_radius = self.cache.lookup(f"radius|{pair_key}")
+        if found and working_radius is None:
+            # Known unroutable pair
+            return None
+        if found:
+            skipped = [radius for radius in radiuses if radius < working_radius]
+            self.skipped_requests += len(skipped)
+            radiuses = [radius for radius in radiuses if radius >= working_radius]
+
+        for radius in radiuses:
+            route_key = f"route|{pair_key}|{radius}"
+            found, route = self.cache.lookup(route_key)
+            if found:
+                return route
+            route = fetch(radius)
+            if route is None:
+                continue
+            self.cache.set(route_key, route)
+            if radius > first_radius:
+                self.cache.set(f"radius|{pair_key}", radius)
+            return route
+
+        self.cache.set(f"radius|{pair_key}", None, ttl_seconds=self.negative_ttl_seconds)
+        return None
+
+    def lookup(self, start: Tuple[float, float], end: Tuple[float, float], profile: str = "driving-car",
+               radiuses: Sequence[int] = DEFAULT_RADIUSES) -> Tuple[bool, Optional[Dict[str, float]]]:
+        """Cached route without fetching: (True, route), (True, None) for a known unroutable pair, else (False, None)"""
+        pair_key = self._pair_key(start, end, profile)
+        found, working_radius = self.cache.lookup(f"radius|{pair_key}")
+        if found and working_radius is None:
+            return True, None
+        for radius in radiuses:
+            if found and radius < working_radius:
+                continue
+            hit, route = self.cache.lookup(f"route|{pair_key}|{radius}")
+            if hit:
+                return True, route
+        return False, None
+
+    def store(self, start: Tuple[float, float], end: Tuple[float, float], route: Dict[str, float],
+              profile: str = "driving-car", radiuses: Sequence[int] = DEFAULT_RADIUSES):
+        """Record a route obtained outside get_or_fetch (e.g. from a matrix request) under the first radius"""
+        self.cache.set(f"route|{self._pair_key(start, end, profile)}|{radiuses[0]}", route)
+
+    def get_or_fetch_matrix(self, origins: Sequence[Tuple[float, float]], destinations: Sequence[Tuple[float, float]],
+                            fetch_matrix: Callable, profile: str = "driving-car") -> List[List[Optional[Dict[str, float]]]]:
+        """
+        Routes for every origin/destination pair, requesting only the pairs the cache does not know.
+
+        fetch_matrix(origins, destinations) makes one matrix request and returns
+        {"distances_km": N x M, "durations_s": N x M}; its routes are stored like single-route
+        results so later single or matrix lookups reuse them. Pairs still unknown are None.
+        Errors from fetch_matrix propagate (nothing is cached).
+        """
+        routes: List[List[Optional[Dict[str, float]]]] = [[None] * len(destinations) for _ in origins]
+        missing_rows, missing_cols = set(), set()
+        for i, origin in enumerate(origins):
+            for j, destination in enumerate(destinations):
+                found, route = self.lookup(origin, destination, profile)
+                if found:
+                    routes[i][j] = route
+                else:
+                    missing_rows.add(i)
+                    missing_cols.add(j)
+        if not missing_rows:
+            return routes
+
+        rows, cols = sorted(missing_rows), sorted(missing_cols)
+        block = fetch_matrix([origins[i] for i in rows], [destinations[j] for j in cols])
+        durations = block.get("durations_s") or []
+        for bi, i in enumerate(rows):
+            for bj, j in enumerate(cols):
+                distance = block["distances_km"][bi][bj]
+                if distance is None or routes[i][j] is not None:
+                    continue
+                route = {"distance_km": distance, "duration_s": durations[bi][bj] if durations else None}
+                self.store(origins[i], destinations[j], route, profile)
+                self.matrix_fills += 1
+                routes[i][j] = route
+        return routes
+
+    def stats(self) -> Dict[str, float]:
+        stats = self.cache.stats()
+        stats["skipped_requests"] = self.skipped_requests
+        stats["matrix_fills"] = self.matrix_fills
+        return stats
+
+
+@lru_cache(maxsize=1)
+def get_route_cache() -> RouteCache:
+    """Process-wide route cache shared by the tool layer and report building"""
+    return RouteCache()
@@ -0,0 +1,96 @@
+import os
+from typing import Dict, List, Optional, Sequence, Tuple
+from dotenv import load_dotenv
+from utils.config_loaders import get_config_value
+from utils.http_client import HttpClient, get_http_client
+
+ORS_BASE_URL = "https://api.openrouteservice.org"
+
+
+class RouteMatrixClient:
+    """
+    Many-to-many road distances through the OpenRouteService matrix API.
+
+    Origins and destinations are resolved in as few /v2/matrix requests as the provider
+    limits allow, instead of one directions request per pair.
+    """
+
+    def __init__(self, api_key: Optional[str] = None, base_url: Optional[str] = None, profile: str = "driving-car",
+                 max_locations: Optional[int] = None, max_elements: Optional[int] = None,
+                 http_client: Optional[HttpClient] = None):
+        load_dotenv()
+        self.http = http_client or get_http_client()
+        settings = get_config_value("openrouteservice", default={}) or {}
+        matrix_settings = settings.get("matrix", {}) or {}
+        self.api_key = api_key or os.environ.get("MAP_KEY")
+        self.base_url = (base_url or os.environ.get("ORS_BASE_URL") or settings.get("base_url") or ORS_BASE_URL).rstrip("/")
+        self.profile = profile
+        self.max_locations = max_locations or matrix_settings.get("max_locations", 50)
+        self.max_elements = max_elements or matrix_settings.get("max_elements", 3500)
+        self.requests_made = 0
+
+    def _chunk_sizes(self, n_origins: int, n_destinations: int) -> Tuple[int, int]:
+        """Largest (origins, destinations) block that fits both the location and element limits"""
+        destination_share = min(n_destinations, self.max_locations // 2)
+        origin_chunk = max(1, min(n_origins, self.max_locations - destination_share, self.max_elements))
+        destination_chunk = max(1, min(n_destinations, self.max_locations - origin_chunk, self.max_elements // origin_chunk))
+        return origin_chunk, destination_chunk
+
+    def _request_block(self, origins: Sequence[Tuple[float, float]], destinations: Sequence[Tuple[float, float]]) -> Dict[str, list]:
+        """One /v2/matrix call for a block that fits within the provider limits"""
+        if list(origins) == list(destinations):
+            # Symmetric block (e.g. an itinerary against itself): send each location once
+            locations = [[lon, lat] for lat, lon in origins]
+            source_indices = destination_indices = list(range(len(locations)))
+        else:
+            locations = [[lon, lat] for lat, lon in list(origins) + list(destinations)]
+            source_indices = list(range(len(origins)))
+            destination_indices = list(range(len(origins), len(locations)))
+        body = {
+            "locations": locations,
+            "sources": source_indices,
+            "destinations": destination_indices,
+            "metrics": ["distance", "duration"],
+            "units": "km",
+        }
+        headers = {"Authorization": self.api_key} if self.api_key else {}
+        response = self.http.post(f"{self.base_url}/v2/matrix/{self.profile}", json=body, headers=headers, timeout=30)
+        self.requests_made += 1
+        if response.status_code != 200:
+            raise Exception(f"Matrix request failed with status {response.status_code}: {response.text[:200]}")
+        return response.json()
+
+    def matrix(self, origins: Sequence[Tuple[float, float]], destinations: Sequence[Tuple[float, float]]) -> Dict[str, List[List[Optional[float]]]]:
+        """
+        Road distance/duration for every origin/destination pair
+
+        Args:
+            origins: List of (lat, lon) tuples
+            destinations: List of (lat, lon) tuples
+
+        Returns:
+            dict: {"distances_km": N x M, "durations_s": N x M}; unroutable pairs are None
+        """
+        n_origins, n_destinations = len(origins), len(destinations)
+        distances: List[List[Optional[float]]] = [[None] * n_destinations for _ in range(n_origins)]
+        durations: List[List[Optional[float]]] = [[None] * n_destinations for _ in range(n_origins)]
+        if not n_origins or not n_destinations:
+            return {"distances_km": distances, "durations_s": durations}
+
+        if (list(origins) == list(destinations) and n_origins <= self.max_locations
+                and n_origins * n_destinations <= self.max_elements):
+            # Symmetric matrix that fits in one request (locations are sent once)
+            origin_chunk, destination_chunk = n_origins, n_destinations
+        else:
+            origin_chunk, destination_chunk = self._chunk_sizes(n_origins, n_destinations)
+        for i in range(0, n_origins, origin_chunk):
+            for j in range(0, n_destinations, destination_chunk):
+                block = self._request_block(origins[i:i + origin_chunk], destinations[j:j + destination_chunk])
+                for bi, row in enumerate(block.get("distances") or []):
+                    for bj, value in enumerate(row):
+                        distances[i + bi][j + bj] = round(value, 2) if value is not None else None
+                for bi, row in enumerate(block.get("durations") or []):
+                    for bj, value in enumerate(row):
+                        durations[i + bi][j + bj] = value
+
+        return {"distances_km": distances, "durations_s": durations}
@@ -0,0 +1,50 @@
+import math
+import re
+from typing import Iterable
+
+# Words (with their leading space), digit runs, single non-ASCII characters and punctuation
+_PIECES = re.compile(r"\s*[A-Za-z]+|\s*[0-9]+|\s*[^\x00-\x7f]|\s*[^\sA-Za-z0-9]|\s+")
+
+
+def _piece_tokens(piece: str) -> int:
+    body = piece.strip()
+    if not body:
+        return 1 if "\n" in piece else 0
+    if body.isdigit():
+        return math.ceil(len(body) / 3)      # BPE vocabularies group digits in threes
+    if body.isascii() and body.isalpha():
+        return math.ceil(len(body) / 6)      # common words are one token, long ones split
+    return 1
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Local BPE-style token count estimate (no tokenizer download, no network).
+
+    Tracks cl100k-style tokenizers closely enough for budgeting prompt size; it rounds up
+    on long words, numbers and non-Latin text so budgets err on the small side.
+    """
+    if not text:
+        return 0
+    return sum(_piece_tokens(piece) for piece in _PIECES.findall(text))
+
+
+def estimate_message_tokens(contents: Iterable[str], per_message_overhead: int = 4) -> int:
+    """Estimate for a chat prompt: message contents plus role/framing overhead per message"""
+    return sum(estimate_tokens(content) + per_message_overhead for content in contents)
+
+
+def truncate_to_tokens(text: str, max_tokens: int, marker: str = " …[truncated]") -> str:
+    """Cut text at a piece boundary so estimate_tokens(result) <= max_tokens (marker included)"""
+    if estimate_tokens(text) <= max_tokens:
+        return text
+    budget = max_tokens - estimate_tokens(marker)
+    used = 0
+    end = 0
+    for match in _PIECES.finditer(text):
+        cost = _piece_tokens(match.group())
+        if used + cost > budget:
+            break
+        used += cost
+        end = match.end()
+    return text[:end].rstrip() + marker
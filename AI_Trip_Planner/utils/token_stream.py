@@ -0,0 +1,60 @@
+from typing import Optional
+
+THINK_OPEN = "<think>"
+THINK_CLOSE = "</think>"
+
+
+def _partial_tag(text: str, tag: str) -> int:
+    """Length of the longest suffix of text that is a proper prefix of tag (a tag split across chunks)"""
+    for length in range(min(len(text), len(tag) - 1), 0, -1):
+        if text.endswith(tag[:length]):
+            return length
+    return 0
+
+
+class TurnTokenFilter:
+    """
+    Streamed tokens of one LLM turn, as the user should see them.
+
+    <think> reasoning is removed even when a tag is split across chunks, and once the turn
+    shows a tool call nothing more of it is passed on (tool-calling turns are not answers).
+    """
+
+    def __init__(self):
+        self.calls_tools = False
+        self._in_think = False
+        self._pending = ""
+
+    def feed(self, text: str, has_tool_calls: bool = False) -> str:
+        """Visible text for the next chunk (possibly empty)"""
+        if has_tool_calls:
+            self.calls_tools = True
+        if self.calls_tools:
+            return ""
+        text, self._pending = self._pending + text, ""
+        visible = []
+        while text:
+            tag = THINK_CLOSE if self._in_think else THINK_OPEN
+            index = text.find(tag)
+            if index < 0:
+                held = _partial_tag(text, tag)
+                if not self._in_think:
+                    visible.append(text[:len(text) - held])
+                self._pending = text[len(text) - held:] if held else ""
+                break
+            if not self._in_think:
+                visible.append(text[:index])
+            text = text[index + len(tag):]
+            self._in_think = not self._in_think
+        return "".join(visible)
+
+    def flush(self) -> str:
+        """Text held back as a possible tag start when the turn ends"""
+        text, self._pending = self._pending, ""
+        return "" if self._in_think or self.calls_tools else text
+
+    def finish(self, output: Optional[object]) -> bool:
+        """Record the turn's final message; True when it is an answer rather than a tool call"""
+        if getattr(output, "tool_calls", None):
+            self.calls_tools = True
+        return not self.calls_tools
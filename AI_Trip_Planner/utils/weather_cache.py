@@ -0,0 +1,104 @@
+import re
+import time
+from functools import lru_cache
+from typing import Any, Callable, Dict, Optional, Tuple
+from utils.cache import TTLCache
+from utils.config_loaders import get_config_value
+from utils.single_flight import SingleFlight, get_single_flight
+
+# OpenWeatherMap forecasts advance in 3-hour steps aligned to UTC midnight
+FORECAST_BUCKET_SECONDS = 3 * 3600
+
+
+def next_forecast_bucket(now: Optional[float] = None) -> float:
+    """Epoch time at which the current 3-hour forecast bucket ends"""
+    now = time.time() if now is None else now
+    return (now // FORECAST_BUCKET_SECONDS + 1) * FORECAST_BUCKET_SECONDS
+
+
+class WeatherCache:
+    """
+    Shared in-memory cache for OpenWeatherMap responses.
+
+    Current weather is kept for a few minutes; forecasts are kept until the next 3-hour
+    forecast bucket starts. Each city name is resolved to coordinates once, so later calls
+    query by lat/lon and different names for the same place share entries. Concurrent
+    requests for the same place are coalesced into one upstream call.
+    """
+
+    def __init__(self, current_ttl_seconds: Optional[float] = None, coordinates_ttl_seconds: Optional[float] = None,
+                 max_entries: Optional[int] = None, single_flight: Optional[SingleFlight] = None):
+        settings = get_config_value("cache", "weather", default={}) or {}
+        self.current_ttl_seconds = (current_ttl_seconds if current_ttl_seconds is not None
+                                    else settings.get("current_ttl_seconds", 600))
+        max_entries = max_entries or settings.get("max_entries", 2000)
+        self.responses = TTLCache(max_entries=max_entries, ttl_seconds=self.current_ttl_seconds, name="weather")
+        self.coordinates = TTLCache(
+            max_entries=max_entries,
+            ttl_seconds=(coordinates_ttl_seconds if coordinates_ttl_seconds is not None
+                         else settings.get("coordinates_ttl_seconds", 30 * 24 * 3600)),
+            name="weather_coordinates",
+        )
+        self.single_flight = single_flight or get_single_flight("weather")
+
+    @staticmethod
+    def normalize(place: str) -> str:
+        return re.sub(r"\s+", " ", place.lower()).strip(" ,.;")
+
+    def location_params(self, place: str) -> Dict[str, Any]:
+        """Query parameters for a place: lat/lon once resolved, otherwise the name"""
+        coords = self.coordinates.get(self.normalize(place))
+        if coords is not None:
+            return {"lat": coords[0], "lon": coords[1]}
+        return {"q": place}
+
+    def _response_key(self, kind: str, place: str) -> str:
+        coords = self.coordinates.get(self.normalize(place))
+        if coords is not None:
+            return f"{kind}|{coords[0]:.2f},{coords[1]:.2f}"
+        return f"{kind}|{self.normalize(place)}"
+
+    @staticmethod
+    def _extract_coordinates(kind: str, data: Dict[str, Any]) -> Optional[Tuple[float, float]]:
+        coord = data.get("coord") if kind == "current" else (data.get("city") or {}).get("coord")
+        if coord and coord.get("lat") is not None and coord.get("lon") is not None:
+            return (float(coord["lat"]), float(coord["lon"]))
+        return None
+
+    def get_or_fetch(self, kind: str, place: str, fetch: Callable[[Dict[str, Any]], Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Cached "current" or "forecast" data for a place, calling fetch(location_params) on a miss
+
+        fetch() returns the parsed response, or an empty dict when the API had no data
+        (not cached). Exceptions propagate and are not cached.
+        """
+        found, value = self.responses.lookup(self._response_key(kind, place))
+        if found:
+            return value
+        return self.single_flight.do((kind, self.normalize(place)), lambda: self._fetch(kind, place, fetch))
+
+    def _fetch(self, kind: str, place: str, fetch: Callable[[Dict[str, Any]], Dict[str, Any]]) -> Dict[str, Any]:
+        data = fetch(self.location_params(place))
+        if not data:
+            return data
+        coords = self._extract_coordinates(kind, data)
+        if coords is not None:
+            self.coordinates.set(self.normalize(place), coords)
+        key = self._response_key(kind, place)
+        if kind == "forecast":
+            self.responses.set(key, data, expires_at=next_forecast_bucket())
+        else:
+            self.responses.set(key, data)
+        return data
+
+    def stats(self) -> Dict[str, Any]:
+        stats = self.responses.stats()
+        stats["resolved_places"] = len(self.coordinates)
+        stats["single_flight"] = self.single_flight.stats()
+        return stats
+
+
+@lru_cache(maxsize=1)
+def get_weather_cache() -> WeatherCache:
+    """Process-wide weather cache shared by every WeatherForecastTool"""
+    return WeatherCache()
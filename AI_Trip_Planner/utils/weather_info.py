@@ -1,34 +1,36 @@
-import requests
+from typing import Optional
+from utils.http_client import HttpClient, get_http_client
+from utils.weather_cache import WeatherCache, get_weather_cache
 
 class WeatherForecastTool:
-    def __init__(self, api_key:str):
+    def __init__(self, api_key:str, http_client: Optional[HttpClient] = None, cache: Optional[WeatherCache] = None):
         self.api_key = api_key
+        self.http = http_client or get_http_client()
+        self.cache = cache or get_weather_cache()
         self.base_url = "https://api.openweathermap.org/data/2.5"
 
     def get_current_weather(self, place:str):
-        """Get current weather of a place"""
-        try:
+        """Get current weather of a place (cached for a few minutes)"""
+        def fetch(location):
             url = f"{self.base_url}/weather"
             params = {
-                "q": place,
+                **location,
                 "appid": self.api_key,
             }
-            response = requests.get(url, params=params)
+            response = self.http.get(url, params=params)
             return response.json() if response.status_code == 200 else {}
-        except Exception as e:
-            raise e
+        return self.cache.get_or_fetch("current", place, fetch)
     
     def get_forecast_weather(self, place:str):
-        """Get weather forecast of a place"""
-        try:
+        """Get weather forecast of a place (cached until the next 3-hour forecast step)"""
+        def fetch(location):
             url = f"{self.base_url}/forecast"
             params = {
-                "q": place,
+                **location,
                 "appid": self.api_key,
                 "cnt": 10,
                 "units": "metric"
             }
-            response = requests.get(url, params=params)
+            response = self.http.get(url, params=params)
             return response.json() if response.status_code == 200 else {}
-        except Exception as e:
-            raise e
\ No newline at end of file
+        return self.cache.get_or_fetch("forecast", place, fetch)